@@ -20,6 +20,20 @@ from importlib.metadata import version, PackageNotFoundError  # type: ignore
 
 from .main import status
 from .main import bedrock
+from .main import status_many
+from .sharded import status_sharded
+from .resolver import ResolverCache
+from .bedrock import BedrockMultiplexer
+from .query import QueryMultiplexer
+from .legacy import ProtocolCache
+from .retry import RetryPolicy
+from .breaker import CircuitBreaker
+from .lazy import LazyStatus
+from .intern import InternCache
+from .delta import DeltaTracker
+from .poller import Poller
+from .rtt import RTTEstimator
+from .limiter import AIMDLimiter
 
 try:
     __version__ = version(__name__)
@@ -46,4 +60,18 @@ long with this program. If not, see <https://www.gnu.org/licenses/>."""
 __all__ = [
     "status",
     "bedrock",
+    "status_many",
+    "status_sharded",
+    "ResolverCache",
+    "BedrockMultiplexer",
+    "QueryMultiplexer",
+    "ProtocolCache",
+    "RetryPolicy",
+    "CircuitBreaker",
+    "LazyStatus",
+    "InternCache",
+    "DeltaTracker",
+    "Poller",
+    "RTTEstimator",
+    "AIMDLimiter",
 ]
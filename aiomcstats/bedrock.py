@@ -1,74 +1,142 @@
 from time import perf_counter
 import asyncio_dgram
+import ipaddress
+import itertools
 import struct
+from typing import Any, Dict, Hashable, Optional, Tuple, Union
 from .models.bedrock import BedrockStatus
+from .models.fast import FastBedrockStatus
+from .udp import DatagramMultiplexer
 import asyncio
 
 
 request_status_data = b"\x01\x00\x00\x00\x00\x00\x00\x00\x00\x00\xff\xff\x00\xfe\xfe\xfe\xfe\xfd\xfd\xfd\xfd\x124Vx"
+MAGIC = request_status_data[9:]
 
 
-def parse_response(data: bytes, latency: int) -> BedrockStatus:
+def parse_response(
+    data: bytes, latency: float, fast: bool = False
+) -> Union[BedrockStatus, FastBedrockStatus]:
     """Parse response
 
     Args:
         data (bytes): raw input
-        latency (int): latency of request
+        latency (float): round trip of the request in milliseconds
+        fast (bool): return a FastBedrockStatus instead of the pydantic
+            model. Defaults to False.
 
     Returns:
-        BedrockStatus: Status object
+        Union[BedrockStatus, FastBedrockStatus]: Status object
     """
     data = data[1:]
     name_length = struct.unpack(">H", data[32:34])[0]
-    data = data[34 : 34 + name_length].decode().split(";")
-    print(len(data))
-    if len(data) == 7:
-        return BedrockStatus(
-            edition=data[0],
-            motd=data[1],
-            protocol_version=data[2],
-            protocol_name=data[3],
-            player_count=data[4],
-            player_max=data[5],
-            server_id=data[6],
-            latency=latency,
-        )
-    return BedrockStatus(
-        edition=data[0],
-        motd=data[1],
-        protocol_version=data[2],
-        protocol_name=data[3],
-        player_count=data[4],
-        player_max=data[5],
-        server_id=data[6],
+    fields = data[34 : 34 + name_length].decode().split(";")
+    values: Dict[str, Any] = dict(
+        edition=fields[0],
+        motd=fields[1],
+        protocol_version=int(fields[2]),
+        protocol_name=fields[3],
+        player_count=int(fields[4]),
+        player_max=int(fields[5]),
+        server_id=int(fields[6]),
         latency=latency,
-        map=data[7],
-        gamemode=data[8],
-        gamemode_int=data[9],
-        port_ipv4=data[10],
-        port_ipv6=data[11],
     )
+    if len(fields) >= 12:
+        values.update(
+            map=fields[7],
+            gamemode=fields[8],
+            gamemode_int=int(fields[9]),
+            port_ipv4=int(fields[10]),
+            port_ipv6=int(fields[11]),
+        )
+    if fast:
+        return FastBedrockStatus(**values)
+    return BedrockStatus(**values)
+
+
+class BedrockMultiplexer(DatagramMultiplexer):
+    """Send unconnected pings to many bedrock servers from shared sockets.
+
+    Every ping carries a unique value in the RakNet ping time field, which
+    the server echoes back, so responses are matched by source address and
+    ping time.
+
+    Args:
+        sockets (int): Number of sockets per address family. Defaults to 1.
+    """
+
+    def __init__(self, sockets: int = 1) -> None:
+        super().__init__(sockets)
+        self._ping_times = itertools.count(1)
+
+    def response_key(self, data: bytes, addr: Tuple[Any, ...]) -> Optional[Hashable]:
+        """Key of the ping a pong answers.
+
+        Args:
+            data (bytes): datagram received.
+            addr (Tuple[Any, ...]): address it came from.
+
+        Returns:
+            Optional[Hashable]: source address and ping time.
+        """
+        if len(data) < 35 or data[0] != 0x1C:
+            return None
+        return (addr[0], addr[1], data[1:9])
+
+    async def status(
+        self, host: str, port: int, timeout: float = 1, fast: bool = False
+    ) -> Union[BedrockStatus, FastBedrockStatus]:
+        """Get status of bedrock server
+
+        Args:
+            host (str): ip address of the server
+            port (int): port
+            timeout (float): seconds to wait for a response. Defaults to 1.
+            fast (bool): return a FastBedrockStatus. Defaults to False.
+
+        Returns:
+            Union[BedrockStatus, FastBedrockStatus]: Status object
+        """
+        host = str(ipaddress.ip_address(host))
+        ping_time = struct.pack(">Q", next(self._ping_times) & 0xFFFFFFFFFFFFFFFF)
+        start = perf_counter()
+        data = await self.request(
+            host, port, b"\x01" + ping_time + MAGIC, (host, port, ping_time), timeout
+        )
+        return parse_response(data, (perf_counter() - start) * 1000, fast)
 
 
-async def bedrock_status(host: str, port: int) -> BedrockStatus:
+async def bedrock_status(
+    host: str,
+    port: int,
+    multiplexer: Optional[BedrockMultiplexer] = None,
+    fast: bool = False,
+    timeout: float = 1,
+) -> Union[BedrockStatus, FastBedrockStatus]:
     """Get status of bedrock server
 
     Args:
-        host (str): host
+        host (str): host, an ip address when a multiplexer is used
         port (int): port
+        multiplexer (Optional[BedrockMultiplexer]): shared sockets to send
+            the ping from. Defaults to a new socket for this request.
+        fast (bool): return a FastBedrockStatus. Defaults to False.
+        timeout (float): seconds to wait for a response. Defaults to 1.
 
     Returns:
-        BedrockStatus: Status object
+        Union[BedrockStatus, FastBedrockStatus]: Status object
     """
+    if multiplexer is not None:
+        return await multiplexer.status(host, port, timeout, fast)
     start = perf_counter()
     try:
         stream = await asyncio_dgram.connect((host, port))
         await stream.send(request_status_data)
-        data, _ = await asyncio.wait_for(stream.recv(), 1)
+        data, _ = await asyncio.wait_for(stream.recv(), timeout)
     finally:
         try:
             stream.close()
         except BaseException:
             pass
 
-    return parse_response(data, (perf_counter() - start))
+    return parse_response(data, (perf_counter() - start) * 1000, fast)
@@ -0,0 +1,144 @@
+"""Circuit breaker skipping servers that keep failing."""
+import time
+from typing import Any, Dict, Hashable, Optional
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class _Circuit:
+    __slots__ = ("failures", "interval", "open_until", "probing", "result")
+
+    def __init__(self) -> None:
+        self.failures = 0
+        self.interval = 0.0
+        self.open_until = 0.0
+        self.probing = False
+        self.result: Any = None
+
+
+class CircuitBreaker:
+    """Return cached offline results for servers that keep failing.
+
+    Servers are keyed by ``(hostname, port)`` for java and ``(ip, port)``
+    for bedrock. After ``threshold`` failed queries in a row the circuit
+    opens and the last offline result is returned without touching the
+    network. Once the interval has passed a single query is let through as
+    a probe; if it fails the interval grows by ``multiplier`` up to
+    ``max_interval``, if it succeeds the circuit closes.
+
+    Args:
+        threshold (int): Failures in a row before the circuit opens.
+            Defaults to 3.
+        interval (float): Seconds before the first probe. Defaults to 30.
+        multiplier (float): Growth of the interval per failed probe.
+            Defaults to 2.
+        max_interval (float): Longest interval between probes.
+            Defaults to 3600.
+    """
+
+    def __init__(
+        self,
+        threshold: int = 3,
+        interval: float = 30,
+        multiplier: float = 2,
+        max_interval: float = 3600,
+    ) -> None:
+        self.threshold = threshold
+        self.interval = interval
+        self.multiplier = multiplier
+        self.max_interval = max_interval
+        self._circuits: Dict[Hashable, _Circuit] = {}
+        self.short_circuited = 0
+        self.probes = 0
+
+    def check(self, key: Hashable) -> Optional[Any]:
+        """Cached result to return instead of querying the server.
+
+        Args:
+            key (Hashable): server key, usually ``(hostname, port)``.
+
+        Returns:
+            Optional[Any]: the cached offline result, or None when the server
+                should be queried.
+        """
+        circuit = self._circuits.get(key)
+        if circuit is None or circuit.failures < self.threshold:
+            return None
+        now = time.monotonic()
+        if now < circuit.open_until:
+            self.short_circuited += 1
+            return circuit.result
+        # Hold other queries back while the probe runs, or until another
+        # interval passes should the probe never report back.
+        circuit.probing = True
+        circuit.open_until = now + circuit.interval
+        self.probes += 1
+        return None
+
+    def success(self, key: Hashable) -> None:
+        """Record a successful query, closing the circuit.
+
+        Args:
+            key (Hashable): server key.
+        """
+        self._circuits.pop(key, None)
+
+    def failure(self, key: Hashable, result: Any) -> None:
+        """Record a failed query.
+
+        Args:
+            key (Hashable): server key.
+            result (Any): offline result returned while the circuit is open.
+        """
+        circuit = self._circuits.get(key)
+        if circuit is None:
+            circuit = self._circuits[key] = _Circuit()
+        circuit.failures += 1
+        circuit.result = result
+        if circuit.failures < self.threshold:
+            return
+        if circuit.probing:
+            circuit.interval = min(
+                circuit.interval * self.multiplier, self.max_interval
+            )
+        else:
+            circuit.interval = min(self.interval, self.max_interval)
+        circuit.probing = False
+        circuit.open_until = time.monotonic() + circuit.interval
+
+    def state(self, key: Hashable) -> str:
+        """State of the circuit of a server.
+
+        Args:
+            key (Hashable): server key.
+
+        Returns:
+            str: "closed", "open" or "half_open".
+        """
+        circuit = self._circuits.get(key)
+        if circuit is None or circuit.failures < self.threshold:
+            return CLOSED
+        if circuit.probing or time.monotonic() >= circuit.open_until:
+            return HALF_OPEN
+        return OPEN
+
+    def stats(self) -> Dict[str, int]:
+        """Counters for monitoring.
+
+        Returns:
+            Dict[str, int]: servers per state, failing servers whose circuit
+                is still closed, short circuited queries and probes sent.
+        """
+        counts = {CLOSED: 0, OPEN: 0, HALF_OPEN: 0}
+        for key in self._circuits:
+            counts[self.state(key)] += 1
+        return {
+            "open": counts[OPEN],
+            "half_open": counts[HALF_OPEN],
+            "failing": counts[CLOSED],
+            "short_circuited": self.short_circuited,
+            "probes": self.probes,
+        }
@@ -1,17 +1,98 @@
 import asyncio
 import struct
-from typing import Any, Union
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+from typing import TypeVar, Union
+
+
+_STRUCTS = {fmt: struct.Struct(">" + fmt) for fmt in "hHiIqQ"}
+
+T = TypeVar("T")
+
+
+async def staggered_race(
+    addresses: Sequence[str],
+    attempt: Callable[[str], Awaitable[T]],
+    delay: float = 0.25,
+    discard: Optional[Callable[[T], Any]] = None,
+) -> Tuple[str, T]:
+    """Connect to the first address that answers, RFC 8305 style.
+
+    Attempts start in order, each ``delay`` seconds after the previous one
+    or straight away when the previous one fails, and run concurrently.
+    The first to succeed wins and the rest are cancelled.
+
+    Args:
+        addresses (Sequence[str]): addresses in order of preference.
+        attempt (Callable[[str], Awaitable[T]]): connects to an address.
+        delay (float): seconds before the next attempt starts.
+            Defaults to 0.25.
+        discard (Optional[Callable[[T], Any]]): closes connections which
+            succeeded after the winner. Defaults to None.
+
+    Raises:
+        ValueError: no addresses given.
+        OSError: every attempt failed.
+
+    Returns:
+        Tuple[str, T]: winning address and the result of its attempt.
+    """
+    if not addresses:
+        raise ValueError("No addresses to connect to")
+    running: Dict["asyncio.Future[T]", str] = {}
+    errors: List[BaseException] = []
+    index = 0
+    try:
+        while True:
+            if index < len(addresses):
+                address = addresses[index]
+                running[asyncio.ensure_future(attempt(address))] = address
+                index += 1
+                timeout: Optional[float] = delay
+            elif running:
+                timeout = None
+            elif len(errors) == 1:
+                raise errors[0]
+            else:
+                raise OSError(
+                    "Multiple exceptions: %s" % ", ".join(str(e) for e in errors)
+                )
+            done, _ = await asyncio.wait(
+                running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+            for future in done:
+                address = running.pop(future)
+                error = future.exception()
+                if error is None:
+                    return address, future.result()
+                errors.append(error)
+    finally:
+        for future in running:
+            future.cancel()
+        if running:
+            await asyncio.wait(running)
+        for future in running:
+            if discard is not None and not future.cancelled():
+                if future.exception() is None:
+                    discard(future.result())
 
 
 class Connection:
     def __init__(self) -> None:
         self.sent = bytearray()
         self.received = bytearray()
+        self.offset = 0
 
     def read(self, length: int) -> bytearray:
-        result = self.received[:length]
-        self.received = self.received[length:]
-        return result
+        start = self.offset
+        self.offset = min(start + length, len(self.received))
+        return self.received[start : self.offset]
+
+    def _advance(self, length: int) -> int:
+        start = self.offset
+        if start + length > len(self.received):
+            raise IOError("Not enough data to read %d bytes" % length)
+        self.offset = start + length
+        return start
 
     def write(self, data: Any) -> None:
         if isinstance(data, Connection):
@@ -21,12 +102,15 @@ class Connection:
         self.sent.extend(data)
 
     def receive(self, data: Any) -> None:
-        if not isinstance(data, bytearray):
-            data = bytearray(data)
+        # Drop consumed bytes once they make up most of the buffer so the
+        # compaction cost stays linear in the amount of data received.
+        if self.offset and self.offset * 2 >= len(self.received):
+            del self.received[: self.offset]
+            self.offset = 0
         self.received.extend(data)
 
     def remaining(self) -> int:
-        return len(self.received)
+        return len(self.received) - self.offset
 
     def flush(self) -> bytearray:
         result = self.sent
@@ -41,82 +125,94 @@ class Connection:
         return struct.pack(">" + format, data)
 
     def read_varint(self) -> int:
+        data = self.received
         result = 0
         for i in range(5):
-            part = ord(self.read(1))
+            part = data[self._advance(1)]
             result |= (part & 0x7F) << 7 * i
             if not part & 0x80:
                 return result
         raise IOError("Server sent a varint that was too big!")
 
     def write_varint(self, value: int) -> None:
+        out = bytearray()
         remaining = value
         for _ in range(5):
             if remaining & ~0x7F == 0:
-                self.write(struct.pack("!B", remaining))
+                out.append(remaining)
+                self.write(out)
                 return
-            self.write(struct.pack("!B", remaining & 0x7F | 0x80))
+            out.append(remaining & 0x7F | 0x80)
             remaining >>= 7
         raise ValueError("The value %d is too big to send in a varint" % value)
 
+    def read_view(self, length: int) -> memoryview:
+        # The view has to be released before more data is received.
+        start = self._advance(length)
+        return memoryview(self.received)[start : start + length]
+
     def read_utf(self) -> Any:
         length = self.read_varint()
-        return self.read(length).decode("utf8")
+        with self.read_view(length) as view:
+            return str(view, "utf8")
 
     def write_utf(self, value: str) -> None:
-        self.write_varint(len(value))
-        self.write(bytearray(value, "utf8"))
+        data = value.encode("utf8")
+        self.write_varint(len(data))
+        self.write(data)
 
     def read_ascii(self) -> str:
-        result = bytearray()
-        while len(result) == 0 or result[-1] != 0:
-            result.extend(self.read(1))
-        return result[:-1].decode("ISO-8859-1")
+        end = self.received.find(0, self.offset)
+        if end == -1:
+            raise IOError("Unterminated string")
+        with self.read_view(end - self.offset + 1) as view:
+            return str(view[:-1], "ISO-8859-1")
 
     def write_ascii(self, value: str) -> None:
         self.write(bytearray(value, "ISO-8859-1"))
         self.write(bytearray.fromhex("00"))
 
     def read_short(self) -> Any:
-        return self._unpack("h", self.read(2))
+        return _STRUCTS["h"].unpack_from(self.received, self._advance(2))[0]
 
     def write_short(self, value: Any) -> None:
         self.write(self._pack("h", value))
 
     def read_ushort(self) -> Any:
-        return self._unpack("H", self.read(2))
+        return _STRUCTS["H"].unpack_from(self.received, self._advance(2))[0]
 
     def write_ushort(self, value: Any) -> None:
         self.write(self._pack("H", value))
 
     def read_int(self) -> Any:
-        return self._unpack("i", self.read(4))
+        return _STRUCTS["i"].unpack_from(self.received, self._advance(4))[0]
 
     def write_int(self, value: int) -> None:
         self.write(self._pack("i", value))
 
     def read_uint(self) -> Any:
-        return self._unpack("I", self.read(4))
+        return _STRUCTS["I"].unpack_from(self.received, self._advance(4))[0]
 
     def write_uint(self, value: int) -> None:
         self.write(self._pack("I", value))
 
     def read_long(self) -> Any:
-        return self._unpack("q", self.read(8))
+        return _STRUCTS["q"].unpack_from(self.received, self._advance(8))[0]
 
     def write_long(self, value: float) -> None:
         self.write(self._pack("q", value))
 
     def read_ulong(self) -> Any:
-        return self._unpack("Q", self.read(8))
+        return _STRUCTS["Q"].unpack_from(self.received, self._advance(8))[0]
 
     def write_ulong(self, value: float) -> None:
         self.write(self._pack("Q", value))
 
     def read_buffer(self) -> Any:
         length = self.read_varint()
+        start = self._advance(length)
         result = Connection()
-        result.receive(self.read(length))
+        result.received = self.received[start : start + length]
         return result
 
     def write_buffer(self, buffer: Any) -> None:
@@ -133,36 +229,42 @@ class TCPConnection(Connection):
         conn = asyncio.open_connection(host, port)
         self.reader, self.writer = await asyncio.wait_for(conn, timeout=timeout)
 
-    async def read(self, length: int) -> bytearray:
-        result = bytearray()
-        while len(result) < length:
-            new = await self.reader.read(length - len(result))
-            if len(new) == 0:
+    async def _fill(self, length: int) -> None:
+        # Everything the socket has ready is taken in one read, so the length
+        # prefix and body of a packet usually arrive without suspending again.
+        while self.remaining() < length:
+            data = await self.reader.read(65536)
+            if not data:
                 raise IOError("Server did not respond with any information!")
-            result.extend(new)
-        return result
+            self.receive(data)
+
+    async def read(self, length: int) -> bytearray:
+        await self._fill(length)
+        start = self._advance(length)
+        return self.received[start : start + length]
 
     def write(self, data: Any) -> None:
         self.writer.write(data)
 
     async def read_varint(self) -> Any:
-        result = 0
-        for i in range(5):
-            part = ord(await self.read(1))
-            result |= (part & 0x7F) << 7 * i
-            if not part & 0x80:
-                return result
-        raise IOError("Server sent a varint that was too big!")
+        while True:
+            start = self.offset
+            try:
+                return Connection.read_varint(self)
+            except IOError:
+                self.offset = start
+                if self.remaining() >= 5:
+                    raise
+            await self._fill(self.remaining() + 1)
 
     async def read_utf(self) -> Any:
         length = await self.read_varint()
-        return self.read(length).decode("utf8")
+        return (await self.read(length)).decode("utf8")
 
     async def read_ascii(self) -> Any:
-        result = bytearray()
-        while len(result) == 0 or result[-1] != 0:
-            result.extend(await self.read(1))
-        return result[:-1].decode("ISO-8859-1")
+        while self.received.find(0, self.offset) == -1:
+            await self._fill(self.remaining() + 1)
+        return Connection.read_ascii(self)
 
     async def read_short(self) -> Any:
         return self._unpack("h", await self.read(2))
@@ -185,5 +287,8 @@ class TCPConnection(Connection):
     async def read_buffer(self) -> Any:
         length = await self.read_varint()
         result = Connection()
-        result.receive(await self.read(length))
+        result.received = await self.read(length)
         return result
+
+    def close(self) -> None:
+        self.writer.close()
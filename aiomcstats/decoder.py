@@ -0,0 +1,154 @@
+"""JSON decoding straight from received bytes.
+
+orjson or msgspec is used when installed, otherwise the standard library
+``json`` module.
+"""
+import hashlib
+import json
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+def _json_loads(data: Buffer) -> Any:
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+
+BACKENDS: Dict[str, Callable[[Buffer], Any]] = {"json": _json_loads}
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    pass
+else:
+    BACKENDS["orjson"] = orjson.loads
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover
+    pass
+else:
+
+    def _msgspec_loads(data: Buffer) -> Any:
+        try:
+            return msgspec.json.decode(data)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e))
+
+    BACKENDS["msgspec"] = _msgspec_loads
+
+backend: str = next(name for name in ("orjson", "msgspec", "json") if name in BACKENDS)
+
+
+def loads(data: Buffer) -> Any:
+    """Decode JSON from bytes with the fastest installed backend.
+
+    Args:
+        data (Buffer): UTF-8 encoded JSON.
+
+    Returns:
+        Any: decoded object.
+    """
+    return BACKENDS[backend](data)
+
+
+def set_backend(name: str) -> None:
+    """Choose the backend used by :func:`loads`.
+
+    Args:
+        name (str): "orjson", "msgspec" or "json".
+
+    Raises:
+        ValueError: the backend is not installed.
+    """
+    global backend
+    if name not in BACKENDS:
+        raise ValueError("JSON backend '%s' is not installed" % name)
+    backend = name
+
+
+_WHITESPACE = b" \t\r\n"
+
+
+def _skip_whitespace(data: Union[bytes, bytearray], index: int, step: int = 1) -> int:
+    while 0 <= index < len(data) and data[index] in _WHITESPACE:
+        index += step
+    return index
+
+
+def _find_favicon(data: Union[bytes, bytearray]) -> Optional[Tuple[int, int, int]]:
+    key = data.find(b'"favicon"')
+    while key >= 0:
+        colon = _skip_whitespace(data, key + 9)
+        if colon < len(data) and data[colon] == 0x3A:
+            quote = _skip_whitespace(data, colon + 1)
+            if quote >= len(data) or data[quote] != 0x22:
+                return None
+            end = quote
+            while True:
+                end = data.find(b'"', end + 1)
+                if end < 0:
+                    return None
+                escapes = end - 1
+                while data[escapes] == 0x5C:
+                    escapes -= 1
+                if not (end - 1 - escapes) % 2:
+                    return key, quote, end
+        key = data.find(b'"favicon"', key + 9)
+    return None
+
+
+def favicon_hash(favicon: str) -> str:
+    """Content hash of a favicon.
+
+    Args:
+        favicon (str): favicon from the status json.
+
+    Returns:
+        str: hex encoded sha256 of the favicon.
+    """
+    return hashlib.sha256(favicon.encode("utf8")).hexdigest()
+
+
+def strip_favicon(data: Buffer) -> Tuple[Buffer, Optional[str]]:
+    """Cut the favicon out of an encoded status response.
+
+    The favicon is located in the raw bytes and removed before the JSON is
+    decoded, so the icon is never turned into a python string. A bytearray
+    is edited in place and the icon is hashed through a memoryview, so only
+    the members after the favicon are moved. Hashing costs about as much as
+    decoding the icon would, the gain is in memory rather than time.
+
+    Args:
+        data (Buffer): UTF-8 encoded status json.
+
+    Returns:
+        Tuple[Buffer, Optional[str]]: json without the favicon and the
+            :func:`favicon_hash` of the favicon, or data unchanged and None
+            when there is no favicon.
+    """
+    buffer = bytes(data) if isinstance(data, memoryview) else data
+    found = _find_favicon(buffer)
+    if found is None:
+        return data, None
+    start, quote, end = found
+    if buffer.find(b"\\", quote + 1, end) != -1:
+        # Escaped icons are unescaped so the hash matches favicon_hash.
+        digest = favicon_hash(json.loads(buffer[quote : end + 1]))
+    else:
+        with memoryview(buffer) as view, view[quote + 1 : end] as value:
+            digest = hashlib.sha256(value).hexdigest()
+    end = _skip_whitespace(buffer, end + 1)
+    if end < len(buffer) and buffer[end] == 0x2C:
+        end += 1
+    else:
+        # The favicon was the last member, drop the comma before it instead.
+        before = _skip_whitespace(buffer, start - 1, -1)
+        if before >= 0 and buffer[before] == 0x2C:
+            start = before
+    if isinstance(buffer, bytearray):
+        del buffer[start:end]
+        return buffer, digest
+    return buffer[:start] + buffer[end:], digest
@@ -0,0 +1,147 @@
+"""Reporting only what changed between polls of a server."""
+from typing import Any, AsyncIterator, Dict, FrozenSet, Iterable, Optional, Tuple
+
+from aiomcstats.decoder import favicon_hash
+from aiomcstats.main import status, status_many
+from aiomcstats.models.delta import StatusDelta
+
+FIELDS = (
+    "online",
+    "players_online",
+    "players_max",
+    "version",
+    "protocol",
+    "motd",
+    "icon_hash",
+    "mods",
+    "error",
+)
+
+_State = Tuple[Tuple[int, ...], FrozenSet[str]]
+
+
+def field_values(result: Any) -> Tuple[Any, ...]:
+    """Values of the compared fields of a result.
+
+    Results which kept their favicon are only hashed here, so polls which
+    are not compared never pay for it.
+
+    Args:
+        result (Any): result of :func:`~aiomcstats.status` of any result
+            type.
+
+    Returns:
+        Tuple[Any, ...]: hashable value of each field in :data:`FIELDS`.
+    """
+    if not result.online:
+        return (False, None, None, None, None, None, None, None, result.error)
+    mods = result.mods
+    icon_hash = result.icon_hash
+    if icon_hash is None and result.icon:
+        icon_hash = favicon_hash(result.icon)
+    return (
+        True,
+        result.players.online,
+        result.players.max,
+        result.version,
+        result.protocol,
+        tuple(result.motd.raw),
+        icon_hash,
+        tuple(mods.names) if mods is not None else None,
+        None,
+    )
+
+
+class DeltaTracker:
+    """Keeps a fingerprint of the last result per host.
+
+    Only a hash of each field and the names in the player sample are kept,
+    not the results themselves. Each new result is compared against it and a
+    :class:`~aiomcstats.models.StatusDelta` holding just the changed fields
+    is reported.
+
+    The player sample is usually a few random players, so joined and left
+    describe the sample rather than the whole server.
+    """
+
+    def __init__(self) -> None:
+        self._states: Dict[str, _State] = {}
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def update(self, host: str, result: Any) -> Optional[StatusDelta]:
+        """Record a result and report what changed.
+
+        Args:
+            host (str): address the result is for.
+            result (Any): result of :func:`~aiomcstats.status` of any
+                result type.
+
+        Returns:
+            Optional[StatusDelta]: the changes, None if nothing changed.
+        """
+        values = field_values(result)
+        hashes = tuple(hash(value) for value in values)
+        sample = frozenset(result.players.list or ()) if result.online else frozenset()
+        previous = self._states.get(host)
+        self._states[host] = (hashes, sample)
+        if previous is None:
+            return StatusDelta(
+                host=host,
+                online=values[0],
+                changes=dict(zip(FIELDS, values)),
+                joined=sorted(sample),
+            )
+        old_hashes, old_sample = previous
+        if hashes == old_hashes and sample == old_sample:
+            return None
+        changes = {
+            field: value
+            for field, value, new, old in zip(FIELDS, values, hashes, old_hashes)
+            if new != old
+        }
+        return StatusDelta(
+            host=host,
+            online=values[0],
+            changes=changes,
+            joined=sorted(sample - old_sample),
+            left=sorted(old_sample - sample),
+        )
+
+    def forget(self, host: str) -> None:
+        """Drop the fingerprint of a host, its next result is reported in full.
+
+        Args:
+            host (str): address to forget.
+        """
+        self._states.pop(host, None)
+
+    async def poll(self, host: str, **options: Any) -> Optional[StatusDelta]:
+        """Get the status of a server and report what changed.
+
+        Args:
+            host (str): minecraft server address.
+            **options (Any): passed on to :func:`~aiomcstats.status`.
+
+        Returns:
+            Optional[StatusDelta]: the changes, None if nothing changed.
+        """
+        return self.update(host, await status(host, **options))
+
+    async def poll_many(
+        self, hosts: Iterable[str], **options: Any
+    ) -> AsyncIterator[StatusDelta]:
+        """Poll many servers concurrently, yielding only changes.
+
+        Args:
+            hosts (Iterable[str]): minecraft server addresses.
+            **options (Any): passed on to :func:`~aiomcstats.status_many`.
+
+        Yields:
+            StatusDelta: changes of each server which changed.
+        """
+        async for host, result in status_many(hosts, **options):
+            delta = self.update(host, result)
+            if delta is not None:
+                yield delta
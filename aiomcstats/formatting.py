@@ -0,0 +1,258 @@
+"""Rendering of minecraft formatted text.
+
+Descriptions are either strings with ``§`` formatting codes or json chat
+components. Strings are rendered to raw, clean and html text in a single
+pass. Components are walked once into styled pieces of text, which are
+rendered the same way without flattening them to a ``§`` string first.
+Rendered strings and pieces are cached, so motds which do not change between
+polls are only rendered once.
+"""
+from functools import lru_cache
+from html import escape
+from typing import Any, Dict, List, Optional, Tuple
+
+COLORS: Dict[str, Tuple[str, str]] = {
+    "0": ("black", "#000000"),
+    "1": ("dark_blue", "#0000AA"),
+    "2": ("dark_green", "#00AA00"),
+    "3": ("dark_aqua", "#00AAAA"),
+    "4": ("dark_red", "#AA0000"),
+    "5": ("dark_purple", "#AA00AA"),
+    "6": ("gold", "#FFAA00"),
+    "7": ("gray", "#AAAAAA"),
+    "8": ("dark_gray", "#555555"),
+    "9": ("blue", "#5555FF"),
+    "a": ("green", "#55FF55"),
+    "b": ("aqua", "#55FFFF"),
+    "c": ("red", "#FF5555"),
+    "d": ("light_purple", "#FF55FF"),
+    "e": ("yellow", "#FFFF55"),
+    "f": ("white", "#FFFFFF"),
+}
+
+FORMATS: Dict[str, Tuple[str, str]] = {
+    "k": ("obfuscated", ""),
+    "l": ("bold", "font-weight: bold"),
+    "m": ("strikethrough", "text-decoration: line-through"),
+    "n": ("underlined", "text-decoration: underline"),
+    "o": ("italic", "font-style: italic"),
+}
+
+_HEX = {code: value for code, (_, value) in COLORS.items()}
+_NAMES = {name: code for code, (name, _) in COLORS.items()}
+_FORMAT_NAMES = {name: code for code, (name, _) in FORMATS.items()}
+_HEX_DIGITS = frozenset("0123456789abcdefABCDEF")
+
+_Style = Tuple[Optional[str], str]
+_PLAIN: _Style = (None, "")
+
+# Width of the first character of a segment once escaped.
+_WIDTHS = {"&": 5, "<": 4, ">": 4}
+
+
+@lru_cache(maxsize=1024)
+def _css(color: Optional[str], formats: str) -> str:
+    styles = ["color: " + _HEX.get(color, color)] if color else []
+    decorations = []
+    for code in formats:
+        css = FORMATS[code][1]
+        if css.startswith("text-decoration: "):
+            decorations.append(css[17:])
+        elif css:
+            styles.append(css)
+    if decorations:
+        styles.append("text-decoration: " + " ".join(decorations))
+    return "; ".join(styles)
+
+
+@lru_cache(maxsize=1024)
+def _tag(current: str, css: str) -> str:
+    close = "</span>" if current else ""
+    return close + '<span style="%s">' % escape(css) if css else close
+
+
+@lru_cache(maxsize=4096)
+def _apply(codes: str, style: _Style) -> _Style:
+    color, formats = style
+    codes = codes.lower()
+    index = 0
+    while index < len(codes):
+        code = codes[index]
+        index += 1
+        if code in _HEX:
+            color, formats = code, ""
+        elif code in FORMATS:
+            if code not in formats:
+                formats = "".join(sorted(formats + code))
+        elif code == "r":
+            color, formats = None, ""
+        elif code == "x" and _HEX_DIGITS.issuperset(codes[index : index + 6]):
+            if len(codes) >= index + 6:
+                # §x§R§R§G§G§B§B, the legacy encoding of hex colors.
+                color, formats = "#" + codes[index : index + 6].upper(), ""
+                index += 6
+    return color, formats
+
+
+@lru_cache(maxsize=4096)
+def _step(codes: str, style: _Style) -> Tuple[_Style, str]:
+    style = _apply(codes, style)
+    return style, _css(*style)
+
+
+def _write(
+    clean: List[str], html: List[str], text: str, style: _Style, current: str
+) -> str:
+    # Every segment after a § starts with a code, consecutive codes are
+    # applied together to the style the text is written in.
+    escaped = escape(text, quote=False).split("\xa7")
+    codes: Optional[str] = None
+    css = _css(*style)
+    for segment, part in zip(text.split("\xa7"), escaped):
+        if codes is not None:
+            codes += segment[:1]
+            if len(segment) < 2:
+                continue
+            style, css = _step(codes, style)
+            part = part[_WIDTHS.get(segment[0], 1) :]
+            segment = segment[1:]
+        codes = ""
+        if segment:
+            clean.append(segment)
+            if css != current:
+                html.append(_tag(current, css))
+                current = css
+            html.append(part)
+    return current
+
+
+def _lines(clean: str) -> Tuple[str, ...]:
+    if "\n" not in clean:
+        return (clean.strip(),)
+    return tuple([line.strip() for line in clean.split("\n")])
+
+
+@lru_cache(maxsize=4096)
+def _render(text: str) -> Tuple[Tuple[str, ...], str]:
+    if "\xa7" not in text:
+        return _lines(text), escape(text, quote=False)
+    clean: List[str] = []
+    html: List[str] = []
+    if _write(clean, html, text, _PLAIN, ""):
+        html.append("</span>")
+    return _lines("".join(clean)), "".join(html)
+
+
+@lru_cache(maxsize=1024)
+def _codes(color: Optional[str], formats: str) -> str:
+    if color is None:
+        prefix = ""
+    elif color.startswith("#"):
+        prefix = "§x" + "".join("§" + digit for digit in color[1:])
+    else:
+        prefix = "§" + color
+    return "§r" + prefix + "".join("§" + code for code in formats)
+
+
+def _component_style(component: Dict[str, Any], parent: _Style) -> _Style:
+    color, formats = parent
+    if "color" in component:
+        value = component["color"]
+        if value in _NAMES:
+            color = _NAMES[value]
+        elif (
+            isinstance(value, str)
+            and len(value) == 7
+            and value[0] == "#"
+            and _HEX_DIGITS.issuperset(value[1:])
+        ):
+            color = value.upper()
+        elif value == "reset":
+            color = None
+    for name in _FORMAT_NAMES.keys() & component.keys():
+        code = _FORMAT_NAMES[name]
+        if component[name] and code not in formats:
+            formats = "".join(sorted(formats + code))
+        elif not component[name]:
+            formats = formats.replace(code, "")
+    return color, formats
+
+
+def _collect(pieces: List[Tuple[_Style, str]], component: Any, style: _Style) -> None:
+    if isinstance(component, list):
+        for child in component:
+            _collect(pieces, child, style)
+        return
+    if isinstance(component, dict):
+        text = component.get("text", "")
+        children = component.get("extra", ())
+        style = _component_style(component, style)
+    else:
+        text, children = component, ()
+    if text:
+        pieces.append((style, str(text)))
+    for child in children:
+        _collect(pieces, child, style)
+
+
+@lru_cache(maxsize=4096)
+def _render_pieces(
+    pieces: Tuple[Tuple[_Style, str], ...],
+) -> Tuple[str, Tuple[str, ...], str]:
+    raw: List[str] = []
+    clean: List[str] = []
+    html: List[str] = []
+    last, span = _PLAIN, ""
+    for style, text in pieces:
+        if style != last:
+            raw.append(_codes(*style))
+            last = style
+        raw.append(text)
+        span = _write(clean, html, text, style, span)
+    if span:
+        html.append("</span>")
+    return "".join(raw), _lines("".join(clean)), "".join(html)
+
+
+def _render_component(component: Any) -> Tuple[str, Tuple[str, ...], str]:
+    pieces: List[Tuple[_Style, str]] = []
+    _collect(pieces, component, _PLAIN)
+    return _render_pieces(tuple(pieces))
+
+
+def flatten(component: Any) -> str:
+    """Flatten a json chat component to a ``§`` formatted string.
+
+    Hex colors are written as ``§x`` followed by the six digits, the same
+    way servers encode them in legacy text.
+
+    Args:
+        component (Any): chat component, a string, list or dict.
+
+    Returns:
+        str: text with formatting codes.
+    """
+    return _render_component(component)[0]
+
+
+def render(description: Any) -> Tuple[List[str], List[str], List[str]]:
+    """Render a status description.
+
+    Args:
+        description (Any): description from the status json, a string or a
+            chat component.
+
+    Returns:
+        Tuple[List[str], List[str], List[str]]: raw, clean and html motd
+    """
+    if (
+        isinstance(description, dict)
+        and len(description) == 1
+        and "text" in description
+    ):
+        description = description["text"]
+    if isinstance(description, str):
+        clean, html = _render(description)
+        return [description], list(clean), [html]
+    raw, lines, html = _render_component(description)
+    return [raw], list(lines), [html]
@@ -0,0 +1,77 @@
+"""Sharing of parsed values which repeat between status responses."""
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+def _digest(value: Any) -> bytes:
+    data = json.dumps(value, separators=(",", ":")).encode()
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+class InternCache:
+    """LRU cache of values built from blocks of the status json.
+
+    Servers on the same network usually send identical descriptions,
+    versions and mod lists. Passing the same cache to every status call
+    makes results with equal blocks share one parsed object instead of each
+    holding a copy. Blocks are keyed by a digest of their json, so equal
+    blocks only match when their keys are in the same order. Shared values
+    must not be modified.
+
+    Args:
+        maxsize (int): Maximum number of values kept. Defaults to 4096.
+    """
+
+    def __init__(self, maxsize: int = 4096) -> None:
+        self.maxsize = maxsize
+        self._values: "OrderedDict[Tuple[str, bytes], Any]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, kind: str, raw: Any, build: Callable[[Any], T]) -> T:
+        """Get the value built from a json block, building it on a miss.
+
+        Args:
+            kind (str): name of the block, values of different kinds are
+                never shared.
+            raw (Any): json block.
+            build (Callable[[Any], T]): builds the value from the block.
+
+        Returns:
+            T: the shared value.
+        """
+        key = (kind, _digest(raw))
+        try:
+            value: T = self._values[key]
+        except KeyError:
+            pass
+        else:
+            self._values.move_to_end(key)
+            self.hits += 1
+            return value
+        self.misses += 1
+        value = build(raw)
+        self._values[key] = value
+        if len(self._values) > self.maxsize:
+            self._values.popitem(last=False)
+        return value
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def stats(self) -> Dict[str, int]:
+        """Cache counters.
+
+        Returns:
+            Dict[str, int]: size, hits and misses.
+        """
+        return {"size": len(self._values), "hits": self.hits, "misses": self.misses}
+
+    def clear(self) -> None:
+        """Drop all values and reset the counters."""
+        self._values.clear()
+        self.hits = self.misses = 0
@@ -0,0 +1,246 @@
+"""Status objects which build their expensive parts on first access."""
+from functools import cached_property
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from aiomcstats.intern import InternCache
+from aiomcstats.models.java import Debug, Info, Mods, Motd, Players, Plugins
+from aiomcstats.models.java import Status, Timings
+from aiomcstats.utils import create_motd, create_mods, create_players
+from aiomcstats.utils import create_plugins
+from aiomcstats.utils import create_status
+
+
+class LazyMotd:
+    """Motd rendered the first time it is read.
+
+    Args:
+        description (Any): description from the status json.
+        interner (Optional[InternCache]): shares the rendered motd with other
+            results. Defaults to None.
+    """
+
+    def __init__(
+        self, description: Any, interner: Optional[InternCache] = None
+    ) -> None:
+        self.description = description
+        self.interner = interner
+
+    @cached_property
+    def _motd(self) -> Motd:
+        if self.interner is None:
+            return create_motd(self.description)
+        return self.interner.get("motd", self.description, create_motd)
+
+    @property
+    def raw(self) -> List[str]:
+        """Raw motd with minecraft formatting.
+
+        Returns:
+            List[str]: raw motd.
+        """
+        return self._motd.raw
+
+    @property
+    def clean(self) -> List[str]:
+        """Cleaned motd without minecraft formatting.
+
+        Returns:
+            List[str]: clean motd.
+        """
+        return self._motd.clean
+
+    @property
+    def html(self) -> List[str]:
+        """Html motd with html formatting.
+
+        Returns:
+            List[str]: html motd.
+        """
+        return self._motd.html
+
+
+class LazyPlayers:
+    """Player counts, with the sample only parsed when read.
+
+    Args:
+        raw (Dict[str, Any]): players from the status json.
+        names (Optional[List[str]]): every player online, from a query.
+            Defaults to None.
+    """
+
+    def __init__(self, raw: Dict[str, Any], names: Optional[List[str]] = None) -> None:
+        self.raw = raw
+        self.names = names
+        self.online: int = raw["online"]
+        self.max: int = raw["max"]
+
+    @cached_property
+    def _players(self) -> Players:
+        players = create_players(self.raw)[0]
+        if self.names is not None:
+            players.list = self.names
+        return players
+
+    @property
+    def list(self) -> Optional[List[str]]:
+        """Names of the players in the sample, or all of them after a query.
+
+        Returns:
+            Optional[List[str]]: player names.
+        """
+        return self._players.list
+
+    @property
+    def uuid(self) -> Optional[Dict[str, UUID]]:
+        """Uuids of the players in the sample by name.
+
+        Returns:
+            Optional[Dict[str, UUID]]: player uuids.
+        """
+        return self._players.uuid
+
+
+class LazyStatus:
+    """Online status keeping the raw json and parsing fields on demand.
+
+    Counts, version and latency are read straight from the json. The motd,
+    player sample and mod list are built and cached the first time they are
+    accessed. :meth:`to_status` builds the full :class:`Status` model.
+
+    Args:
+        raw (Dict[str, Any]): raw json
+        ip (str): ip of server
+        port (int): port of server
+        hostname (str): hostname of server
+        srv (bool): wether srv used
+        interner (Optional[InternCache]): shares the version, and the motd
+            and mods once built, with other results. Defaults to None.
+    """
+
+    online = True
+
+    def __init__(
+        self,
+        raw: Dict[str, Any],
+        ip: str,
+        port: int,
+        hostname: str,
+        srv: bool,
+        interner: Optional[InternCache] = None,
+    ) -> None:
+        self.raw = raw
+        self.ip = ip
+        self.port = port
+        self.hostname = hostname
+        self.srv = srv
+        self.interner = interner
+        version = raw["version"]["name"]
+        if interner is not None:
+            version = interner.get("version", version, str)
+        self.version: str = version
+        self.protocol: Optional[int] = raw["version"].get("protocol")
+        self.players = LazyPlayers(raw["players"], raw.get("query", {}).get("players"))
+        self.motd = LazyMotd(raw["description"], interner)
+        self.latency: Optional[float] = raw.get("timings", {}).get("latency")
+
+    @property
+    def map(self) -> str:
+        """Current map.
+
+        Returns:
+            str: map name.
+        """
+        if "query" in self.raw:
+            return self.raw["query"].get("map", "world")  # type: ignore[no-any-return]
+        return self.raw.get("map", "world")  # type: ignore[no-any-return]
+
+    @property
+    def icon(self) -> Optional[str]:
+        """Favicon of server.
+
+        Returns:
+            Optional[str]: base64 favicon.
+        """
+        return self.raw.get("favicon")
+
+    @property
+    def icon_hash(self) -> Optional[str]:
+        """Sha256 of the favicon left out by skip_favicon.
+
+        Returns:
+            Optional[str]: hex encoded hash.
+        """
+        return self.raw.get("favicon_hash")
+
+    @property
+    def software(self) -> Optional[str]:
+        """Software running server.
+
+        Returns:
+            Optional[str]: software name.
+        """
+        if "software" in self.raw:
+            return self.raw["software"]  # type: ignore[no-any-return]
+        return create_plugins(self.raw)[0]
+
+    @cached_property
+    def debug(self) -> Debug:
+        """Debug data.
+
+        Returns:
+            Debug: debug data.
+        """
+        return Debug(ping=True, query="query" in self.raw, srv=self.srv)
+
+    @cached_property
+    def info(self) -> Optional[Info]:
+        """Info provided in players rather then players.
+
+        Returns:
+            Optional[Info]: info.
+        """
+        return create_players(self.raw["players"])[1]
+
+    @cached_property
+    def plugins(self) -> Optional[Plugins]:
+        """Plugins installed, from a query.
+
+        Returns:
+            Optional[Plugins]: plugins.
+        """
+        return create_plugins(self.raw)[1]
+
+    @cached_property
+    def mods(self) -> Optional[Mods]:
+        """Mods installed.
+
+        Returns:
+            Optional[Mods]: mods.
+        """
+        if self.interner is None or "modinfo" not in self.raw:
+            return create_mods(self.raw)
+        return self.interner.get(
+            "mods", self.raw["modinfo"], lambda _: create_mods(self.raw)
+        )
+
+    @cached_property
+    def timings(self) -> Optional[Timings]:
+        """Breakdown of the request timings.
+
+        Returns:
+            Optional[Timings]: timings.
+        """
+        if "timings" not in self.raw:
+            return None
+        return Timings(**self.raw["timings"])
+
+    def to_status(self) -> Status:
+        """Build the full status model.
+
+        Returns:
+            Status: Status object
+        """
+        return create_status(
+            self.raw, self.ip, self.port, self.hostname, self.srv, self.interner
+        )
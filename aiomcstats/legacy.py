@@ -0,0 +1,239 @@
+"""Legacy 0xFE server list pings of servers older than 1.7."""
+import functools
+from collections import OrderedDict
+from time import monotonic, perf_counter_ns
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from aiomcstats.connection import Connection
+from aiomcstats.ping import Ping, _ms
+
+PROTOCOLS: Tuple[str, ...] = ("modern", "1.6", "1.4")
+
+
+@functools.lru_cache(maxsize=65536)
+def legacy_frame(
+    host: str, port: int, version: str = "1.6", protocol: int = 74
+) -> bytes:
+    """Encoded legacy ping request.
+
+    Args:
+        host (str): hostname sent with the 1.6 ping.
+        port (int): port sent with the 1.6 ping.
+        version (str): "1.6" for the ping with the MC|PingHost plugin
+            message proxies route by, or "1.4" for the bare ping.
+            Defaults to "1.6".
+        protocol (int): protocol version sent with the 1.6 ping.
+            Defaults to 74.
+
+    Returns:
+        bytes: ping request.
+    """
+    if version == "1.4":
+        return b"\xfe\x01"
+    hostname = host.encode("utf-16-be")
+    data = Connection()
+    data.write(bytes((protocol,)))
+    data.write_short(len(hostname) // 2)
+    data.write(hostname)
+    data.write_int(port)
+    channel = "MC|PingHost"
+    frame = Connection()
+    frame.write(b"\xfe\x01\xfa")
+    frame.write_short(len(channel))
+    frame.write(channel.encode("utf-16-be"))
+    frame.write_short(len(data.sent))
+    frame.write(data)
+    return bytes(frame.flush())
+
+
+def parse_legacy(text: str) -> Dict[str, Any]:
+    """Convert a legacy kick message to the shape of the status json.
+
+    Servers from 1.4 prefix the fields with ``§1`` and include the protocol
+    and version, older ones only send the motd and player counts.
+
+    Args:
+        text (str): decoded kick message.
+
+    Raises:
+        IOError: the message is not a ping response.
+
+    Returns:
+        Dict[str, Any]: status json with version, players and description.
+    """
+    try:
+        if text.startswith("\xa71\x00"):
+            _, protocol, name, motd, online, maximum = text.split("\x00")
+            version: Dict[str, Any] = {"name": name, "protocol": int(protocol)}
+        else:
+            motd, online, maximum = text.rsplit("\xa7", 2)
+            version = {"name": "<1.4", "protocol": None}
+        players = {"online": int(online), "max": int(maximum)}
+    except ValueError:
+        raise IOError("Received invalid legacy ping response.")
+    return {"version": version, "players": players, "description": motd}
+
+
+class LegacyPing(Ping):
+    """Ping for servers which only answer the legacy 0xFE ping.
+
+    The server answers with a kick packet carrying the status and closes
+    the connection, so there is no latency ping. The interface matches
+    Ping and the status is returned in the shape of the status json.
+
+    Args:
+        host (str): hostname of the server.
+        port (int): port of the server.
+        protocol (int): protocol version sent with the 1.6 ping.
+            Defaults to 74.
+        skip_favicon (bool): unused, legacy servers send no favicon.
+            Defaults to False.
+        addresses (Optional[Sequence[str]]): resolved addresses of the
+            server raced by :func:`~aiomcstats.connection.staggered_race`.
+            Defaults to host.
+        delay (float): seconds between connection attempts.
+            Defaults to 0.25.
+        version (str): "1.6" or "1.4", see :func:`legacy_frame`.
+            Defaults to "1.6".
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        protocol: int = 74,
+        skip_favicon: bool = False,
+        addresses: Optional[Sequence[str]] = None,
+        delay: float = 0.25,
+        version: str = "1.6",
+    ) -> None:
+        super().__init__(host, port, protocol, skip_favicon, addresses, delay)
+        self.version = version
+
+    async def status(self) -> Dict[str, Any]:
+        """Request the server status.
+
+        Raises:
+            IOError: the server did not answer with a kick packet.
+
+        Returns:
+            Dict[str, Any]: status json with timings.
+        """
+        sent = perf_counter_ns()
+        self.connection.write(
+            legacy_frame(self.host, self.port, self.version, self.protocol)
+        )
+        kind = await self.connection.read(1)
+        first_byte = perf_counter_ns()
+        if kind != b"\xff":
+            raise IOError("Received invalid legacy ping response.")
+        length = await self.connection.read_ushort()
+        data = await self.connection.read(length * 2)
+        received = perf_counter_ns()
+        raw = parse_legacy(data.decode("utf-16-be", "replace"))
+        self.timings["first_byte"] = _ms(sent, first_byte)
+        self.timings["transfer"] = _ms(first_byte, received)
+        raw["timings"] = self.timings
+        return raw
+
+    async def ping(self) -> float:
+        """Legacy servers close the connection after the status.
+
+        Raises:
+            IOError: always.
+        """
+        raise IOError("Legacy servers do not answer pings.")
+
+
+class ProtocolCache:
+    """Legacy ping protocol of servers which only answer legacy pings.
+
+    Servers are first asked with the modern ping and then with the legacy
+    pings in the order of :data:`PROTOCOLS`. Modern servers answer the
+    legacy ping too, so a legacy protocol is only remembered once it
+    answered after ``threshold`` modern pings failed in a row. Later polls
+    try it first until it expires ``ttl`` seconds after it was remembered,
+    successes do not renew it, so every server is probed with the modern
+    ping again once an hour by default. A modern answer forgets the server.
+
+    Args:
+        maxsize (int): Maximum number of servers kept. Defaults to 65536.
+        ttl (float): Seconds a protocol is kept. Defaults to 3600.
+        threshold (int): Modern failures in a row before a legacy protocol
+            is remembered. Defaults to 3.
+    """
+
+    def __init__(
+        self, maxsize: int = 65536, ttl: float = 3600, threshold: int = 3
+    ) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.threshold = threshold
+        # Protocol, when it expires and how many polls in a row it answered.
+        self._protocols: "OrderedDict[Hashable, Tuple[str, float, int]]"
+        self._protocols = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._protocols)
+
+    def get(self, key: Hashable) -> Optional[str]:
+        """Legacy protocol remembered for a server.
+
+        Args:
+            key (Hashable): server key, ``(hostname, port)``.
+
+        Returns:
+            Optional[str]: protocol, None when unknown, expired or not yet
+                answered ``threshold`` times in a row.
+        """
+        entry = self._protocols.get(key)
+        if entry is None or entry[2] < self.threshold:
+            return None
+        if entry[1] <= monotonic():
+            del self._protocols[key]
+            return None
+        return entry[0]
+
+    def set(self, key: Hashable, protocol: str) -> None:
+        """Record the protocol a server answered.
+
+        Args:
+            key (Hashable): server key.
+            protocol (str): one of :data:`PROTOCOLS`.
+        """
+        if protocol == "modern":
+            self._protocols.pop(key, None)
+            return
+        if self.get(key) == protocol:
+            return
+        entry = self._protocols.get(key)
+        streak = entry[2] + 1 if entry is not None and entry[0] == protocol else 1
+        self._protocols[key] = (protocol, monotonic() + self.ttl, streak)
+        self._protocols.move_to_end(key)
+        if len(self._protocols) > self.maxsize:
+            self._protocols.popitem(last=False)
+
+    def forget(self, key: Hashable) -> None:
+        """Drop the protocol of a server.
+
+        Args:
+            key (Hashable): server key.
+        """
+        self._protocols.pop(key, None)
+
+    def order(self, key: Hashable) -> List[str]:
+        """Protocols to try, the remembered one first.
+
+        Args:
+            key (Hashable): server key.
+
+        Returns:
+            List[str]: protocols in the order to try them.
+        """
+        known = self.get(key)
+        if known is None:
+            return list(PROTOCOLS)
+        return [known] + [protocol for protocol in PROTOCOLS if protocol != known]
+
+
+default_protocols = ProtocolCache()
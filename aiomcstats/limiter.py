@@ -0,0 +1,117 @@
+"""Concurrency limit adapting to timeouts, like TCP congestion control."""
+import asyncio
+from collections import deque
+from typing import Deque, Dict
+
+
+class AIMDLimiter:
+    """Additive increase, multiplicative decrease limit of requests in flight.
+
+    The timeout rate is tracked as an exponential moving average of
+    completed requests. While it stays at or below ``threshold`` every
+    completion raises the limit by ``increase / limit``, about ``increase``
+    per round of ``limit`` requests. A timeout while the rate is above
+    ``threshold`` multiplies the limit by ``decrease``, at most once per
+    round so a single burst of timeouts only cuts it once.
+
+    Args:
+        initial (float): Starting limit. Defaults to 20.
+        minimum (int): Lowest limit. Defaults to 1.
+        maximum (int): Highest limit. Defaults to 1000.
+        increase (float): Growth of the limit per round. Defaults to 1.
+        decrease (float): Factor applied to the limit on congestion.
+            Defaults to 0.5.
+        threshold (float): Timeout rate treated as congestion.
+            Defaults to 0.05.
+        smoothing (float): Weight of each completion in the timeout rate.
+            Defaults to 0.05.
+
+    Raises:
+        ValueError: minimum is less than one or above maximum.
+    """
+
+    def __init__(
+        self,
+        initial: float = 20,
+        minimum: int = 1,
+        maximum: int = 1000,
+        increase: float = 1,
+        decrease: float = 0.5,
+        threshold: float = 0.05,
+        smoothing: float = 0.05,
+    ) -> None:
+        if not 1 <= minimum <= maximum:
+            raise ValueError("minimum must be at least 1 and at most maximum")
+        self.minimum = minimum
+        self.maximum = maximum
+        self.limit = float(min(max(initial, minimum), maximum))
+        self.increase = increase
+        self.decrease = decrease
+        self.threshold = threshold
+        self.smoothing = smoothing
+        self.timeout_rate = 0.0
+        self.in_flight = 0
+        self.completed = 0
+        self.timeouts = 0
+        self.decreases = 0
+        self._cooldown = 0
+        self._waiters: "Deque[asyncio.Future[None]]" = deque()
+
+    async def acquire(self) -> None:
+        """Wait until a request may start."""
+        while self.in_flight >= int(self.limit):
+            waiter: "asyncio.Future[None]"
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    self._wake()
+                raise
+        self.in_flight += 1
+
+    def release(self, timed_out: bool = False) -> None:
+        """Finish a request and adjust the limit.
+
+        Args:
+            timed_out (bool): wether the request timed out. Defaults to False.
+        """
+        self.in_flight -= 1
+        self.completed += 1
+        self.timeout_rate += self.smoothing * (timed_out - self.timeout_rate)
+        if self._cooldown:
+            self._cooldown -= 1
+        if timed_out:
+            self.timeouts += 1
+            if self.timeout_rate > self.threshold and not self._cooldown:
+                self.limit = max(self.minimum, self.limit * self.decrease)
+                self._cooldown = int(self.limit) + self.in_flight
+                self.decreases += 1
+        elif self.timeout_rate <= self.threshold:
+            self.limit = min(self.maximum, self.limit + self.increase / self.limit)
+        self._wake()
+
+    def _wake(self) -> None:
+        free = int(self.limit) - self.in_flight
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+    def stats(self) -> Dict[str, float]:
+        """Current limit and the signals it is derived from.
+
+        Returns:
+            Dict[str, float]: limit, in flight requests, timeout rate and
+                counters of completions, timeouts and decreases.
+        """
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "timeout_rate": self.timeout_rate,
+            "completed": self.completed,
+            "timeouts": self.timeouts,
+            "decreases": self.decreases,
+        }
@@ -1,15 +1,131 @@
+import asyncio
+import functools
 from aiomcstats.models.bedrock import BedrockOffline, BedrockStatus
 
-from aiomcstats.ping import Ping
-from aiomcstats.utils import create_status, get_raw
+from aiomcstats.ping import Ping, ProtocolPing
+from aiomcstats.utils import create_fast_status, create_status, get_addresses
+from aiomcstats.utils import get_raw
 from aiomcstats.models.java import Debug, OfflineStatus, Status
-from typing import Optional, Union
-from aiomcstats.bedrock import bedrock_status
+from aiomcstats.models.fast import FastBedrockOffline, FastBedrockStatus, FastDebug
+from aiomcstats.models.fast import FastOfflineStatus, FastStatus
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, Iterator
+from typing import List, Literal, Optional, Tuple, Type, TypeVar, Union, overload
+from aiomcstats.bedrock import bedrock_status, BedrockMultiplexer
+from aiomcstats.resolver import ResolverCache
+from aiomcstats.retry import RetryPolicy
+from aiomcstats.breaker import CircuitBreaker
+from aiomcstats.lazy import LazyStatus
+from aiomcstats.intern import InternCache
+from aiomcstats.rtt import RTTEstimator
+from aiomcstats.limiter import AIMDLimiter
+from aiomcstats.query import QueryMultiplexer
+from aiomcstats.legacy import default_protocols, LegacyPing, ProtocolCache
 
+import dns.asyncresolver
 
+T = TypeVar("T")
+
+TRANSPORTS: Dict[str, Union[Type[Ping], Type[ProtocolPing]]] = {
+    "stream": Ping,
+    "protocol": ProtocolPing,
+}
+RESULTS: Dict[str, Callable[..., Any]] = {
+    "model": create_status,
+    "lazy": LazyStatus,
+    "fast": create_fast_status,
+}
+# Seconds allowed for each reply without an RTTEstimator, so a server which
+# never answers one protocol is still asked with the next.
+READ_TIMEOUT: float = 3
+
+
+@overload
+async def status(
+    host: str,
+    port: Optional[int] = None,
+    tries: Optional[int] = 3,
+    resolver: Optional[Union[ResolverCache, dns.asyncresolver.Resolver]] = None,
+    transport: str = "stream",
+    policy: Optional[RetryPolicy] = None,
+    breaker: Optional[CircuitBreaker] = None,
+    result: Literal["model"] = "model",
+    skip_favicon: bool = False,
+    interner: Optional[InternCache] = None,
+    rtt: Optional[RTTEstimator] = None,
+    query: Optional[QueryMultiplexer] = None,
+    protocols: Optional[ProtocolCache] = None,
+) -> Union[Status, OfflineStatus]: ...
+
+
+@overload
+async def status(
+    host: str,
+    port: Optional[int] = None,
+    tries: Optional[int] = 3,
+    resolver: Optional[Union[ResolverCache, dns.asyncresolver.Resolver]] = None,
+    transport: str = "stream",
+    policy: Optional[RetryPolicy] = None,
+    breaker: Optional[CircuitBreaker] = None,
+    result: Literal["lazy"] = ...,
+    skip_favicon: bool = False,
+    interner: Optional[InternCache] = None,
+    rtt: Optional[RTTEstimator] = None,
+    query: Optional[QueryMultiplexer] = None,
+    protocols: Optional[ProtocolCache] = None,
+) -> Union[LazyStatus, OfflineStatus]: ...
+
+
+@overload
 async def status(
-    host: str, port: Optional[int] = None, tries: Optional[int] = 3
-) -> Union[Status, OfflineStatus]:
+    host: str,
+    port: Optional[int] = None,
+    tries: Optional[int] = 3,
+    resolver: Optional[Union[ResolverCache, dns.asyncresolver.Resolver]] = None,
+    transport: str = "stream",
+    policy: Optional[RetryPolicy] = None,
+    breaker: Optional[CircuitBreaker] = None,
+    result: Literal["fast"] = ...,
+    skip_favicon: bool = False,
+    interner: Optional[InternCache] = None,
+    rtt: Optional[RTTEstimator] = None,
+    query: Optional[QueryMultiplexer] = None,
+    protocols: Optional[ProtocolCache] = None,
+) -> Union[FastStatus, FastOfflineStatus]: ...
+
+
+@overload
+async def status(
+    host: str,
+    port: Optional[int] = None,
+    tries: Optional[int] = 3,
+    resolver: Optional[Union[ResolverCache, dns.asyncresolver.Resolver]] = None,
+    transport: str = "stream",
+    policy: Optional[RetryPolicy] = None,
+    breaker: Optional[CircuitBreaker] = None,
+    result: str = "model",
+    skip_favicon: bool = False,
+    interner: Optional[InternCache] = None,
+    rtt: Optional[RTTEstimator] = None,
+    query: Optional[QueryMultiplexer] = None,
+    protocols: Optional[ProtocolCache] = None,
+) -> Union[Status, LazyStatus, FastStatus, OfflineStatus, FastOfflineStatus]: ...
+
+
+async def status(
+    host: str,
+    port: Optional[int] = None,
+    tries: Optional[int] = 3,
+    resolver: Optional[Union[ResolverCache, dns.asyncresolver.Resolver]] = None,
+    transport: str = "stream",
+    policy: Optional[RetryPolicy] = None,
+    breaker: Optional[CircuitBreaker] = None,
+    result: str = "model",
+    skip_favicon: bool = False,
+    interner: Optional[InternCache] = None,
+    rtt: Optional[RTTEstimator] = None,
+    query: Optional[QueryMultiplexer] = None,
+    protocols: Optional[ProtocolCache] = None,
+) -> Union[Status, LazyStatus, FastStatus, OfflineStatus, FastOfflineStatus]:
     """Get status from Minecraft server.
 
     Args:
@@ -18,56 +134,491 @@ async def status(
             it is found. Defaults to None.
         tries (Optional[int], optional): The amount of tries to get
             data from server. Defaults to 3.
+        resolver (Optional[Union[ResolverCache, dns.asyncresolver.Resolver]],
+            optional): resolver used for SRV and A lookups. Defaults to the
+            shared ResolverCache.
+        transport (str): "stream" to use asyncio streams or "protocol" for
+            the lighter asyncio.Protocol based pinger. Defaults to "stream".
+        policy (Optional[RetryPolicy]): retry policy, replaces tries when
+            given. Defaults to a RetryPolicy with tries attempts.
+        breaker (Optional[CircuitBreaker]): returns cached offline results
+            for servers that keep failing. Defaults to None.
+        result (str): "model" for a Status model, "lazy" for a LazyStatus
+            which parses the motd, player sample and mods on first access or
+            "fast" for unvalidated FastStatus and FastOfflineStatus tuples.
+            Defaults to "model".
+        skip_favicon (bool): leave the favicon out of the result and only
+            report its icon_hash, so it is never decoded. This keeps the
+            icon out of memory, hashing it costs about as much time as
+            decoding it would. Defaults to False.
+        interner (Optional[InternCache]): shares the motd, version and mods
+            between results with identical blocks. Defaults to None.
+        rtt (Optional[RTTEstimator]): derives the connect and read
+            deadlines of each server from its observed round trip times.
+            Defaults to 3 second connect and read timeouts.
+        query (Optional[QueryMultiplexer]): also sends a full stat query to
+            the address which answered the ping, for the complete player
+            list, plugins and map. Servers without query enabled are still
+            reported online with debug.query False. Defaults to None.
+        protocols (Optional[ProtocolCache]): remembers the legacy ping of
+            servers which repeatedly only answered it. Servers are asked with
+            the modern ping first and then the 1.6 and 1.4 legacy pings, a
+            remembered protocol is tried before the others.
+            Defaults to the shared ProtocolCache.
+
+    Raises:
+        ValueError: Unknown transport or result.
 
     Returns:
-        Union[Status, OfflineStatus]: Online or Offline status object.
+        Union[Status, LazyStatus, FastStatus, OfflineStatus, FastOfflineStatus]:
+            Online or Offline status object.
     """
-    exception = ""
+    if transport not in TRANSPORTS:
+        raise ValueError("Unknown transport '%s'" % transport)
+    pinger_class = TRANSPORTS[transport]
+    factory = _factory(result)
     try:
-        hostname, port, ip, srv = await get_raw(host, port)
+        hostname, port, addresses, srv = await get_addresses(host, port, resolver)
     except Exception as e:
-        exception = str(e)
-        debug = Debug(
-        ping=False,
-        query=False,
-        srv=False,
+        return _offline(result, host, port, host, str(e))
+    ip = addresses[0]
+    cached = _cached(breaker, (hostname, port))
+    if cached is not None:
+        return cached  # type: ignore[no-any-return]
+    if policy is None:
+        policy = RetryPolicy(tries=tries or 1)
+    try:
+        raw, ip = await policy.run(
+            functools.partial(
+                _ping,
+                pinger_class,
+                hostname,
+                port,
+                skip_favicon,
+                addresses,
+                rtt,
+                protocols,
+            )
         )
-        return OfflineStatus(
+        await _query(query, raw, ip, port)
+        data = factory(raw, ip, port, hostname, srv, interner)
+    except Exception as e:
+        offline = _offline(result, ip, port, hostname, str(e), ping=True, srv=srv)
+        return _record(breaker, (hostname, port), offline, failed=True)
+    return _record(breaker, (hostname, port), data)  # type: ignore[no-any-return]
+
+
+async def _query(
+    query: Optional[QueryMultiplexer], raw: Dict[str, Any], ip: str, port: int
+) -> None:
+    if query is None:
+        return
+    try:
+        raw["query"] = await query.full_stat(ip, port)
+    except Exception:
+        pass  # Query is disabled on most servers
+
+
+def _offline(
+    result: str,
+    ip: Optional[str],
+    port: Optional[int],
+    hostname: str,
+    error: str,
+    ping: bool = False,
+    srv: bool = False,
+) -> Union[OfflineStatus, FastOfflineStatus]:
+    if result == "fast":
+        return FastOfflineStatus(
             online=False,
-            ip=host,
+            ip=ip,
             port=port,
-            debug=debug,
-            hostname=host,
-            error=exception,
+            debug=FastDebug(ping=ping, query=False, srv=srv),
+            hostname=hostname,
+            error=error,
         )
-    for _ in range(tries):
-        try:
-            pinger = Ping(hostname, port)
-            await pinger.connect()
-            await pinger.handshake()
-            result = await pinger.status()
-            data = create_status(result, ip, port, hostname, srv)
-            return data
-        except Exception as e:
-            exception = str(e)
-    debug = Debug(
-        ping=True,
-        query=False,
-        srv=srv,
-    )
     return OfflineStatus(
         online=False,
         ip=ip,
         port=port,
-        debug=debug,
+        debug=Debug(ping=ping, query=False, srv=srv),
         hostname=hostname,
-        error=exception,
+        error=error,
+    )
+
+
+def _bedrock_offline(
+    fast: bool, ip: str, port: int, hostname: str, error: str
+) -> Union[BedrockOffline, FastBedrockOffline]:
+    if fast:
+        return FastBedrockOffline(
+            online=False, ip=ip, port=port, hostname=hostname, error=error
+        )
+    return BedrockOffline(
+        online=False, ip=ip, port=port, hostname=hostname, error=error
+    )
+
+
+def _factory(result: str) -> Callable[..., Any]:
+    try:
+        return RESULTS[result]
+    except KeyError:
+        raise ValueError("Unknown result '%s'" % result)
+
+
+def _cached(breaker: Optional[CircuitBreaker], key: Tuple[Any, ...]) -> Optional[Any]:
+    if breaker is None:
+        return None
+    return breaker.check(key)
+
+
+def _record(
+    breaker: Optional[CircuitBreaker],
+    key: Tuple[Any, ...],
+    result: T,
+    failed: bool = False,
+) -> T:
+    if breaker is not None:
+        if failed:
+            breaker.failure(key, result)
+        else:
+            breaker.success(key)
+    return result
+
+
+async def _deadline(
+    awaitable: Awaitable[T],
+    rtt: Optional[RTTEstimator],
+    key: Tuple[Any, ...],
+    default: Optional[float],
+    extra: float = 0,
+) -> T:
+    timeout = default if rtt is None else rtt.timeout(key)
+    if timeout is not None:
+        timeout += extra
+    try:
+        return await asyncio.wait_for(awaitable, timeout)
+    except asyncio.TimeoutError:
+        if rtt is not None:
+            rtt.backoff(key)
+        raise asyncio.TimeoutError(
+            "%s timed out after %s seconds" % (key[-1].capitalize(), timeout)
+        )
+
+
+async def _ping(
+    pinger_class: Union[Type[Ping], Type[ProtocolPing]],
+    host: str,
+    port: int,
+    skip_favicon: bool = False,
+    addresses: Optional[List[str]] = None,
+    rtt: Optional[RTTEstimator] = None,
+    protocols: Optional[ProtocolCache] = None,
+) -> Tuple[Dict[str, Any], str]:
+    if protocols is None:
+        protocols = default_protocols
+    key = (host, port)
+    order = protocols.order(key)
+    connect_key = (host, port, "connect")
+    for index, protocol in enumerate(order):
+        pinger: Union[Ping, ProtocolPing]
+        if protocol == "modern":
+            pinger = pinger_class(
+                host, port, skip_favicon=skip_favicon, addresses=addresses
+            )
+        else:
+            pinger = LegacyPing(host, port, addresses=addresses, version=protocol)
+        try:
+            # Every address of the staggered race gets the whole timeout.
+            race = pinger.delay * (len(pinger.addresses) - 1)
+            timeout = (3 if rtt is None else rtt.timeout(connect_key)) + race
+            await _deadline(pinger.connect(timeout), rtt, connect_key, 3, race)
+            try:
+                result = await _exchange(pinger, host, port, rtt)
+            except Exception:
+                if index == len(order) - 1:
+                    protocols.forget(key)
+                    raise
+                # Old servers and some proxies drop pings they do not speak,
+                # try the next protocol on the address that accepted.
+                addresses = [pinger.address or host]
+                continue
+            protocols.set(key, protocol)
+            return result, pinger.address or host
+        finally:
+            pinger.close()
+    raise ValueError("No ping protocols to try")
+
+
+async def _exchange(
+    pinger: Union[Ping, ProtocolPing],
+    host: str,
+    port: int,
+    rtt: Optional[RTTEstimator] = None,
+) -> Dict[str, Any]:
+    connect_key = (host, port, "connect")
+    status_key = (host, port, "status")
+    await pinger.handshake()
+    result = await _deadline(pinger.status(), rtt, status_key, READ_TIMEOUT)
+    try:
+        await _deadline(pinger.ping(), rtt, connect_key, READ_TIMEOUT)
+    except Exception:
+        pass  # Some servers close the connection after the status
+    if rtt is not None:
+        _observe(rtt, connect_key, status_key, pinger.timings)
+    return result
+
+
+def _observe(
+    rtt: RTTEstimator,
+    connect_key: Tuple[Any, ...],
+    status_key: Tuple[Any, ...],
+    timings: Dict[str, Optional[float]],
+) -> None:
+    # The connect and latency ping are one round trip each, the status is
+    # timed from the request to the last byte of the response.
+    connect = timings.get("connect")
+    if connect is not None:
+        rtt.observe(connect_key, connect / 1000)
+    first_byte, transfer = timings.get("first_byte"), timings.get("transfer")
+    if first_byte is not None and transfer is not None:
+        rtt.observe(status_key, (first_byte + transfer) / 1000)
+    latency = timings.get("latency")
+    if latency is not None:
+        rtt.observe(connect_key, latency / 1000)
+
+
+@overload
+def status_many(
+    hosts: Iterable[str],
+    concurrency: int = 100,
+    per_host_timeout: Optional[float] = 10,
+    tries: Optional[int] = 3,
+    resolver: Optional[ResolverCache] = None,
+    interner: Optional[InternCache] = None,
+    result: Literal["model"] = "model",
+    limiter: Optional[AIMDLimiter] = None,
+) -> AsyncIterator[Tuple[str, Union[Status, OfflineStatus]]]: ...
+
+
+@overload
+def status_many(
+    hosts: Iterable[str],
+    concurrency: int = 100,
+    per_host_timeout: Optional[float] = 10,
+    tries: Optional[int] = 3,
+    resolver: Optional[ResolverCache] = None,
+    interner: Optional[InternCache] = None,
+    result: Literal["lazy"] = ...,
+    limiter: Optional[AIMDLimiter] = None,
+) -> AsyncIterator[Tuple[str, Union[LazyStatus, OfflineStatus]]]: ...
+
+
+@overload
+def status_many(
+    hosts: Iterable[str],
+    concurrency: int = 100,
+    per_host_timeout: Optional[float] = 10,
+    tries: Optional[int] = 3,
+    resolver: Optional[ResolverCache] = None,
+    interner: Optional[InternCache] = None,
+    result: Literal["fast"] = ...,
+    limiter: Optional[AIMDLimiter] = None,
+) -> AsyncIterator[Tuple[str, Union[FastStatus, FastOfflineStatus]]]: ...
+
+
+@overload
+def status_many(
+    hosts: Iterable[str],
+    concurrency: int = 100,
+    per_host_timeout: Optional[float] = 10,
+    tries: Optional[int] = 3,
+    resolver: Optional[ResolverCache] = None,
+    interner: Optional[InternCache] = None,
+    result: str = "model",
+    limiter: Optional[AIMDLimiter] = None,
+) -> AsyncIterator[Tuple[str, Any]]: ...
+
+
+async def status_many(
+    hosts: Iterable[str],
+    concurrency: int = 100,
+    per_host_timeout: Optional[float] = 10,
+    tries: Optional[int] = 3,
+    resolver: Optional[ResolverCache] = None,
+    interner: Optional[InternCache] = None,
+    result: str = "model",
+    limiter: Optional[AIMDLimiter] = None,
+) -> AsyncIterator[Tuple[str, Any]]:
+    """Get status from many Minecraft servers concurrently.
+
+    At most ``concurrency`` hosts are queried at once and every query in the
+    batch shares one resolver cache. Results are yielded as soon as they complete,
+    so they do not arrive in the same order as ``hosts``.
+
+    Args:
+        hosts (Iterable[str]): minecraft server addresses, optionally
+            with a port (``host:port``).
+        concurrency (int): Maximum number of hosts queried at once.
+            Defaults to 100.
+        per_host_timeout (Optional[float]): Seconds allowed for each host
+            including all tries, None for no limit. Defaults to 10.
+        tries (Optional[int], optional): The amount of tries to get
+            data from each server. Defaults to 3.
+        resolver (Optional[ResolverCache]): DNS cache shared by the batch.
+            Defaults to the shared ResolverCache.
+        interner (Optional[InternCache]): shares the motd, version and mods
+            between results with identical blocks. Defaults to None.
+        result (str): result type, see :func:`status`. Defaults to "model".
+        limiter (Optional[AIMDLimiter]): adapts the number of hosts queried
+            at once to the timeout rate, between its minimum and maximum in
+            place of concurrency. Defaults to None.
+
+    Yields:
+        Tuple[str, Any]: Address as given in ``hosts`` and its status
+            object.
+
+    Raises:
+        ValueError: concurrency is less than one or unknown result.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    _factory(result)
+    if limiter is not None:
+        concurrency = limiter.maximum
+    pending = iter(hosts)
+    results: "asyncio.Queue[Optional[Tuple[str, Any]]]"
+    results = asyncio.Queue(maxsize=concurrency)
+    fetch = functools.partial(
+        _limited_status,
+        limiter,
+        timeout=per_host_timeout,
+        tries=tries,
+        resolver=resolver,
+        interner=interner,
+        result=result,
     )
+    workers: List["asyncio.Task[None]"] = [
+        asyncio.create_task(_worker(pending, results, fetch))
+        for _ in range(concurrency)
+    ]
+    try:
+        running = len(workers)
+        while running:
+            item = await results.get()
+            if item is None:
+                running -= 1
+                continue
+            yield item
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+
+async def _worker(
+    pending: Iterator[str],
+    results: "asyncio.Queue[Optional[Tuple[str, Any]]]",
+    fetch: Callable[[str], Awaitable[Any]],
+) -> None:
+    # Workers share the iterator, each takes the next host when it is free
+    # and puts None once the hosts run out.
+    for host in pending:
+        await results.put((host, await fetch(host)))
+    await results.put(None)
+
+
+async def _limited_status(
+    limiter: Optional[AIMDLimiter], host: str, **options: Any
+) -> Any:
+    if limiter is None:
+        return await _timed_status(host, **options)
+    await limiter.acquire()
+    try:
+        data = await _timed_status(host, **options)
+    except BaseException:
+        limiter.release()
+        raise
+    # Timeouts are the congestion signal the limiter backs off on.
+    limiter.release(_timed_out(data))
+    return data
 
 
+def _timed_out(result: Any) -> bool:
+    return not result.online and "timed out" in result.error.lower()
+
+
+async def _timed_status(
+    host: str,
+    timeout: Optional[float],
+    tries: Optional[int],
+    resolver: Optional[ResolverCache],
+    interner: Optional[InternCache] = None,
+    result: str = "model",
+) -> Any:
+    try:
+        return await asyncio.wait_for(
+            status(
+                host, tries=tries, resolver=resolver, interner=interner, result=result
+            ),
+            timeout,
+        )
+    except asyncio.TimeoutError:
+        exception = "Timed out after %s seconds" % timeout
+    except Exception as e:
+        exception = str(e)
+    return _offline(result, None, None, host, exception)
+
+
+@overload
 async def bedrock(
-    host: str, port: Optional[int] = 19132, tries: Optional[int] = 3
-) -> Union[BedrockStatus, BedrockOffline]:
+    host: str,
+    port: Optional[int] = 19132,
+    tries: Optional[int] = 3,
+    multiplexer: Optional[BedrockMultiplexer] = None,
+    policy: Optional[RetryPolicy] = None,
+    breaker: Optional[CircuitBreaker] = None,
+    result: Literal["model"] = "model",
+    rtt: Optional[RTTEstimator] = None,
+) -> Union[BedrockStatus, BedrockOffline]: ...
+
+
+@overload
+async def bedrock(
+    host: str,
+    port: Optional[int] = 19132,
+    tries: Optional[int] = 3,
+    multiplexer: Optional[BedrockMultiplexer] = None,
+    policy: Optional[RetryPolicy] = None,
+    breaker: Optional[CircuitBreaker] = None,
+    result: Literal["fast"] = ...,
+    rtt: Optional[RTTEstimator] = None,
+) -> Union[FastBedrockStatus, FastBedrockOffline]: ...
+
+
+@overload
+async def bedrock(
+    host: str,
+    port: Optional[int] = 19132,
+    tries: Optional[int] = 3,
+    multiplexer: Optional[BedrockMultiplexer] = None,
+    policy: Optional[RetryPolicy] = None,
+    breaker: Optional[CircuitBreaker] = None,
+    result: str = "model",
+    rtt: Optional[RTTEstimator] = None,
+) -> Union[BedrockStatus, FastBedrockStatus, BedrockOffline, FastBedrockOffline]: ...
+
+
+async def bedrock(
+    host: str,
+    port: Optional[int] = 19132,
+    tries: Optional[int] = 3,
+    multiplexer: Optional[BedrockMultiplexer] = None,
+    policy: Optional[RetryPolicy] = None,
+    breaker: Optional[CircuitBreaker] = None,
+    result: str = "model",
+    rtt: Optional[RTTEstimator] = None,
+) -> Union[BedrockStatus, FastBedrockStatus, BedrockOffline, FastBedrockOffline]:
     """Get status from Minecraft Bedrock server.
 
     Args:
@@ -76,22 +627,63 @@ async def bedrock(
             it is found. Defaults to None.
         tries (Optional[int], optional): The amount of tries to get
             data from server. Defaults to 3.
+        multiplexer (Optional[BedrockMultiplexer], optional): shared UDP
+            sockets to send the pings from. Defaults to None.
+        policy (Optional[RetryPolicy]): retry policy, replaces tries when
+            given. Defaults to a RetryPolicy with tries attempts.
+        breaker (Optional[CircuitBreaker]): returns cached offline results
+            for servers that keep failing. Defaults to None.
+        result (str): "model" for pydantic models or "fast" for unvalidated
+            FastBedrockStatus and FastBedrockOffline tuples.
+            Defaults to "model".
+        rtt (Optional[RTTEstimator]): derives the response deadline of each
+            server from its observed round trip times. Defaults to a 1
+            second timeout.
+
+    Raises:
+        ValueError: Unknown result.
 
     Returns:
-        Union[BedrockStatus, BedrockOffline]: Online or Offline status object.
+        Union[BedrockStatus, FastBedrockStatus, BedrockOffline,
+            FastBedrockOffline]: Online or Offline status object.
     """
+    if result not in ("model", "fast"):
+        raise ValueError("Unknown result '%s'" % result)
+    fast = result == "fast"
 
-    exception = ""
-    hostname, _, ip, _ = await get_raw(host, port)
-    for _ in range(tries):
-        try:
-            return await bedrock_status(hostname, port)
-        except Exception as e:
-            exception = str(e)
-    return BedrockOffline(
-        online=False,
-        ip=ip,
-        port=port,
-        hostname=hostname,
-        error=exception,
-    )
+    try:
+        hostname, port, ip, _ = await get_raw(host, port)
+    except Exception as e:
+        return _bedrock_offline(fast, host, port or 19132, host, str(e))
+    cached = _cached(breaker, (ip, port))
+    if cached is not None:
+        return cached  # type: ignore[no-any-return]
+    if policy is None:
+        policy = RetryPolicy(tries=tries or 1)
+    attempt = functools.partial(_bedrock_attempt, ip, port, multiplexer, fast, rtt)
+    try:
+        data = await policy.run(attempt)
+    except Exception as e:
+        offline = _bedrock_offline(fast, ip, port, hostname, str(e))
+        return _record(breaker, (ip, port), offline, failed=True)
+    return _record(breaker, (ip, port), data)
+
+
+async def _bedrock_attempt(
+    ip: str,
+    port: int,
+    multiplexer: Optional[BedrockMultiplexer],
+    fast: bool,
+    rtt: Optional[RTTEstimator],
+) -> Union[BedrockStatus, FastBedrockStatus]:
+    key = (ip, port, "bedrock")
+    timeout = 1 if rtt is None else rtt.timeout(key)
+    try:
+        data = await bedrock_status(ip, port, multiplexer, fast, timeout)
+    except asyncio.TimeoutError:
+        if rtt is not None:
+            rtt.backoff(key)
+        raise
+    if rtt is not None:
+        rtt.observe(key, data.latency / 1000)
+    return data
@@ -1,5 +1,9 @@
 from .bedrock import BedrockOffline, BedrockStatus
 from .java import Debug, Info, Status, OfflineStatus, Players, Plugins, Mods, Motd
+from .java import Timings
+from .delta import StatusDelta
+from .fast import FastBedrockOffline, FastBedrockStatus, FastDebug, FastMods
+from .fast import FastMotd, FastOfflineStatus, FastPlayers, FastStatus, FastTimings
 
 __all__ = [
     "BedrockOffline",
@@ -12,4 +16,15 @@ __all__ = [
     "Plugins",
     "Mods",
     "Motd",
+    "Timings",
+    "StatusDelta",
+    "FastBedrockOffline",
+    "FastBedrockStatus",
+    "FastDebug",
+    "FastMods",
+    "FastMotd",
+    "FastOfflineStatus",
+    "FastPlayers",
+    "FastStatus",
+    "FastTimings",
 ]
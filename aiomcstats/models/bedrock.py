@@ -13,9 +13,9 @@ class BedrockStatus(BaseModel):
         player_count (int): Current number of players on the server.
         player_max (int): Max number of servers on the server.
         server_id (int): Server id.
-        latency (int): Latency from api.
+        latency (float): Round trip of the ping in milliseconds.
         map (Optional[str]): Map. Defaults to None.
-        gamemode (Optional[int]): Current gamemode. Defaults to None.
+        gamemode (Optional[str]): Current gamemode. Defaults to None.
         gamemode_int (Optional[int]): Current gamemode id. Defaults to None.
         port_ipv4 (Optional[int]): Server port for ipv4. Defaults to None.
         port_ipv6 (Optional[int]): Server port for ipv6. Defaults to None.
@@ -28,9 +28,9 @@ class BedrockStatus(BaseModel):
     player_count: int
     player_max: int
     server_id: int
-    latency: int
+    latency: float
     map: Optional[str] = None
-    gamemode: Optional[int] = None
+    gamemode: Optional[str] = None
     gamemode_int: Optional[int] = None
     port_ipv4: Optional[int] = None
     port_ipv6: Optional[int] = None
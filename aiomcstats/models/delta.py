@@ -0,0 +1,21 @@
+from typing import Any, Dict, List
+from pydantic import BaseModel
+
+
+class StatusDelta(BaseModel):
+    """Delta model
+
+    Args:
+        host (str): Address as polled.
+        online (bool): Wether the server is online now.
+        changes (Dict[str, Any]): New value of every field which changed,
+            every field on the first poll of a host.
+        joined (List[str]): Names added to the player sample.
+        left (List[str]): Names gone from the player sample.
+    """
+
+    host: str
+    online: bool
+    changes: Dict[str, Any]
+    joined: List[str] = []
+    left: List[str] = []
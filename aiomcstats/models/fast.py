@@ -0,0 +1,153 @@
+"""Lightweight named tuple results mirroring the pydantic models.
+
+These are built without validation. ``to_model`` converts them to the
+matching pydantic model, validating the data at that point.
+"""
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from .bedrock import BedrockOffline, BedrockStatus
+from .java import OfflineStatus, Status
+
+
+def _as_dict(value: Any) -> Any:
+    if hasattr(value, "_asdict"):
+        return {key: _as_dict(item) for key, item in value._asdict().items()}
+    return value
+
+
+class FastDebug(NamedTuple):
+    """Debug result, see :class:`~aiomcstats.models.Debug`."""
+
+    ping: bool
+    query: bool
+    srv: bool
+
+
+class FastMotd(NamedTuple):
+    """Motd result, see :class:`~aiomcstats.models.Motd`."""
+
+    raw: List[str]
+    clean: List[str]
+    html: List[str]
+
+
+class FastPlayers(NamedTuple):
+    """Players result, see :class:`~aiomcstats.models.Players`.
+
+    Uuids are kept as strings.
+    """
+
+    online: int
+    max: int
+    list: Optional[List[str]] = None
+    uuid: Optional[Dict[str, str]] = None
+
+
+class FastMods(NamedTuple):
+    """Mods or plugins result, see :class:`~aiomcstats.models.Mods`."""
+
+    names: List[str]
+    raw: Dict[str, str]
+
+
+class FastTimings(NamedTuple):
+    """Timings result, see :class:`~aiomcstats.models.Timings`."""
+
+    connect: Optional[float] = None
+    first_byte: Optional[float] = None
+    transfer: Optional[float] = None
+    latency: Optional[float] = None
+
+
+class FastStatus(NamedTuple):
+    """Status result, see :class:`~aiomcstats.models.Status`."""
+
+    online: bool
+    ip: str
+    port: int
+    debug: FastDebug
+    motd: FastMotd
+    players: FastPlayers
+    version: str
+    map: str
+    protocol: Optional[int] = None
+    hostname: Optional[str] = None
+    icon: Optional[str] = None
+    icon_hash: Optional[str] = None
+    software: Optional[str] = None
+    plugins: Optional[FastMods] = None
+    mods: Optional[FastMods] = None
+    info: Optional[FastMotd] = None
+    latency: Optional[float] = None
+    timings: Optional[FastTimings] = None
+
+    def to_model(self) -> Status:
+        """Convert to the pydantic model.
+
+        Returns:
+            Status: Status object
+        """
+        return Status(**_as_dict(self))
+
+
+class FastOfflineStatus(NamedTuple):
+    """Offline status result, see :class:`~aiomcstats.models.OfflineStatus`."""
+
+    online: bool
+    ip: Optional[str]
+    port: Optional[int]
+    debug: FastDebug
+    hostname: Optional[str]
+    error: str
+
+    def to_model(self) -> OfflineStatus:
+        """Convert to the pydantic model.
+
+        Returns:
+            OfflineStatus: OfflineStatus object
+        """
+        return OfflineStatus(**_as_dict(self))
+
+
+class FastBedrockStatus(NamedTuple):
+    """Bedrock status result, see :class:`~aiomcstats.models.BedrockStatus`."""
+
+    edition: str
+    motd: str
+    protocol_version: int
+    protocol_name: str
+    player_count: int
+    player_max: int
+    server_id: int
+    latency: float
+    map: Optional[str] = None
+    gamemode: Optional[str] = None
+    gamemode_int: Optional[int] = None
+    port_ipv4: Optional[int] = None
+    port_ipv6: Optional[int] = None
+
+    def to_model(self) -> BedrockStatus:
+        """Convert to the pydantic model.
+
+        Returns:
+            BedrockStatus: BedrockStatus object
+        """
+        return BedrockStatus(**self._asdict())
+
+
+class FastBedrockOffline(NamedTuple):
+    """Offline bedrock result, see :class:`~aiomcstats.models.BedrockOffline`."""
+
+    online: bool
+    ip: str
+    port: int
+    hostname: str
+    error: str
+
+    def to_model(self) -> BedrockOffline:
+        """Convert to the pydantic model.
+
+        Returns:
+            BedrockOffline: BedrockOffline object
+        """
+        return BedrockOffline(**self._asdict())
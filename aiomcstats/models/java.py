@@ -34,6 +34,8 @@ class Info(BaseModel):
 class Motd(BaseModel):
     """Info model
 
+    Immutable, results built with an interner share one instance.
+
     Args:
         raw (List[str]): Raw motd with minecraft formatting.
         clean (List[str]): Cleaned motd without minecraft formatting.
@@ -44,6 +46,12 @@ class Motd(BaseModel):
     clean: List[str]
     html: List[str]
 
+    class Config:
+        # Interned values are shared between results instead of copied, so
+        # they are frozen. Their lists are shared too and must not be edited.
+        copy_on_model_validation = "none"
+        allow_mutation = False
+
 
 class Players(BaseModel):
     """Info model
@@ -64,6 +72,8 @@ class Players(BaseModel):
 class Mods(BaseModel):
     """Info model
 
+    Immutable, results built with an interner share one instance.
+
     Args:
         names (List[str]): Names of current minecraft mods.
         raw (Dict[str, str]): Raw mod information.
@@ -72,6 +82,12 @@ class Mods(BaseModel):
     names: List[str]
     raw: Dict[str, str]
 
+    class Config:
+        # Interned values are shared between results instead of copied, so
+        # they are frozen. Their lists are shared too and must not be edited.
+        copy_on_model_validation = "none"
+        allow_mutation = False
+
 
 class Plugins(BaseModel):
     """Info model
@@ -85,6 +101,25 @@ class Plugins(BaseModel):
     raw: Dict[str, str]
 
 
+class Timings(BaseModel):
+    """Timings model
+
+    Args:
+        connect (Optional[float]): Milliseconds taken to connect.
+        first_byte (Optional[float]): Milliseconds from sending the status
+            request to the first byte of the response.
+        transfer (Optional[float]): Milliseconds from the first to the last
+            byte of the status response.
+        latency (Optional[float]): Round trip of a ping packet in
+            milliseconds.
+    """
+
+    connect: Optional[float]
+    first_byte: Optional[float]
+    transfer: Optional[float]
+    latency: Optional[float]
+
+
 class Status(BaseModel):
     """Info model
 
@@ -100,10 +135,14 @@ class Status(BaseModel):
         protocol (Optional[int]): Protocol number.
         hostname (Optional[str]): Hostname of server.
         icon (Optional[str]): Favicon of server.
+        icon_hash (Optional[str]): Sha256 of the favicon, only set when
+            skip_favicon left the favicon out.
         software (Optional[str]): Software running server.
         plugins (Optional[Plugins]): Plugins installed.
         mods (Optional[Mods]): Mods installed.
         info (Optional[Info]): Info provided in players rather then players.
+        latency (Optional[float]): Ping round trip in milliseconds.
+        timings (Optional[Timings]): Breakdown of the request timings.
     """
 
     online: bool
@@ -117,10 +156,13 @@ class Status(BaseModel):
     protocol: Optional[int]
     hostname: Optional[str]
     icon: Optional[str]
+    icon_hash: Optional[str]
     software: Optional[str]
     plugins: Optional[Plugins]
     mods: Optional[Mods]
     info: Optional[Info]
+    latency: Optional[float]
+    timings: Optional[Timings]
 
 
 class OfflineStatus(BaseModel):
@@ -1,44 +1,372 @@
-import random
-import time
-import json
-from typing import Any, Dict
+import asyncio
+import functools
+import struct
+from time import perf_counter_ns
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Sequence, Tuple
 
+from aiomcstats import decoder
+from aiomcstats.connection import staggered_race
 from aiomcstats.connection import TCPConnection
 from aiomcstats.connection import Connection
 
 
+STATUS_REQUEST = b"\x01\x00"
+
+
+@functools.lru_cache(maxsize=65536)
+def status_frames(host: str, port: int, protocol: int = 47) -> bytes:
+    """Encoded handshake and status request frames for a server.
+
+    The frames never change for a given address so they are built once and
+    reused for every later ping.
+
+    Args:
+        host (str): hostname sent in the handshake.
+        port (int): port sent in the handshake.
+        protocol (int): protocol version sent in the handshake.
+            Defaults to 47.
+
+    Returns:
+        bytes: handshake frame followed by the status request frame.
+    """
+    packet = Connection()
+    packet.write_varint(0)
+    packet.write_varint(protocol)
+    packet.write_utf(host)
+    packet.write_ushort(port)
+    packet.write_varint(1)
+    frames = Connection()
+    frames.write_buffer(packet)
+    frames.write(STATUS_REQUEST)
+    return bytes(frames.flush())
+
+
+def ping_frame(payload: int) -> bytes:
+    """Encoded ping request frame.
+
+    Args:
+        payload (int): long the server echoes back.
+
+    Returns:
+        bytes: ping frame.
+    """
+    return b"\x09\x01" + struct.pack(">q", payload)
+
+
+def _parse_pong(response: Connection, payload: int) -> None:
+    if response.read_varint() != 1 or response.read_long() != payload:
+        raise IOError("Received invalid pong packet.")
+
+
+def _ms(start: int, end: int) -> float:
+    return (end - start) / 1e6
+
+
+def _parse_status(response: Connection, skip_favicon: bool = False) -> Dict[str, Any]:
+    if response.read_varint() != 0:
+        raise IOError("Received invalid status response packet.")
+    length = response.read_varint()
+    digest = None
+    try:
+        if skip_favicon:
+            # The packet is read once, so the favicon is cut out of its own
+            # buffer in place instead of out of a copy.
+            start = response.offset
+            response.read_view(length).release()
+            body = response.received
+            del body[start + length :]
+            del body[:start]
+            response.offset = 0
+            data, digest = decoder.strip_favicon(body)
+            raw: Dict[str, Any] = decoder.loads(data)
+        else:
+            with response.read_view(length) as view:
+                raw = decoder.loads(view)
+    except ValueError:
+        raise IOError("Received invalid JSON")
+    if digest is not None:
+        raw["favicon_hash"] = digest
+    return raw
+
+
 class Ping:
-    def __init__(self, host: str, port: int) -> None:
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        protocol: int = 47,
+        skip_favicon: bool = False,
+        addresses: Optional[Sequence[str]] = None,
+        delay: float = 0.25,
+    ) -> None:
         self.host = host
         self.port = port
+        self.protocol = protocol
+        self.skip_favicon = skip_favicon
+        self.addresses = addresses or [host]
+        self.delay = delay
+        self.address: Optional[str] = None
+        self._handshake = False
+        self.timings: Dict[str, Optional[float]] = {}
 
-    async def connect(self) -> None:
-        self.connection = TCPConnection()
-        await self.connection.connect(self.host, self.port)
+    async def _open(self, address: str) -> TCPConnection:
+        connection = TCPConnection()
+        await connection.connect(address, self.port)
+        return connection
+
+    async def connect(self, timeout: float = 3) -> None:
+        start = perf_counter_ns()
+        race = staggered_race(
+            self.addresses, self._open, self.delay, TCPConnection.close
+        )
+        self.address, self.connection = await asyncio.wait_for(race, timeout)
+        self.timings["connect"] = _ms(start, perf_counter_ns())
 
     async def handshake(self) -> None:
-        packet = Connection()
-        packet.write_varint(0)
-        packet.write_varint(47)
-        packet.write_utf(self.host)
-        packet.write_ushort(self.port)
-        packet.write_varint(1)
-        self.connection.write_buffer(packet)
+        # Sent together with the status request.
+        self._handshake = True
 
     async def status(self) -> Dict[str, Any]:
-        request = Connection()
-        request.write_varint(0)  # Request status
+        if self._handshake:
+            request = status_frames(self.host, self.port, self.protocol)
+            self._handshake = False
+        else:
+            request = STATUS_REQUEST
+
+        sent = perf_counter_ns()
+        self.connection.write(request)
 
-        sent = time.time()
-        self.connection.write_buffer(request)
+        length = await self.connection.read_varint()
+        first_byte = perf_counter_ns()
+        response = Connection()
+        response.received = await self.connection.read(length)
+        received = perf_counter_ns()
+        raw = _parse_status(response, self.skip_favicon)
+        self.timings["first_byte"] = _ms(sent, first_byte)
+        self.timings["transfer"] = _ms(first_byte, received)
+        raw["timings"] = self.timings
+        return raw
 
+    async def ping(self) -> float:
+        payload = perf_counter_ns()
+        self.connection.write(ping_frame(payload))
         response = await self.connection.read_buffer()
-        received = time.time()
-        if response.read_varint() != 0:
-            raise IOError("Received invalid status response packet.")
-        try:
-            raw: Dict[str, Any] = json.loads(response.read_utf())
-        except ValueError:
-            raise IOError("Received invalid JSON")
-        raw["latency"] = received - sent
+        latency = _ms(payload, perf_counter_ns())
+        _parse_pong(response, payload)
+        self.timings["latency"] = latency
+        return latency
+
+    def close(self) -> None:
+        connection = getattr(self, "connection", None)
+        if connection is not None and hasattr(connection, "writer"):
+            connection.close()
+
+
+class StatusProtocol(asyncio.Protocol):
+    """Protocol splitting the byte stream into length prefixed packets."""
+
+    def __init__(self) -> None:
+        self.transport: Optional[asyncio.Transport] = None
+        self.buffer = Connection()
+        self.packets: Deque[Tuple[int, Connection]] = deque()
+        self.error: Optional[Exception] = None
+        self.packet_first_byte: Optional[int] = None
+        self._first_byte: Optional[int] = None
+        self._waiter: Optional["asyncio.Future[None]"] = None
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        """Store the transport.
+
+        Args:
+            transport (asyncio.BaseTransport): the new transport.
+        """
+        self.transport = transport  # type: ignore[assignment]
+
+    def data_received(self, data: bytes) -> None:
+        """Queue every packet completed by the new data.
+
+        Args:
+            data (bytes): bytes received.
+        """
+        now = perf_counter_ns()
+        if self._first_byte is None:
+            self._first_byte = now
+        buffer = self.buffer
+        buffer.receive(data)
+        while buffer.remaining():
+            start = buffer.offset
+            available = buffer.remaining()
+            try:
+                length = buffer.read_varint()
+            except IOError as e:
+                buffer.offset = start
+                if available >= 5:
+                    self._fail(e)
+                break
+            if buffer.remaining() < length:
+                buffer.offset = start
+                break
+            packet = Connection()
+            packet.received = buffer.read(length)
+            self.packets.append((self._first_byte or now, packet))
+            self._first_byte = now if buffer.remaining() else None
+        self._wake()
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        """Wake readers waiting for a packet that will not arrive.
+
+        Args:
+            exc (Optional[Exception]): error which closed the connection.
+        """
+        self._fail(exc or IOError("Server did not respond with any information!"))
+
+    def _fail(self, exc: Exception) -> None:
+        if self.error is None:
+            self.error = exc
+        if self.transport is not None:
+            self.transport.close()
+        self._wake()
+
+    def _wake(self) -> None:
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+    async def read_packet(self) -> Connection:
+        """Wait for the next complete packet.
+
+        ``packet_first_byte`` is set to the time the first byte of the
+        packet arrived.
+
+        Raises:
+            IOError: the connection closed first.
+
+        Returns:
+            Connection: the packet body.
+        """
+        while not self.packets:
+            if self.error is not None:
+                raise IOError(str(self.error) or "Connection closed")
+            self._waiter = asyncio.get_running_loop().create_future()
+            await self._waiter
+        self.packet_first_byte, packet = self.packets.popleft()
+        return packet
+
+
+def _close(protocol: StatusProtocol) -> None:
+    if protocol.transport is not None:
+        protocol.transport.close()
+
+
+class ProtocolPing:
+    """Ping built on a bare asyncio.Protocol instead of stream objects.
+
+    The handshake and status request are sent in a single write and the
+    response is framed as it arrives. The interface matches Ping.
+
+    Args:
+        host (str): hostname of the server.
+        port (int): port of the server.
+        protocol (int): protocol version sent in the handshake.
+            Defaults to 47.
+        skip_favicon (bool): replace the favicon with its hash while
+            decoding. Defaults to False.
+        addresses (Optional[Sequence[str]]): resolved addresses of the
+            server raced by :func:`~aiomcstats.connection.staggered_race`.
+            Defaults to host.
+        delay (float): seconds between connection attempts.
+            Defaults to 0.25.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        protocol: int = 47,
+        skip_favicon: bool = False,
+        addresses: Optional[Sequence[str]] = None,
+        delay: float = 0.25,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.protocol = protocol
+        self.skip_favicon = skip_favicon
+        self.addresses = addresses or [host]
+        self.delay = delay
+        self.address: Optional[str] = None
+        self.connection: Optional[StatusProtocol] = None
+        self._handshake = False
+        self.timings: Dict[str, Optional[float]] = {}
+
+    async def _open(self, address: str) -> StatusProtocol:
+        loop = asyncio.get_running_loop()
+        _, protocol = await loop.create_connection(StatusProtocol, address, self.port)
+        return protocol
+
+    async def connect(self, timeout: float = 3) -> None:
+        """Open a connection to the first address that answers.
+
+        Args:
+            timeout (float): seconds to wait for the connection.
+                Defaults to 3.
+        """
+        start = perf_counter_ns()
+        race = staggered_race(self.addresses, self._open, self.delay, _close)
+        self.address, self.connection = await asyncio.wait_for(race, timeout)
+        self.timings["connect"] = _ms(start, perf_counter_ns())
+
+    async def handshake(self) -> None:
+        """Queue the handshake to go out with the status request."""
+        self._handshake = True
+
+    async def status(self) -> Dict[str, Any]:
+        """Request the server status.
+
+        Raises:
+            IOError: the connection is not open.
+
+        Returns:
+            Dict[str, Any]: decoded status json with latency.
+        """
+        if self.connection is None or self.connection.transport is None:
+            raise IOError("Not connected")
+        if self._handshake:
+            request = status_frames(self.host, self.port, self.protocol)
+            self._handshake = False
+        else:
+            request = STATUS_REQUEST
+        sent = perf_counter_ns()
+        self.connection.transport.write(request)
+
+        response = await self.connection.read_packet()
+        received = perf_counter_ns()
+        first_byte = self.connection.packet_first_byte or received
+        raw = _parse_status(response, self.skip_favicon)
+        self.timings["first_byte"] = _ms(sent, first_byte)
+        self.timings["transfer"] = _ms(first_byte, received)
+        raw["timings"] = self.timings
         return raw
+
+    async def ping(self) -> float:
+        """Measure the round trip of a ping packet.
+
+        Raises:
+            IOError: the connection is not open.
+
+        Returns:
+            float: round trip time in milliseconds.
+        """
+        if self.connection is None or self.connection.transport is None:
+            raise IOError("Not connected")
+        payload = perf_counter_ns()
+        self.connection.transport.write(ping_frame(payload))
+        response = await self.connection.read_packet()
+        latency = _ms(payload, perf_counter_ns())
+        _parse_pong(response, payload)
+        self.timings["latency"] = latency
+        return latency
+
+    def close(self) -> None:
+        """Close the connection."""
+        if self.connection is not None and self.connection.transport is not None:
+            self.connection.transport.close()
@@ -0,0 +1,233 @@
+"""Scheduled polling of many servers."""
+import asyncio
+import heapq
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+from typing import Union
+
+from aiomcstats.delta import field_values
+from aiomcstats.main import bedrock, status
+from aiomcstats.models import FastBedrockOffline, FastDebug, FastOfflineStatus
+
+Callback = Callable[[str, Any], Union[None, Awaitable[None]]]
+
+
+def _fingerprint(edition: str, result: Any) -> int:
+    if edition == "java":
+        return hash(field_values(result))
+    return hash(
+        (
+            getattr(result, "error", None),
+            getattr(result, "motd", None),
+            getattr(result, "player_count", None),
+            getattr(result, "protocol_version", None),
+        )
+    )
+
+
+def _failed(edition: str, options: Dict[str, Any], host: str, error: str) -> Any:
+    port = options.get("port")
+    result: Union[FastOfflineStatus, FastBedrockOffline]
+    if edition == "java":
+        debug = FastDebug(ping=False, query=False, srv=False)
+        result = FastOfflineStatus(False, None, port, debug, host, error)
+    else:
+        result = FastBedrockOffline(False, host, port or 19132, host, error)
+    return result if options.get("result") == "fast" else result.to_model()
+
+
+class _Entry:
+    __slots__ = ("interval", "current", "edition", "options", "fingerprint")
+
+    def __init__(self, interval: float, edition: str, options: Dict[str, Any]) -> None:
+        self.interval = interval
+        self.current = interval
+        self.edition = edition
+        self.options = options
+        self.fingerprint: Optional[int] = None
+
+
+class Poller:
+    """Polls registered servers forever, each on its own interval.
+
+    Hosts are kept in a heap ordered by when they are next due. The first
+    probe of a host is placed at a random point of its interval and every
+    later one is jittered, so hosts added together do not stay in step.
+    While a host keeps returning the same result its interval is stretched
+    by ``backoff`` up to ``max_backoff`` times the configured interval and
+    it snaps back on the first change.
+
+    Results are passed to ``callback``, which may be a coroutine function,
+    or put on :attr:`results` when there is no callback. A probe that raises
+    is reported as an offline result of the result type in its options.
+
+    Args:
+        callback (Optional[Callback]): called with the host and result.
+            Defaults to None.
+        concurrency (int): Maximum number of probes in flight.
+            Defaults to 100.
+        rate (Optional[float]): Maximum number of probes started per second,
+            None for no limit. Defaults to None.
+        jitter (float): Fraction of the interval each delay is randomly
+            varied by. Defaults to 0.1.
+        backoff (float): Factor the interval of an unchanged host grows by.
+            Defaults to 1.5.
+        max_backoff (float): Limit of the interval of an unchanged host as a
+            multiple of its configured interval, 1 to disable.
+            Defaults to 4.
+        queue_size (int): Size of :attr:`results`, probes wait while it is
+            full. Defaults to 1000.
+    """
+
+    def __init__(
+        self,
+        callback: Optional[Callback] = None,
+        concurrency: int = 100,
+        rate: Optional[float] = None,
+        jitter: float = 0.1,
+        backoff: float = 1.5,
+        max_backoff: float = 4,
+        queue_size: int = 1000,
+    ) -> None:
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self.callback = callback
+        self.concurrency = concurrency
+        self.rate = rate
+        self.jitter = jitter
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.queue_size = queue_size
+        # Created on first use, inside the running loop on python < 3.10.
+        self._results: "Optional[asyncio.Queue[Tuple[str, Any]]]" = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._hosts: Dict[str, _Entry] = {}
+        self._heap: List[Tuple[float, int, str, _Entry]] = []
+        self._counter = 0
+        self.probes = 0
+
+    def __len__(self) -> int:
+        return len(self._hosts)
+
+    @property
+    def results(self) -> "asyncio.Queue[Tuple[str, Any]]":
+        """Results of the probes when there is no callback.
+
+        Returns:
+            asyncio.Queue[Tuple[str, Any]]: host and result of each probe.
+        """
+        if self._results is None:
+            self._results = asyncio.Queue(self.queue_size)
+        return self._results
+
+    def add(
+        self, host: str, interval: float = 60, edition: str = "java", **options: Any
+    ) -> None:
+        """Register a host, replacing its schedule if already registered.
+
+        Args:
+            host (str): minecraft server address.
+            interval (float): Seconds between probes. Defaults to 60.
+            edition (str): "java" or "bedrock". Defaults to "java".
+            **options (Any): passed on to :func:`~aiomcstats.status` or
+                :func:`~aiomcstats.bedrock`.
+
+        Raises:
+            ValueError: Unknown edition or interval not positive.
+        """
+        if edition not in ("java", "bedrock"):
+            raise ValueError("Unknown edition '%s'" % edition)
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        entry = _Entry(interval, edition, options)
+        self._hosts[host] = entry
+        # A random phase spreads hosts added at once over their interval.
+        delay = interval * random.random()  # noqa: S311
+        self._push(time.monotonic() + delay, host, entry)
+
+    def remove(self, host: str) -> None:
+        """Stop polling a host.
+
+        Args:
+            host (str): address given to :meth:`add`.
+        """
+        self._hosts.pop(host, None)
+
+    def _push(self, due: float, host: str, entry: _Entry) -> None:
+        self._counter += 1
+        heapq.heappush(self._heap, (due, self._counter, host, entry))
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _wait(self, wakeup: asyncio.Event, timeout: Optional[float]) -> None:
+        wakeup.clear()
+        try:
+            await asyncio.wait_for(wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def run(self) -> None:
+        """Poll until cancelled."""
+        wakeup = self._wakeup = asyncio.Event()
+        slots = asyncio.Semaphore(self.concurrency)
+        tasks: Set["asyncio.Task[None]"] = set()
+        next_start = time.monotonic()
+        try:
+            while True:
+                if not self._heap:
+                    await self._wait(wakeup, None)
+                    continue
+                due, _, host, entry = self._heap[0]
+                if self._hosts.get(host) is not entry:
+                    # Removed or re-added since it was scheduled.
+                    heapq.heappop(self._heap)
+                    continue
+                now = time.monotonic()
+                start = max(due, next_start)
+                if start > now:
+                    await self._wait(wakeup, start - now)
+                    continue
+                heapq.heappop(self._heap)
+                if self.rate:
+                    next_start = max(now, next_start) + 1 / self.rate
+                await slots.acquire()
+                task = asyncio.ensure_future(self._probe(host, entry, now))
+                task.add_done_callback(lambda _: slots.release())
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _status(self, host: str, entry: _Entry) -> Any:
+        try:
+            if entry.edition == "java":
+                return await status(host, **entry.options)
+            return await bedrock(host, **entry.options)
+        except Exception as e:
+            return _failed(entry.edition, entry.options, host, str(e))
+
+    async def _probe(self, host: str, entry: _Entry, started: float) -> None:
+        self.probes += 1
+        try:
+            result = await self._status(host, entry)
+            fingerprint = _fingerprint(entry.edition, result)
+            if fingerprint == entry.fingerprint:
+                entry.current = min(
+                    entry.current * self.backoff, entry.interval * self.max_backoff
+                )
+            else:
+                entry.current = entry.interval
+            entry.fingerprint = fingerprint
+        finally:
+            if self._hosts.get(host) is entry:
+                spread = 1 + self.jitter * (2 * random.random() - 1)  # noqa: S311
+                self._push(started + entry.current * spread, host, entry)
+        if self.callback is None:
+            await self.results.put((host, result))
+            return
+        returned = self.callback(host, result)
+        if returned is not None:
+            await returned
@@ -0,0 +1,215 @@
+"""Full stat requests of the GameSpy 4 query protocol."""
+import asyncio
+import ipaddress
+import itertools
+import struct
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from .udp import DatagramMultiplexer
+
+MAGIC = b"\xfe\xfd"
+HANDSHAKE = 0x09
+STAT = 0x00
+PLAYERS = b"\x00\x00\x01player_\x00\x00"
+
+
+def parse_full_stat(data: bytes) -> Dict[str, Any]:
+    """Parse a full stat response.
+
+    Args:
+        data (bytes): response datagram.
+
+    Returns:
+        Dict[str, Any]: key value section by key, with the names of every
+            online player under "players".
+    """
+    # Type and session id, then the constant "splitnum\x00\x80\x00" padding.
+    body = data[16:]
+    values, _, players = body.partition(PLAYERS)
+    fields = values.decode("utf8", "replace").split("\x00")
+    stat: Dict[str, Any] = dict(zip(fields[::2], fields[1::2]))
+    stat["players"] = [
+        name for name in players.decode("utf8", "replace").split("\x00") if name
+    ]
+    return stat
+
+
+def parse_plugins(
+    plugins: str,
+) -> Tuple[Optional[str], Optional[Tuple[List[str], Dict[str, str]]]]:
+    """Split the plugins value of a full stat.
+
+    Servers send ``"<software>: <name> <version>; <name> <version>"``,
+    only the software when no plugin list is exposed and nothing on
+    vanilla.
+
+    Args:
+        plugins (str): plugins value.
+
+    Returns:
+        Tuple[Optional[str], Optional[Tuple[List[str], Dict[str, str]]]]:
+            software, and plugin names and versions by name when listed.
+    """
+    software, listed, names = plugins.partition(": ")
+    if not listed:
+        return software or None, None
+    raw: Dict[str, str] = {}
+    for plugin in filter(None, names.split("; ")):
+        name, _, version = plugin.rpartition(" ")
+        if not name:
+            name, version = version, ""
+        raw[name] = version
+    return software or None, (list(raw), raw)
+
+
+class QueryMultiplexer(DatagramMultiplexer):
+    """Send full stat queries to many java servers from shared sockets.
+
+    A full stat takes a handshake for a challenge token and then the stat
+    request carrying it. Servers accept a token for about thirty seconds,
+    so tokens are kept per server for ``token_ttl`` seconds and repeat
+    queries within that window take a single round trip. A query sent with
+    a token the server already rotated goes unanswered, the token is then
+    dropped and the query repeated after a fresh handshake.
+
+    Query is disabled on most servers, so a server that did not answer is
+    not asked again for ``failure_ttl`` seconds instead of costing a full
+    timeout on every poll.
+
+    Args:
+        sockets (int): Number of sockets per address family. Defaults to 1.
+        token_ttl (float): Seconds a challenge token is reused.
+            Defaults to 25.
+        maxsize (int): Maximum number of tokens and failures kept.
+            Defaults to 65536.
+        failure_ttl (float): Seconds a server that did not answer is
+            skipped. Defaults to 300.
+    """
+
+    def __init__(
+        self,
+        sockets: int = 1,
+        token_ttl: float = 25,
+        maxsize: int = 65536,
+        failure_ttl: float = 300,
+    ) -> None:
+        super().__init__(sockets)
+        self.token_ttl = token_ttl
+        self.maxsize = maxsize
+        self.failure_ttl = failure_ttl
+        self._tokens: "OrderedDict[Tuple[str, int], Tuple[bytes, float]]"
+        self._tokens = OrderedDict()
+        self._failures: "OrderedDict[Tuple[str, int], float]" = OrderedDict()
+        self._sessions = itertools.count()
+        self.handshakes = 0
+
+    def response_key(self, data: bytes, addr: Tuple[Any, ...]) -> Optional[Hashable]:
+        """Key of the request a response answers.
+
+        Args:
+            data (bytes): datagram received.
+            addr (Tuple[Any, ...]): address it came from.
+
+        Returns:
+            Optional[Hashable]: source address, packet type and session id.
+        """
+        if len(data) < 5 or data[0] not in (HANDSHAKE, STAT):
+            return None
+        return (addr[0], addr[1], data[0], data[1:5])
+
+    def _session(self) -> bytes:
+        # Servers drop the high nibble of every byte of the session id.
+        session = next(self._sessions)
+        return bytes((session >> shift) & 0x0F for shift in (12, 8, 4, 0))
+
+    async def _request(
+        self, host: str, port: int, kind: int, payload: bytes, timeout: float
+    ) -> bytes:
+        session = self._session()
+        return await self.request(
+            host,
+            port,
+            MAGIC + bytes((kind,)) + session + payload,
+            (host, port, kind, session),
+            timeout,
+        )
+
+    def _remember(self, cache: "OrderedDict[Any, Any]", key: Any, value: Any) -> None:
+        cache[key] = value
+        cache.move_to_end(key)
+        if len(cache) > self.maxsize:
+            cache.popitem(last=False)
+
+    def _cached(self, key: Tuple[str, int]) -> Optional[bytes]:
+        cached = self._tokens.get(key)
+        if cached is None or cached[1] <= time.monotonic():
+            return None
+        return cached[0]
+
+    async def _stat(self, host: str, port: int, token: bytes, timeout: float) -> bytes:
+        return await self._request(host, port, STAT, token + b"\x00" * 4, timeout)
+
+    async def token(self, host: str, port: int, timeout: float = 1) -> bytes:
+        """Get a challenge token, from the cache while it is valid.
+
+        Args:
+            host (str): ip address of the server
+            port (int): query port
+            timeout (float): seconds to wait for a response. Defaults to 1.
+
+        Returns:
+            bytes: token packed as sent in stat requests.
+        """
+        key = (host, port)
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
+        data = await self._request(host, port, HANDSHAKE, b"", timeout)
+        self.handshakes += 1
+        token = struct.pack(">I", int(data[5:].rstrip(b"\x00")) & 0xFFFFFFFF)
+        self._remember(self._tokens, key, (token, time.monotonic() + self.token_ttl))
+        return token
+
+    async def full_stat(
+        self, host: str, port: int, timeout: float = 1
+    ) -> Dict[str, Any]:
+        """Get the full stat of a server.
+
+        Args:
+            host (str): ip address of the server
+            port (int): query port
+            timeout (float): seconds to wait for each response.
+                Defaults to 1.
+
+        Raises:
+            IOError: the server did not answer within the last
+                ``failure_ttl`` seconds.
+            asyncio.TimeoutError: the server did not answer.
+
+        Returns:
+            Dict[str, Any]: see :func:`parse_full_stat`.
+        """
+        key = (str(ipaddress.ip_address(host)), port)
+        failed = self._failures.get(key)
+        if failed is not None:
+            if failed > time.monotonic():
+                raise IOError("Query did not answer recently.")
+            del self._failures[key]
+        try:
+            return await self._full_stat(*key, timeout)
+        except asyncio.TimeoutError:
+            self._remember(self._failures, key, time.monotonic() + self.failure_ttl)
+            raise
+
+    async def _full_stat(self, host: str, port: int, timeout: float) -> Dict[str, Any]:
+        token = self._cached((host, port))
+        if token is not None:
+            try:
+                return parse_full_stat(await self._stat(host, port, token, timeout))
+            except asyncio.TimeoutError:
+                # The server may have rotated its token early.
+                self._tokens.pop((host, port), None)
+        token = await self.token(host, port, timeout)
+        return parse_full_stat(await self._stat(host, port, token, timeout))
@@ -0,0 +1,183 @@
+"""Caching DNS resolver shared between queries."""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple, Union
+
+import dns.asyncresolver
+import dns.name
+import dns.rdatatype
+import dns.resolver
+
+
+_Key = Tuple[str, int, bool]
+
+
+class ResolverCache:
+    """LRU cache in front of an async dnspython resolver.
+
+    Answers are kept for the TTL of their record set. Lookups which fail
+    with NXDOMAIN or an empty answer are cached separately for
+    ``negative_ttl`` seconds so a missing SRV record is not asked for on
+    every query. Concurrent lookups of the same name share one request.
+
+    Args:
+        maxsize (int): Maximum number of answers kept. Defaults to 4096.
+        negative_maxsize (int): Maximum number of negative answers kept.
+            Defaults to 4096.
+        negative_ttl (float): Seconds a negative answer is kept.
+            Defaults to 60.
+        min_ttl (float): Lower bound applied to record TTLs. Defaults to 0.
+        max_ttl (float): Upper bound applied to record TTLs.
+            Defaults to 86400.
+        resolver (Optional[dns.asyncresolver.Resolver]): Resolver used on a
+            miss. Defaults to the dnspython default resolver.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 4096,
+        negative_maxsize: int = 4096,
+        negative_ttl: float = 60,
+        min_ttl: float = 0,
+        max_ttl: float = 86400,
+        resolver: Optional[dns.asyncresolver.Resolver] = None,
+    ) -> None:
+        self.maxsize = maxsize
+        self.negative_maxsize = negative_maxsize
+        self.negative_ttl = negative_ttl
+        self.min_ttl = min_ttl
+        self.max_ttl = max_ttl
+        self._resolver = resolver
+        self._answers: "OrderedDict[_Key, Tuple[float, dns.resolver.Answer]]"
+        self._answers = OrderedDict()
+        self._negative: "OrderedDict[_Key, Tuple[float, Exception]]"
+        self._negative = OrderedDict()
+        self._inflight: Dict[_Key, "asyncio.Future[dns.resolver.Answer]"] = {}
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    @property
+    def resolver(self) -> dns.asyncresolver.Resolver:
+        """Resolver used on a cache miss.
+
+        Returns:
+            dns.asyncresolver.Resolver: the resolver.
+        """
+        if self._resolver is None:
+            self._resolver = dns.asyncresolver.get_default_resolver()
+        return self._resolver
+
+    async def resolve(
+        self,
+        qname: Union[str, dns.name.Name],
+        rdtype: Union[str, dns.rdatatype.RdataType] = "A",
+        search: bool = False,
+    ) -> dns.resolver.Answer:
+        """Resolve a name, answering from the cache when possible.
+
+        Args:
+            qname (Union[str, dns.name.Name]): name to look up.
+            rdtype (Union[str, dns.rdatatype.RdataType]): record type.
+                Defaults to "A".
+            search (bool): Wether to use the resolver search list.
+                Defaults to False.
+
+        Raises:
+            Exception: the cached or new resolution error.
+
+        Returns:
+            dns.resolver.Answer: answer for the query.
+        """
+        key = (str(qname).lower(), int(dns.rdatatype.RdataType.make(rdtype)), search)
+        now = time.monotonic()
+        entry = self._answers.get(key)
+        if entry is not None:
+            if entry[0] > now:
+                self._answers.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            del self._answers[key]
+        negative = self._negative.get(key)
+        if negative is not None:
+            if negative[0] > now:
+                self._negative.move_to_end(key)
+                self.negative_hits += 1
+                raise negative[1].with_traceback(None)
+            del self._negative[key]
+        task = self._inflight.get(key)
+        if task is None:
+            self.misses += 1
+            task = asyncio.ensure_future(self._lookup(key, qname, rdtype, search))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._done(key, t))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    async def _lookup(
+        self,
+        key: _Key,
+        qname: Union[str, dns.name.Name],
+        rdtype: Union[str, dns.rdatatype.RdataType],
+        search: bool,
+    ) -> dns.resolver.Answer:
+        try:
+            answer = await self.resolver.resolve(qname, rdtype, search=search)
+        except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer) as e:
+            self._store(
+                self._negative, key, self.negative_ttl, e, self.negative_maxsize
+            )
+            raise
+        ttl: float = answer.rrset.ttl if answer.rrset is not None else 0
+        ttl = min(max(ttl, self.min_ttl), self.max_ttl)
+        self._store(self._answers, key, ttl, answer, self.maxsize)
+        return answer
+
+    def _done(self, key: _Key, task: "asyncio.Future[dns.resolver.Answer]") -> None:
+        self._inflight.pop(key, None)
+        # Retrieve the error so it is not logged when every waiter went away.
+        if not task.cancelled():
+            task.exception()
+
+    def _store(
+        self,
+        cache: "OrderedDict[_Key, Tuple[float, Any]]",
+        key: _Key,
+        ttl: float,
+        value: Any,
+        maxsize: int,
+    ) -> None:
+        if ttl <= 0 or maxsize <= 0:
+            return
+        cache[key] = (time.monotonic() + ttl, value)
+        cache.move_to_end(key)
+        while len(cache) > maxsize:
+            cache.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        """Counters for monitoring.
+
+        Returns:
+            Dict[str, int]: hits, negative hits, misses, coalesced
+                lookups and cache sizes.
+        """
+        return {
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "size": len(self._answers),
+            "negative_size": len(self._negative),
+        }
+
+    def clear(self) -> None:
+        """Drop every cached answer and reset the counters."""
+        self._answers.clear()
+        self._negative.clear()
+        self.hits = self.negative_hits = self.misses = self.coalesced = 0
+
+
+default_cache = ResolverCache()
@@ -0,0 +1,122 @@
+"""Retry policy shared by the Java and Bedrock queries."""
+import asyncio
+import random
+from typing import Awaitable, Callable, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class RetryPolicy:
+    """How often and how quickly a failed query is retried.
+
+    The delay before retry ``n`` is ``backoff * multiplier ** (n - 1)``
+    capped at ``max_backoff``, reduced by a random fraction of up to
+    ``jitter`` so that many failing queries do not retry in lockstep. Every
+    attempt, covering connect, write and read, is cancelled after
+    ``attempt_timeout`` seconds and no attempt runs past ``deadline`` seconds
+    from the first one.
+
+    Args:
+        tries (int): Maximum number of attempts. Defaults to 3.
+        backoff (float): Seconds before the first retry. Defaults to 0.1.
+        multiplier (float): Growth of the delay per retry. Defaults to 2.
+        max_backoff (float): Longest delay between attempts. Defaults to 2.
+        jitter (float): Largest fraction of a delay removed at random,
+            between 0 and 1. Defaults to 0.5.
+        attempt_timeout (Optional[float]): Seconds allowed for a single
+            attempt, None for no limit. Defaults to 5.
+        deadline (Optional[float]): Seconds allowed for all attempts
+            together, None for no limit. Defaults to None.
+
+    Raises:
+        ValueError: tries is less than one or jitter is out of range.
+    """
+
+    def __init__(
+        self,
+        tries: int = 3,
+        backoff: float = 0.1,
+        multiplier: float = 2,
+        max_backoff: float = 2,
+        jitter: float = 0.5,
+        attempt_timeout: Optional[float] = 5,
+        deadline: Optional[float] = None,
+    ) -> None:
+        if tries < 1:
+            raise ValueError("tries must be at least 1")
+        if not 0 <= jitter <= 1:
+            raise ValueError("jitter must be between 0 and 1")
+        self.tries = tries
+        self.backoff = backoff
+        self.multiplier = multiplier
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.attempt_timeout = attempt_timeout
+        self.deadline = deadline
+
+    def delays(self) -> Iterator[float]:
+        """Delays before each retry.
+
+        Yields:
+            float: seconds to wait before the next attempt.
+        """
+        for retry in range(self.tries - 1):
+            delay = min(self.max_backoff, self.backoff * self.multiplier ** retry)
+            yield delay * (1 - self.jitter * random.random())  # noqa: S311
+
+    async def run(self, attempt: Callable[[], Awaitable[T]]) -> T:
+        """Call attempt until it succeeds or the policy gives up.
+
+        Args:
+            attempt (Callable[[], Awaitable[T]]): coroutine function making
+                one attempt.
+
+        Raises:
+            Exception: error of the last attempt.
+            asyncio.TimeoutError: the deadline passed first.
+
+        Returns:
+            T: result of the first successful attempt.
+        """
+        loop = asyncio.get_running_loop()
+        end = None if self.deadline is None else loop.time() + self.deadline
+        delays = self.delays()
+        while True:
+            timeout = self.attempt_timeout
+            if end is not None:
+                remaining = end - loop.time()
+                if remaining <= 0:
+                    raise asyncio.TimeoutError(
+                        "Deadline of %s seconds passed" % self.deadline
+                    )
+                timeout = remaining if timeout is None else min(timeout, remaining)
+            try:
+                return await _limit(attempt, timeout)
+            except asyncio.TimeoutError as e:
+                # Timeouts inside the attempt keep their own message.
+                error: Exception = e if str(e) else asyncio.TimeoutError("Timed out")
+            except Exception as e:
+                error = e
+            delay = next(delays, None)
+            if delay is None:
+                raise error
+            if end is not None and loop.time() + delay >= end:
+                raise error
+            await asyncio.sleep(delay)
+
+
+async def _limit(attempt: Callable[[], Awaitable[T]], timeout: Optional[float]) -> T:
+    # Unlike wait_for, a timeout raised by the attempt itself is told apart
+    # from the attempt running out of time.
+    task = asyncio.ensure_future(attempt())
+    try:
+        done, _ = await asyncio.wait((task,), timeout=timeout)
+    finally:
+        if not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+    if not done:
+        raise asyncio.TimeoutError(
+            "Attempt timed out after %s seconds" % round(timeout or 0, 3)
+        )
+    return task.result()
@@ -0,0 +1,108 @@
+"""Per server timeouts derived from observed round trip times."""
+from collections import OrderedDict
+from typing import Dict, Hashable, List
+
+
+class RTTEstimator:
+    """Smoothed round trip time and variance per server, as in RFC 6298.
+
+    Each sample updates ``srtt`` and ``rttvar`` and the timeout is
+    ``srtt + k * rttvar``, raised to at least ``min_timeout``. A timeout
+    doubles the next timeout for that key, up to ``max_timeout``, until a
+    sample is observed again, so a slow but healthy server is given room
+    while a dead one is dropped after a short deadline. Unknown keys get
+    ``initial_timeout``.
+
+    Args:
+        initial_timeout (float): Seconds allowed before any sample.
+            Defaults to 3.
+        min_timeout (float): Shortest timeout in seconds. Defaults to 0.2.
+        max_timeout (float): Longest timeout in seconds. Defaults to 10.
+        alpha (float): Gain of the smoothed round trip time.
+            Defaults to 1/8.
+        beta (float): Gain of the round trip time variance.
+            Defaults to 1/4.
+        k (float): Variances added to the smoothed round trip time.
+            Defaults to 4.
+        maxsize (int): Maximum number of keys kept. Defaults to 65536.
+    """
+
+    def __init__(
+        self,
+        initial_timeout: float = 3,
+        min_timeout: float = 0.2,
+        max_timeout: float = 10,
+        alpha: float = 1 / 8,
+        beta: float = 1 / 4,
+        k: float = 4,
+        maxsize: int = 65536,
+    ) -> None:
+        self.initial_timeout = initial_timeout
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.alpha = alpha
+        self.beta = beta
+        self.k = k
+        self.maxsize = maxsize
+        # key -> [srtt, rttvar, backoff]
+        self._estimates: "OrderedDict[Hashable, List[float]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._estimates)
+
+    def observe(self, key: Hashable, rtt: float) -> None:
+        """Add a round trip time sample.
+
+        Args:
+            key (Hashable): server key, for example ``(host, port, phase)``.
+            rtt (float): round trip time in seconds.
+        """
+        estimate = self._estimates.get(key)
+        if estimate is None:
+            self._estimates[key] = [rtt, rtt / 2, 1]
+            if len(self._estimates) > self.maxsize:
+                self._estimates.popitem(last=False)
+            return
+        self._estimates.move_to_end(key)
+        srtt, rttvar, _ = estimate
+        estimate[1] = (1 - self.beta) * rttvar + self.beta * abs(srtt - rtt)
+        estimate[0] = (1 - self.alpha) * srtt + self.alpha * rtt
+        estimate[2] = 1
+
+    def timeout(self, key: Hashable) -> float:
+        """Deadline for the next request.
+
+        Args:
+            key (Hashable): server key.
+
+        Returns:
+            float: timeout in seconds.
+        """
+        estimate = self._estimates.get(key)
+        if estimate is None:
+            return self.initial_timeout
+        srtt, rttvar, backoff = estimate
+        timeout = max(srtt + self.k * rttvar, self.min_timeout) * backoff
+        return min(timeout, self.max_timeout)
+
+    def backoff(self, key: Hashable) -> None:
+        """Record a timeout, doubling the next timeout of the key.
+
+        Args:
+            key (Hashable): server key.
+        """
+        estimate = self._estimates.get(key)
+        if estimate is not None and self.timeout(key) < self.max_timeout:
+            estimate[2] *= 2
+
+    def stats(self) -> Dict[Hashable, Dict[str, float]]:
+        """Current estimates.
+
+        Returns:
+            Dict[Hashable, Dict[str, float]]: srtt, rttvar and timeout in
+                seconds by key.
+        """
+        return {
+            key: {"srtt": srtt, "rttvar": rttvar, "timeout": self.timeout(key)}
+            for key, (srtt, rttvar, _) in self._estimates.items()
+        }
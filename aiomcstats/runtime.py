@@ -0,0 +1,106 @@
+"""Event loop selection.
+
+uvloop is used when it is installed and asked for, nothing changes
+otherwise. Every transport only uses the running loop, so they behave the
+same on either.
+"""
+import asyncio
+from typing import Any, Callable, Coroutine, Dict, List, TypeVar
+
+T = TypeVar("T")
+
+LOOPS: Dict[str, Callable[[], asyncio.AbstractEventLoop]] = {
+    "asyncio": asyncio.new_event_loop,
+}
+
+try:
+    import uvloop
+except ImportError:  # pragma: no cover
+    pass
+else:
+    LOOPS["uvloop"] = uvloop.new_event_loop
+
+
+def available_loops() -> List[str]:
+    """Names of the event loops which can be used.
+
+    Returns:
+        List[str]: "asyncio", and "uvloop" when installed.
+    """
+    return list(LOOPS)
+
+
+def loop_name(name: str = "auto") -> str:
+    """Resolve the name of an event loop.
+
+    Args:
+        name (str): "asyncio", "uvloop" or "auto" for uvloop when it is
+            installed. Defaults to "auto".
+
+    Raises:
+        ValueError: the loop is not available.
+
+    Returns:
+        str: "asyncio" or "uvloop".
+    """
+    if name == "auto":
+        return "uvloop" if "uvloop" in LOOPS else "asyncio"
+    if name not in LOOPS:
+        raise ValueError("Event loop '%s' is not available" % name)
+    return name
+
+
+def new_event_loop(name: str = "auto") -> asyncio.AbstractEventLoop:
+    """Create an event loop.
+
+    Args:
+        name (str): "asyncio", "uvloop" or "auto" for uvloop when it is
+            installed. Defaults to "auto".
+
+    Returns:
+        asyncio.AbstractEventLoop: the new loop.
+    """
+    return LOOPS[loop_name(name)]()
+
+
+def install(name: str = "auto") -> str:
+    """Set the event loop policy used for new loops of the process.
+
+    Args:
+        name (str): "asyncio", "uvloop" or "auto" for uvloop when it is
+            installed. Defaults to "auto".
+
+    Returns:
+        str: name of the loop installed.
+    """
+    name = loop_name(name)
+    if name == "uvloop":
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    else:
+        asyncio.set_event_loop_policy(None)
+    return name
+
+
+def run(main: Coroutine[Any, Any, T], loop: str = "auto") -> T:
+    """Run a coroutine on a new event loop, like :func:`asyncio.run`.
+
+    The loop policy of the process is left unchanged.
+
+    Args:
+        main (Coroutine[Any, Any, T]): coroutine to run.
+        loop (str): "asyncio", "uvloop" or "auto" for uvloop when it is
+            installed. Defaults to "auto".
+
+    Returns:
+        T: result of the coroutine.
+    """
+    event_loop = new_event_loop(loop)
+    try:
+        asyncio.set_event_loop(event_loop)
+        return event_loop.run_until_complete(main)
+    finally:
+        try:
+            event_loop.run_until_complete(event_loop.shutdown_asyncgens())
+        finally:
+            asyncio.set_event_loop(None)
+            event_loop.close()
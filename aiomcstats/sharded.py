@@ -0,0 +1,155 @@
+"""Polling spread over several processes."""
+import asyncio
+import functools
+import multiprocessing
+import os
+import queue
+from typing import Any, AsyncIterator, Iterable, List, Optional, Tuple, Union
+
+from aiomcstats import runtime
+from aiomcstats.main import status_many
+from aiomcstats.models.fast import FastOfflineStatus, FastStatus
+
+
+async def _shard(
+    hosts: List[str],
+    results: "multiprocessing.Queue[Any]",
+    concurrency: int,
+    per_host_timeout: Optional[float],
+    tries: Optional[int],
+    batch: int,
+) -> None:
+    buffer: List[Tuple[str, Any]] = []
+    async for item in status_many(
+        hosts, concurrency, per_host_timeout, tries, result="fast"
+    ):
+        buffer.append(item)
+        if len(buffer) >= batch:
+            results.put(buffer)
+            buffer = []
+    if buffer:
+        results.put(buffer)
+
+
+def _run_shard(
+    hosts: List[str],
+    results: "multiprocessing.Queue[Any]",
+    concurrency: int,
+    per_host_timeout: Optional[float],
+    tries: Optional[int],
+    batch: int,
+    loop: str,
+) -> None:
+    try:
+        runtime.run(
+            _shard(hosts, results, concurrency, per_host_timeout, tries, batch), loop
+        )
+    finally:
+        results.put(None)
+
+
+def _start(
+    ctx: Any, pending: List[str], processes: int, *options: Any
+) -> Tuple["multiprocessing.Queue[Any]", List[Any]]:
+    # Every worker takes every processes-th host, so slow hosts which are
+    # often listed together end up spread over the workers.
+    results: "multiprocessing.Queue[Any]" = ctx.Queue()
+    workers = [
+        ctx.Process(
+            target=_run_shard,
+            args=(pending[index::processes], results) + options,
+            daemon=True,
+        )
+        for index in range(processes)
+    ]
+    for worker in workers:
+        worker.start()
+    return results, workers
+
+
+async def _batches(
+    results: "multiprocessing.Queue[Any]", workers: List[Any]
+) -> AsyncIterator[List[Tuple[str, Any]]]:
+    # The queue blocks, so it is read from the default executor with a
+    # timeout to notice workers that died without sending their end marker.
+    loop = asyncio.get_running_loop()
+    get = functools.partial(results.get, timeout=1)
+    running = len(workers)
+    while running:
+        try:
+            items = await loop.run_in_executor(None, get)
+        except queue.Empty:
+            if not any(worker.is_alive() for worker in workers):
+                return
+            continue
+        if items is None:
+            running -= 1
+            continue
+        yield items
+
+
+async def status_sharded(
+    hosts: Iterable[str],
+    processes: Optional[int] = None,
+    concurrency: int = 100,
+    per_host_timeout: Optional[float] = 10,
+    tries: Optional[int] = 3,
+    batch: int = 64,
+    context: str = "spawn",
+    loop: str = "asyncio",
+) -> AsyncIterator[Tuple[str, Union[FastStatus, FastOfflineStatus]]]:
+    """Get status from many Minecraft servers using several processes.
+
+    The hosts are dealt out to ``processes`` worker processes which each run
+    :func:`~aiomcstats.status_many` on their own event loop, so parsing is
+    spread over every core. Workers build unvalidated fast results and send
+    them back in batches of ``batch`` over a multiprocessing queue.
+
+    Args:
+        hosts (Iterable[str]): minecraft server addresses, optionally
+            with a port (``host:port``).
+        processes (Optional[int]): Number of worker processes.
+            Defaults to the number of CPUs.
+        concurrency (int): Maximum number of hosts queried at once by each
+            worker. Defaults to 100.
+        per_host_timeout (Optional[float]): Seconds allowed for each host
+            including all tries, None for no limit. Defaults to 10.
+        tries (Optional[int], optional): The amount of tries to get
+            data from each server. Defaults to 3.
+        batch (int): Results sent back per message. Defaults to 64.
+        context (str): multiprocessing start method. Defaults to "spawn".
+        loop (str): event loop of the workers, see
+            :func:`aiomcstats.runtime.run`. Defaults to "asyncio".
+
+    Yields:
+        Tuple[str, Union[FastStatus, FastOfflineStatus]]: Address as given
+            in ``hosts`` and its status, use ``to_model`` for the pydantic
+            model.
+
+    Raises:
+        ValueError: processes, concurrency or batch is less than one or the
+            loop is not available.
+    """
+    if processes is None:
+        processes = os.cpu_count() or 1
+    if processes < 1 or concurrency < 1 or batch < 1:
+        raise ValueError("processes, concurrency and batch must be at least 1")
+    pending = list(hosts)
+    processes = min(processes, len(pending))
+    if not processes:
+        return
+    loop_name = runtime.loop_name(loop)
+    ctx = multiprocessing.get_context(context)
+    results, workers = _start(
+        ctx, pending, processes, concurrency, per_host_timeout, tries, batch, loop_name
+    )
+    try:
+        async for items in _batches(results, workers):
+            for item in items:
+                yield item
+    finally:
+        for worker in workers:
+            if worker.is_alive():
+                worker.terminate()
+            worker.join()
+        results.close()
@@ -0,0 +1,148 @@
+"""Shared UDP sockets for high volume datagram protocols."""
+import abc
+import asyncio
+import ipaddress
+import itertools
+import socket
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Tuple
+
+
+class _MultiplexProtocol(asyncio.DatagramProtocol):
+    def __init__(self, multiplexer: "DatagramMultiplexer") -> None:
+        self.multiplexer = multiplexer
+
+    def datagram_received(self, data: bytes, addr: Tuple[Any, ...]) -> None:
+        self.multiplexer._dispatch(data, addr)
+
+    def error_received(self, exc: Exception) -> None:
+        # ICMP errors on an unconnected socket cannot be matched to a request,
+        # the request times out instead.
+        pass
+
+
+class DatagramMultiplexer(abc.ABC):
+    """Pool of UDP sockets shared by many concurrent requests.
+
+    Requests are sent from a fixed number of sockets and every response is
+    routed back to the waiting request by the key returned from
+    :meth:`response_key`, so the number of open file descriptors does not
+    grow with the number of requests in flight. Subclasses implement
+    :meth:`response_key` for their protocol.
+
+    Args:
+        sockets (int): Number of sockets per address family. Defaults to 1.
+    """
+
+    def __init__(self, sockets: int = 1) -> None:
+        self.sockets = sockets
+        self._transports: Dict[int, List[asyncio.DatagramTransport]] = {}
+        self._cycles: Dict[int, Iterator[asyncio.DatagramTransport]] = {}
+        self._starting: Dict[int, "asyncio.Future[None]"] = {}
+        self._waiters: Dict[Hashable, "asyncio.Future[bytes]"] = {}
+        self.sent = 0
+        self.received = 0
+        self.unmatched = 0
+
+    @property
+    def in_flight(self) -> int:
+        """Number of requests waiting for a response.
+
+        Returns:
+            int: requests in flight.
+        """
+        return len(self._waiters)
+
+    @abc.abstractmethod
+    def response_key(self, data: bytes, addr: Tuple[Any, ...]) -> Optional[Hashable]:
+        """Key of the request a datagram answers.
+
+        Args:
+            data (bytes): datagram received.
+            addr (Tuple[Any, ...]): address it came from.
+
+        Returns:
+            Optional[Hashable]: key of the waiting request, None to drop
+                the datagram.
+        """
+
+    async def _transport(self, family: int) -> asyncio.DatagramTransport:
+        if family not in self._transports:
+            if family not in self._starting:
+                self._starting[family] = asyncio.ensure_future(self._open(family))
+            await asyncio.shield(self._starting[family])
+        return next(self._cycles[family])
+
+    async def _open(self, family: int) -> None:
+        loop = asyncio.get_running_loop()
+        local = "::" if family == socket.AF_INET6 else "0.0.0.0"  # noqa: S104
+        transports: List[asyncio.DatagramTransport] = []
+        try:
+            for _ in range(self.sockets):
+                transport, _ = await loop.create_datagram_endpoint(
+                    lambda: _MultiplexProtocol(self),
+                    local_addr=(local, 0),
+                    family=family,
+                )
+                transports.append(transport)
+        except BaseException:
+            # Forget the failed start so the next request tries again.
+            for transport in transports:
+                transport.close()
+            del self._starting[family]
+            raise
+        self._transports[family] = transports
+        self._cycles[family] = itertools.cycle(transports)
+
+    async def request(
+        self, host: str, port: int, data: bytes, key: Hashable, timeout: float = 1
+    ) -> bytes:
+        """Send a datagram and wait for the response matching key.
+
+        Args:
+            host (str): ip address to send to.
+            port (int): port to send to.
+            data (bytes): datagram to send.
+            key (Hashable): key :meth:`response_key` returns for the answer.
+            timeout (float): seconds to wait for the response. Defaults to 1.
+
+        Raises:
+            ValueError: a request with the same key is already waiting.
+
+        Returns:
+            bytes: the response datagram.
+        """
+        if key in self._waiters:
+            raise ValueError("A request for %r is already in flight" % (key,))
+        family = ipaddress.ip_address(host).version
+        transport = await self._transport(
+            socket.AF_INET6 if family == 6 else socket.AF_INET
+        )
+        future: "asyncio.Future[bytes]" = asyncio.get_running_loop().create_future()
+        self._waiters[key] = future
+        try:
+            transport.sendto(data, (host, port))
+            self.sent += 1
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            del self._waiters[key]
+
+    def _dispatch(self, data: bytes, addr: Tuple[Any, ...]) -> None:
+        self.received += 1
+        try:
+            key = self.response_key(data, addr)
+        except Exception:
+            key = None
+        future = self._waiters.get(key) if key is not None else None
+        if future is None or future.done():
+            self.unmatched += 1
+            return
+        future.set_result(data)
+
+    def close(self) -> None:
+        """Close every socket."""
+        for transports in self._transports.values():
+            for transport in transports:
+                transport.close()
+        self._transports.clear()
+        self._cycles.clear()
+        self._starting.clear()
@@ -1,96 +1,309 @@
 """Useful utils for different protocols."""
-from aiomcstats.models.java import Debug, Info, Mods, Motd, Players, Status
-from typing import Any, Dict, Optional
+from aiomcstats.models.java import Debug, Info, Mods, Motd, Players, Plugins, Status
+from aiomcstats.models.java import Timings
+from aiomcstats.models.fast import FastDebug, FastMods, FastMotd, FastPlayers
+from aiomcstats.models.fast import FastStatus, FastTimings
+from aiomcstats.formatting import render
+from aiomcstats.intern import InternCache
+from aiomcstats.query import parse_plugins
+from aiomcstats.resolver import default_cache, ResolverCache
+from typing import Any, Callable, Dict, List, Optional, TypeVar, Union
 from typing import Tuple
-import re
+import asyncio
+import ipaddress
+import itertools
 
 import dns.asyncresolver
 
+_Resolver = Union[ResolverCache, dns.asyncresolver.Resolver]
 
-async def get_raw(host: str, port: Optional[int] = None) -> Tuple[str, int, str, bool]:
-    """Get raw info on port
+
+async def _lookup_srv(host: str, resolver: _Resolver) -> Optional[Tuple[str, int]]:
+    try:
+        answers = await resolver.resolve("_minecraft._tcp." + host, "SRV", search=True)
+    except Exception:
+        return None
+    if not len(answers):
+        return None
+    answer = answers[0]
+    return str(answer.target).rstrip("."), int(answer.port)
+
+
+def _interleave(families: List[List[str]]) -> List[str]:
+    return [
+        address
+        for group in itertools.zip_longest(*families)
+        for address in group
+        if address is not None
+    ]
+
+
+async def _lookup_addresses(host: str, resolver: _Resolver) -> List[str]:
+    ipv6, ipv4 = await asyncio.gather(
+        resolver.resolve(host, "AAAA", search=True),
+        resolver.resolve(host, "A", search=True),
+        return_exceptions=True,
+    )
+    if isinstance(ipv4, BaseException) and isinstance(ipv6, BaseException):
+        raise ipv4
+    return _interleave(
+        [
+            [answer.address for answer in answers]
+            for answers in (ipv6, ipv4)
+            if not isinstance(answers, BaseException)
+        ]
+    )
+
+
+async def get_addresses(
+    host: str,
+    port: Optional[int] = None,
+    resolver: Optional[Union[ResolverCache, dns.asyncresolver.Resolver]] = None,
+) -> Tuple[str, int, List[str], bool]:
+    """Resolve every address of a server.
+
+    The SRV record is looked up first when no port is given. A and AAAA
+    records are then resolved concurrently and interleaved, IPv6 first, in
+    the order RFC 8305 suggests for connection attempts.
 
     Args:
         host (str): hostname
         port (int, optional): port to use. Defaults to None.
+        resolver (Union[ResolverCache, dns.asyncresolver.Resolver], optional):
+            resolver to use for lookups. Defaults to the shared
+            ResolverCache.
 
     Raises:
         ValueError: Error if invalid address
 
     Returns:
-        Tuple[str, int, str, bool]: hostname, port, ip, wether srv used
+        Tuple[str, int, List[str], bool]: hostname, port, addresses, wether
+            srv used
     """
     srv = False
-    if ":" in host:
-        parts = host.split(":")
-        if len(parts) > 2:
+    if host.count(":") == 1:
+        host, _, port_part = host.partition(":")
+        port = int(port_part)
+    elif host.startswith("[") and "]:" in host:
+        host, _, port_part = host[1:].partition("]:")
+        port = int(port_part)
+    try:
+        ipaddress.ip_address(host.strip("[]"))
+    except ValueError:
+        if ":" in host:
             raise ValueError("Invalid address '%s'" % host)
-        host = parts[0]
-        port = int(parts[1])
+    else:
+        host = host.strip("[]")
+        return (host, 25565 if port is None else port, [host], srv)
+    if resolver is None:
+        resolver = default_cache
     if port is None:
-        port = 25565
-        try:
-            answers = await dns.asyncresolver.resolve(
-                "_minecraft._tcp." + host, "SRV", search=True
-            )
-            if len(answers):
-                answer = answers[0]
-                host = str(answer.target).rstrip(".")
-                port = int(answer.port)
-                srv = True
-        except Exception:
-            pass
-
-    ip = (await dns.asyncresolver.resolve(host, "A", search=True))[0].address
+        target = await _lookup_srv(host, resolver)
+        srv = target is not None
+        host, port = target or (host, 25565)
+    return (host, port, await _lookup_addresses(host, resolver), srv)
+
+
+async def get_raw(
+    host: str,
+    port: Optional[int] = None,
+    resolver: Optional[Union[ResolverCache, dns.asyncresolver.Resolver]] = None,
+) -> Tuple[str, int, str, bool]:
+    """Get raw info on port
+
+    The first IPv4 address is used, or the first IPv6 address when the
+    server has no IPv4 address.
 
+    Args:
+        host (str): hostname
+        port (int, optional): port to use. Defaults to None.
+        resolver (Union[ResolverCache, dns.asyncresolver.Resolver], optional):
+            resolver to use for lookups. Defaults to the shared
+            ResolverCache.
+
+    Returns:
+        Tuple[str, int, str, bool]: hostname, port, ip, wether srv used
+    """
+    host, port, addresses, srv = await get_addresses(host, port, resolver)
+    ip = next((address for address in addresses if ":" not in address), addresses[0])
     return (host, port, ip, srv)
 
 
-COLOR_DICT = {
-    "31": [(255, 0, 0), (128, 0, 0)],
-    "32": [(0, 255, 0), (0, 128, 0)],
-    "33": [(255, 255, 0), (128, 128, 0)],
-    "34": [(0, 0, 255), (0, 0, 128)],
-    "35": [(255, 0, 255), (128, 0, 128)],
-    "36": [(0, 255, 255), (0, 128, 128)],
-}
+T = TypeVar("T")
+
+
+def _shared(
+    interner: Optional[InternCache], kind: str, raw: Any, build: Callable[[Any], T]
+) -> T:
+    if interner is None:
+        return build(raw)
+    return interner.get(kind, raw, build)
+
+
+def create_motd(description: Any) -> Motd:
+    """Create motd object from the status description.
+
+    Args:
+        description (Any): description from the status json
+
+    Returns:
+        Motd: Motd object
+    """
+    raw, clean, html = render(description)
+    return Motd(raw=raw, clean=clean, html=html)
+
+
+def create_players(raw: Dict[str, Any]) -> Tuple[Players, Optional[Info]]:
+    """Create players object from the status json players.
+
+    Args:
+        raw (Dict[str, Any]): players from the status json
+
+    Returns:
+        Tuple[Players, Optional[Info]]: Players object and info sent in
+            place of a player sample
+    """
+    info = None
+    if "sample" not in raw:
+        players = Players(online=raw["online"], max=raw["max"])
+    elif len(raw["sample"]) == 0:
+        players = Players(online=raw["online"], max=raw["max"])
+    elif "00000000-0000-0000-0000-000000000000" in raw["sample"]:
+        info = Info()
+        players = Players(online=raw["online"], max=raw["max"])
+    else:
+        players = Players(
+            online=raw["online"],
+            max=raw["max"],
+            list=[i["name"] for i in raw["sample"]],
+            uuid={name["name"]: name["id"] for name in raw["sample"]},
+        )
+    return players, info
+
+
+def create_mods(raw: Dict[str, Any]) -> Optional[Mods]:
+    """Create mods object from the status json.
 
-COLOR_REGEX = re.compile(r"\[(?P<arg_1>\d+)(;(?P<arg_2>\d+)(;(?P<arg_3>\d+))?)?m")
+    Args:
+        raw (Dict[str, Any]): raw json
 
-BOLD_TEMPLATE = '<span style="color: rgb{}; font-weight: bolder">'
-LIGHT_TEMPLATE = '<span style="color: rgb{}">'
+    Returns:
+        Optional[Mods]: Mods object if the server sent a mod list
+    """
+    if "modinfo" not in raw:
+        return None
+    return Mods(
+        names=[i["modid"] for i in raw["modinfo"]["modList"]],
+        raw={name["modid"]: name["version"] for name in raw["modinfo"]["modList"]},
+    )
 
 
-def ansi_to_html(text: str) -> str:
-    """Convert minecraft formatting to html.
+def create_plugins(raw: Dict[str, Any]) -> Tuple[Optional[str], Optional[Plugins]]:
+    """Create plugins object from the full stat of a query.
 
     Args:
-        text (str): Raw minecraft text
+        raw (Dict[str, Any]): raw json with the full stat under "query"
 
     Returns:
-        str: html formatted text
+        Tuple[Optional[str], Optional[Plugins]]: software reported by the
+            query and Plugins object if the server sent a plugin list
     """
-    text = text.replace("[m", "</span>")
+    if "query" not in raw:
+        return None, None
+    software, plugins = parse_plugins(raw["query"].get("plugins", ""))
+    if plugins is None:
+        return software, None
+    return software, Plugins(names=plugins[0], raw=plugins[1])
 
-    def single_sub(match):
-        argsdict = match.groupdict()
-        if argsdict["arg_3"] is None:
-            if argsdict["arg_2"] is None:
-                color, bold = argsdict["arg_1"], 0
-            else:
-                color, bold = argsdict["arg_1"], int(argsdict["arg_2"])
-        else:
-            color, bold = argsdict["arg_2"], int(argsdict["arg_3"])
 
-        if bold:
-            return BOLD_TEMPLATE.format(COLOR_DICT[color][1])
-        return LIGHT_TEMPLATE.format(COLOR_DICT[color][0])
+def create_fast_status(
+    raw: Dict[str, Any],
+    ip: str,
+    port: int,
+    hostname: str,
+    srv: bool,
+    interner: Optional[InternCache] = None,
+) -> FastStatus:
+    """Create a lightweight status from json without validating it.
 
-    return COLOR_REGEX.sub(single_sub, text)
+    Args:
+        raw (Dict[str, Any]): raw json
+        ip (str): ip of server
+        port (int): port of server
+        hostname (str): hostname of server
+        srv (bool): wether srv used
+        interner (Optional[InternCache]): shares the motd, version and mods
+            with earlier results. Defaults to None.
+
+    Returns:
+        FastStatus: FastStatus object
+    """
+    players = raw["players"]
+    sample = players.get("sample")
+    query = raw.get("query")
+    if sample:
+        fast_players = FastPlayers(
+            players["online"],
+            players["max"],
+            [i["name"] for i in sample],
+            {i["name"]: i["id"] for i in sample},
+        )
+    else:
+        fast_players = FastPlayers(players["online"], players["max"])
+    software = raw.get("software")
+    plugins = None
+    if query is not None:
+        fast_players = fast_players._replace(list=query["players"])
+        query_software, listed = parse_plugins(query.get("plugins", ""))
+        software = software or query_software
+        if listed is not None:
+            plugins = FastMods(*listed)
+    mods = None
+    if "modinfo" in raw:
+        mods = _shared(
+            interner,
+            "fast_mods",
+            raw["modinfo"],
+            lambda modinfo: FastMods(
+                [i["modid"] for i in modinfo["modList"]],
+                {i["modid"]: i["version"] for i in modinfo["modList"]},
+            ),
+        )
+    timings = FastTimings(**raw["timings"]) if "timings" in raw else None
+    icon = raw.get("favicon")
+    return FastStatus(
+        online=True,
+        ip=ip,
+        port=port,
+        debug=FastDebug(True, query is not None, srv),
+        motd=_shared(
+            interner,
+            "fast_motd",
+            raw["description"],
+            lambda description: FastMotd(*render(description)),
+        ),
+        players=fast_players,
+        version=_shared(interner, "version", raw["version"]["name"], str),
+        map=(raw if query is None else query).get("map", "world"),
+        protocol=raw["version"].get("protocol"),
+        hostname=hostname,
+        icon=icon,
+        icon_hash=raw.get("favicon_hash"),
+        software=software,
+        plugins=plugins,
+        mods=mods,
+        latency=timings.latency if timings is not None else None,
+        timings=timings,
+    )
 
 
 def create_status(
-    raw: Dict[str, Any], ip: str, port: int, hostname: str, srv: bool
+    raw: Dict[str, Any],
+    ip: str,
+    port: int,
+    hostname: str,
+    srv: bool,
+    interner: Optional[InternCache] = None,
 ) -> Status:
     """Create status object from json.
 
@@ -100,66 +313,35 @@ def create_status(
         port (int): port of server
         hostname (str): hostname of server
         srv (bool): wether srv used
+        interner (Optional[InternCache]): shares the motd, version and mods
+            with earlier results. Defaults to None.
 
     Returns:
         Status: Status object
     """
     icon = raw["favicon"] if "favicon" in raw else None
-    software = raw["software"] if "software" in raw else None
+    query = raw.get("query")
+    query_software, plugins = create_plugins(raw)
+    software = raw["software"] if "software" in raw else query_software
     protocol = raw["version"]["protocol"]
-    version = raw["version"]["name"]
+    version = _shared(interner, "version", raw["version"]["name"], str)
     map = raw["map"] if "map" in raw else "world"
+    if query is not None:
+        map = query.get("map", map)
     debug = Debug(
         ping=True,
-        query=False,
+        query=query is not None,
         srv=srv,
     )
-    if "text" in raw["description"]:
-        motd = Motd(
-            raw=[raw["description"]["text"]],
-            clean=[
-                a.strip()
-                for a in re.sub(r"(§.)", "", raw["description"]["text"]).split("\n")
-            ],
-            html=[ansi_to_html(raw["description"]["text"])],
-        )
-    elif "extra" in raw["description"]:
-        motd = Motd(
-            raw=[raw["description"]["extra"]],
-            clean=["".join(element["extra"] for element in raw["description"])],
-            html=[ansi_to_html(raw["description"]["extra"])],
-        )
-    elif type(raw["description"]) == str:
-        motd = Motd(
-            raw=[raw["description"]],
-            clean=[
-                a.strip() for a in re.sub(r"(§.)", "", raw["description"]).split("\n")
-            ],
-            html=[ansi_to_html(raw["description"])],
-        )
-
-    info = None
-    if "sample" not in raw["players"]:
-        players = Players(online=raw["players"]["online"], max=raw["players"]["max"])
-    elif len(raw["players"]["sample"]) == 0:
-        players = Players(online=raw["players"]["online"], max=raw["players"]["max"])
-    elif "00000000-0000-0000-0000-000000000000" in raw["players"]["sample"]:
-        info = Info()
-        players = Players(online=raw["players"]["online"], max=raw["players"]["max"])
-    else:
-        players = Players(
-            online=raw["players"]["online"],
-            max=raw["players"]["max"],
-            list=[i["name"] for i in raw["players"]["sample"]],
-            uuid={name["name"]: name["id"] for name in raw["players"]["sample"]},
-        )
-    plugins = Mods() if "plugins" in raw else None
+    motd = _shared(interner, "motd", raw["description"], create_motd)
+    players, info = create_players(raw["players"])
+    if query is not None:
+        players.list = query["players"]
     mods = None
     if "modinfo" in raw:
-        mods = Mods(
-            names=[i["modid"] for i in raw["modinfo"]["modList"]],
-            raw={name["modid"]: name["version"] for name in raw["modinfo"]["modList"]},
-        )
+        mods = _shared(interner, "mods", raw["modinfo"], lambda _: create_mods(raw))
+
+    timings = Timings(**raw["timings"]) if "timings" in raw else None
 
     data = Status(
         online=True,
@@ -173,9 +355,12 @@ def create_status(
         protocol=protocol,
         hostname=hostname,
         icon=icon,
+        icon_hash=raw.get("favicon_hash"),
         software=software,
         plugins=plugins,
         mods=mods,
         info=info,
+        latency=timings.latency if timings is not None else None,
+        timings=timings,
     )
     return data
@@ -0,0 +1,104 @@
+"""Compare status packet decoding of the old and new Connection buffers.
+
+Run with ``python -m benchmarks.bench_connection`` from the repository root.
+"""
+import json
+import timeit
+from typing import Any
+
+from aiomcstats.connection import Connection
+
+
+class LegacyConnection:
+    """Copy of the slicing read path Connection used before the offset."""
+
+    def __init__(self) -> None:
+        self.received = bytearray()
+
+    def receive(self, data: Any) -> None:
+        self.received.extend(data)
+
+    def read(self, length: int) -> bytearray:
+        result = self.received[:length]
+        self.received = self.received[length:]
+        return result
+
+    def read_varint(self) -> int:
+        result = 0
+        for i in range(5):
+            part = ord(self.read(1))
+            result |= (part & 0x7F) << 7 * i
+            if not part & 0x80:
+                return result
+        raise IOError("Server sent a varint that was too big!")
+
+    def read_utf(self) -> str:
+        length = self.read_varint()
+        return self.read(length).decode("utf8")
+
+    def read_buffer(self) -> "LegacyConnection":
+        length = self.read_varint()
+        result = LegacyConnection()
+        result.receive(self.read(length))
+        return result
+
+
+def build_packet(size: int) -> bytes:
+    """Build a status response packet with a favicon of about size bytes.
+
+    Args:
+        size (int): approximate payload size.
+
+    Returns:
+        bytes: framed status response packet.
+    """
+    payload = json.dumps(
+        {
+            "version": {"name": "1.16.5", "protocol": 754},
+            "players": {"max": 20, "online": 1},
+            "description": {"text": "A Minecraft Server"},
+            "favicon": "data:image/png;base64," + "A" * size,
+        }
+    )
+    body = Connection()
+    body.write_varint(0)
+    body.write_utf(payload)
+    packet = Connection()
+    packet.write_buffer(body)
+    return bytes(packet.flush())
+
+
+def decode(cls: Any, packet: bytes) -> str:
+    """Decode the status json out of a packet.
+
+    Args:
+        cls (Any): connection class to use.
+        packet (bytes): framed packet.
+
+    Returns:
+        str: the json text.
+    """
+    conn = cls()
+    conn.receive(packet)
+    response = conn.read_buffer()
+    response.read_varint()
+    return str(response.read_utf())
+
+
+def main() -> None:
+    """Print decode times for a range of payload sizes."""
+    print("%10s %12s %12s %8s" % ("size", "legacy us", "offset us", "speedup"))
+    for size in (1_000, 10_000, 100_000, 1_000_000):
+        packet = build_packet(size)
+        assert decode(LegacyConnection, packet) == decode(Connection, packet)
+        number = max(1, 2_000_000 // size)
+        old = timeit.timeit(lambda: decode(LegacyConnection, packet), number=number)
+        new = timeit.timeit(lambda: decode(Connection, packet), number=number)
+        print(
+            "%10d %12.1f %12.1f %7.1fx"
+            % (size, old / number * 1e6, new / number * 1e6, old / new)
+        )
+
+
+if __name__ == "__main__":
+    main()
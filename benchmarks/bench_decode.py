@@ -0,0 +1,145 @@
+"""Status response decoding with each JSON backend.
+
+Run with ``python -m benchmarks.bench_decode [payload.json ...]`` from the
+repository root. Captured status responses can be passed as files; without
+them synthetic vanilla, network and modded payloads are used.
+"""
+
+import argparse
+import base64
+import json
+import timeit
+from typing import Any, Dict, List
+
+from aiomcstats import decoder
+from aiomcstats.connection import Connection
+from aiomcstats.ping import _parse_status
+
+
+def synthetic_payloads() -> Dict[str, bytes]:
+    """Build payloads shaped like common server responses.
+
+    Returns:
+        Dict[str, bytes]: payloads by name.
+    """
+    favicon = (
+        "data:image/png;base64," + base64.b64encode(bytes(range(256)) * 96).decode()
+    )
+    vanilla = {
+        "version": {"name": "1.16.5", "protocol": 754},
+        "players": {"max": 20, "online": 0},
+        "description": {"text": "A Minecraft Server"},
+    }
+    network: Dict[str, Any] = {
+        "version": {"name": "BungeeCord 1.8.x-1.16.x", "protocol": 754},
+        "players": {
+            "max": 10000,
+            "online": 4213,
+            "sample": [
+                {
+                    "name": "§a§lPLAY.EXAMPLE.NET",
+                    "id": "00000000-0000-0000-0000-000000000000",
+                }
+            ]
+            * 12,
+        },
+        "description": {
+            "extra": [{"color": "gold", "bold": True, "text": "Example Network "}] * 8,
+            "text": "",
+        },
+        "favicon": favicon,
+    }
+    modded: Dict[str, Any] = {
+        "version": {"name": "1.12.2", "protocol": 340},
+        "players": {"max": 50, "online": 7},
+        "description": {"text": "§6Modded Survival"},
+        "modinfo": {
+            "type": "FML",
+            "modList": [
+                {"modid": "examplemod%d" % i, "version": "1.12.2-%d.4.%d" % (i, i * 7)}
+                for i in range(400)
+            ],
+        },
+        "favicon": favicon,
+    }
+    return {
+        name: json.dumps(payload).encode("utf8")
+        for name, payload in (
+            ("vanilla", vanilla),
+            ("network", network),
+            ("modded", modded),
+        )
+    }
+
+
+def packet_body(payload: bytes) -> Connection:
+    """Wrap a payload in a status response packet body.
+
+    Args:
+        payload (bytes): status json.
+
+    Returns:
+        Connection: packet body ready to be parsed.
+    """
+    body = Connection()
+    body.write_varint(0)
+    body.write_varint(len(payload))
+    body.write(payload)
+    packet = Connection()
+    packet.received = body.flush()
+    return packet
+
+
+def legacy(packet: Connection) -> Any:
+    """Decode the way Ping did before the decoder module.
+
+    Args:
+        packet (Connection): packet body.
+
+    Returns:
+        Any: decoded json.
+    """
+    packet.read_varint()
+    return json.loads(packet.read_utf())
+
+
+def main(files: List[str]) -> None:
+    """Print decode time per payload and backend.
+
+    Args:
+        files (List[str]): captured payload files.
+    """
+    payloads = synthetic_payloads()
+    for name in files:
+        with open(name, "rb") as f:
+            payloads[name] = f.read()
+    print("%-12s %8s %-10s %10s" % ("payload", "KB", "decoder", "us"))
+    for name, payload in payloads.items():
+        number = 200
+        elapsed = timeit.timeit(lambda: legacy(packet_body(payload)), number=number)
+        print(
+            "%-12s %8.1f %-10s %10.1f"
+            % (name, len(payload) / 1024, "legacy", elapsed / number * 1e6)
+        )
+        for backend in sorted(decoder.BACKENDS):
+            decoder.set_backend(backend)
+            elapsed = timeit.timeit(
+                lambda: _parse_status(packet_body(payload)), number=number
+            )
+            print(
+                "%-12s %8.1f %-10s %10.1f"
+                % ("", len(payload) / 1024, backend, elapsed / number * 1e6)
+            )
+            elapsed = timeit.timeit(
+                lambda: _parse_status(packet_body(payload), True), number=number
+            )
+            print(
+                "%-12s %8.1f %-10s %10.1f"
+                % ("", len(payload) / 1024, backend + "+skip", elapsed / number * 1e6)
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("files", nargs="*", help="captured status json files")
+    main(parser.parse_args().files)
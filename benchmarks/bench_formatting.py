@@ -0,0 +1,119 @@
+"""Motd rendering compared to the regex implementation it replaced.
+
+Run with ``python -m benchmarks.bench_formatting`` from the repository root.
+"""
+
+import argparse
+import re
+import timeit
+from typing import Any, Dict, List, Tuple
+
+from aiomcstats import formatting
+
+COLOR_DICT = {
+    "31": [(255, 0, 0), (128, 0, 0)],
+    "32": [(0, 255, 0), (0, 128, 0)],
+    "33": [(255, 255, 0), (128, 128, 0)],
+    "34": [(0, 0, 255), (0, 0, 128)],
+    "35": [(255, 0, 255), (128, 0, 128)],
+    "36": [(0, 255, 255), (0, 128, 128)],
+}
+
+COLOR_REGEX = re.compile(r"\[(?P<arg_1>\d+)(;(?P<arg_2>\d+)(;(?P<arg_3>\d+))?)?m")
+
+BOLD_TEMPLATE = '<span style="color: rgb{}; font-weight: bolder">'
+LIGHT_TEMPLATE = '<span style="color: rgb{}">'
+
+
+def ansi_to_html(text: str) -> str:
+    """Previous html conversion.
+
+    Args:
+        text (str): Raw minecraft text
+
+    Returns:
+        str: html formatted text
+    """
+    text = text.replace("[m", "</span>")
+
+    def single_sub(match: Any) -> str:
+        argsdict = match.groupdict()
+        if argsdict["arg_3"] is None:
+            if argsdict["arg_2"] is None:
+                color, bold = argsdict["arg_1"], 0
+            else:
+                color, bold = argsdict["arg_1"], int(argsdict["arg_2"])
+        else:
+            color, bold = argsdict["arg_2"], int(argsdict["arg_3"])
+
+        if bold:
+            return BOLD_TEMPLATE.format(COLOR_DICT[color][1])
+        return LIGHT_TEMPLATE.format(COLOR_DICT[color][0])
+
+    return COLOR_REGEX.sub(single_sub, text)
+
+
+def legacy(description: Any) -> Tuple[List[str], List[str], List[str]]:
+    """Previous motd rendering, only the string branches worked.
+
+    Args:
+        description (Any): description from the status json
+
+    Returns:
+        Tuple[List[str], List[str], List[str]]: raw, clean and html motd
+    """
+    if "text" in description:
+        return (
+            [description["text"]],
+            [a.strip() for a in re.sub(r"(§.)", "", description["text"]).split("\n")],
+            [ansi_to_html(description["text"])],
+        )
+    return (
+        [description],
+        [a.strip() for a in re.sub(r"(§.)", "", description).split("\n")],
+        [ansi_to_html(description)],
+    )
+
+
+DESCRIPTIONS: Dict[str, Any] = {
+    "plain": {"text": "A Minecraft Server"},
+    "codes": "§6§lExample Network §7» §a1.8-1.16\n§e§oNew minigames every week",
+    "components": {
+        "text": "",
+        "extra": [
+            {"text": "Example ", "color": "gold", "bold": True},
+            {"text": "Network", "color": "#12ab34", "extra": [" » ", "1.8-1.16"]},
+            {"text": "\nNew minigames every week", "color": "yellow"},
+        ],
+    },
+}
+
+
+def main(number: int) -> None:
+    """Print render time per description.
+
+    Args:
+        number (int): renders per measurement.
+    """
+    print("%-11s %-10s %10s" % ("motd", "renderer", "us"))
+    for name, description in DESCRIPTIONS.items():
+        rows = [("cached", lambda: formatting.render(description))]
+        if name != "components":
+            rows.insert(0, ("legacy", lambda: legacy(description)))
+
+        def uncached() -> None:
+            formatting._render.cache_clear()
+            formatting._render_pieces.cache_clear()
+            formatting.render(description)
+
+        rows.append(("uncached", uncached))
+        for label, function in rows:
+            elapsed = timeit.timeit(function, number=number)
+            print("%-11s %-10s %10.2f" % (name, label, elapsed / number * 1e6))
+            name = ""
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=20_000)
+    main(parser.parse_args().number)
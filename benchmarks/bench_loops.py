@@ -0,0 +1,90 @@
+"""Pings per second on each available event loop.
+
+Run with ``python -m benchmarks.bench_loops`` from the repository root. Java
+pings use both transports, bedrock pings go through a BedrockMultiplexer.
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Dict
+
+from aiomcstats import runtime
+from aiomcstats.bedrock import BedrockMultiplexer
+from benchmarks import bench_ping
+from tests.server import FakeBedrockServer
+from tests.server import FakeServer
+
+
+async def bedrock_rate(total: int, concurrency: int) -> float:
+    """Ping a fake bedrock server total times.
+
+    Args:
+        total (int): number of pings.
+        concurrency (int): pings in flight at once.
+
+    Returns:
+        float: pings per second.
+    """
+    server = FakeBedrockServer()
+    host, port = await server.start()
+    multiplexer = BedrockMultiplexer()
+    remaining = iter(range(total))
+
+    async def worker() -> None:
+        for _ in remaining:
+            await multiplexer.status(host, port)
+
+    try:
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return total / (time.perf_counter() - start)
+    finally:
+        multiplexer.close()
+        await server.close()
+
+
+async def measure(total: int, concurrency: int) -> Dict[str, float]:
+    """Measure every transport on the running loop.
+
+    Args:
+        total (int): number of pings per transport.
+        concurrency (int): pings in flight at once.
+
+    Returns:
+        Dict[str, float]: pings per second by transport.
+    """
+    server = FakeServer()
+    host, port = await server.start()
+    rates = {}
+    try:
+        for name, cls in bench_ping.PINGERS.items():
+            await bench_ping.run(cls, host, port, concurrency, concurrency)
+            rates[name] = await bench_ping.run(cls, host, port, total, concurrency)
+    finally:
+        await server.close()
+    rates["bedrock"] = await bedrock_rate(total, concurrency)
+    return rates
+
+
+def main(total: int, concurrency: int) -> None:
+    """Print pings per second for every loop and transport.
+
+    Args:
+        total (int): number of pings per transport.
+        concurrency (int): pings in flight at once.
+    """
+    print("%-8s %-10s %10s" % ("loop", "transport", "pings/s"))
+    for loop in runtime.available_loops():
+        rates = runtime.run(measure(total, concurrency), loop)
+        for transport, rate in rates.items():
+            print("%-8s %-10s %10.0f" % (loop, transport, rate))
+            loop = ""
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--total", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    args = parser.parse_args()
+    main(args.total, args.concurrency)
@@ -0,0 +1,74 @@
+"""Pings per second of Ping and ProtocolPing against a local fake server.
+
+Run with ``python -m benchmarks.bench_ping`` from the repository root. Both
+server and client share one event loop, so the numbers are per core.
+"""
+import argparse
+import asyncio
+import time
+from typing import Any, Dict
+
+from aiomcstats.ping import Ping, ProtocolPing
+from tests.server import FakeServer
+
+PINGERS: Dict[str, Any] = {"stream": Ping, "protocol": ProtocolPing}
+
+
+async def _ping(cls: Any, host: str, port: int) -> None:
+    pinger = cls(host, port)
+    try:
+        await pinger.connect()
+        await pinger.handshake()
+        await pinger.status()
+    finally:
+        pinger.close()
+
+
+async def run(cls: Any, host: str, port: int, total: int, concurrency: int) -> float:
+    """Ping the server total times with bounded concurrency.
+
+    Args:
+        cls (Any): pinger class.
+        host (str): server address.
+        port (int): server port.
+        total (int): number of pings.
+        concurrency (int): pings in flight at once.
+
+    Returns:
+        float: pings per second.
+    """
+    remaining = iter(range(total))
+
+    async def worker() -> None:
+        for _ in remaining:
+            await _ping(cls, host, port)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return total / (time.perf_counter() - start)
+
+
+async def main(total: int, concurrency: int) -> None:
+    """Print pings per second for every pinger.
+
+    Args:
+        total (int): number of pings per pinger.
+        concurrency (int): pings in flight at once.
+    """
+    server = FakeServer()
+    host, port = await server.start()
+    try:
+        for name, cls in PINGERS.items():
+            await run(cls, host, port, concurrency, concurrency)  # warm up
+            rate = await run(cls, host, port, total, concurrency)
+            print("%-10s %10.0f pings/s" % (name, rate))
+    finally:
+        await server.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--total", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    args = parser.parse_args()
+    asyncio.run(main(args.total, args.concurrency))
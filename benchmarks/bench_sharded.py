@@ -0,0 +1,92 @@
+"""Status throughput of status_sharded by number of worker processes.
+
+Run with ``python -m benchmarks.bench_sharded`` from the repository root.
+The fake servers run in their own processes so they are not the limit.
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import time
+from typing import Any, List
+
+from aiomcstats.sharded import status_sharded
+from tests.server import FakeServer
+
+
+async def _serve(ports: "multiprocessing.Queue[Any]") -> None:
+    server = FakeServer()
+    _, port = await server.start()
+    ports.put(port)
+    await asyncio.Event().wait()
+
+
+def serve(ports: "multiprocessing.Queue[Any]") -> None:
+    """Run a fake server until terminated.
+
+    Args:
+        ports (multiprocessing.Queue[Any]): receives the port bound.
+    """
+    asyncio.run(_serve(ports))
+
+
+async def run(hosts: List[str], processes: int, concurrency: int) -> float:
+    """Get the status of every host once.
+
+    Args:
+        hosts (List[str]): addresses to query.
+        processes (int): worker processes.
+        concurrency (int): queries in flight per worker.
+
+    Returns:
+        float: statuses per second.
+    """
+    start = time.perf_counter()
+    online = 0
+    async for _, result in status_sharded(
+        hosts, processes=processes, concurrency=concurrency, tries=1
+    ):
+        online += result.online
+    elapsed = time.perf_counter() - start
+    if online != len(hosts):
+        print("warning: %d of %d hosts offline" % (len(hosts) - online, len(hosts)))
+    return len(hosts) / elapsed
+
+
+def main(total: int, servers: int, concurrency: int, processes: List[int]) -> None:
+    """Print statuses per second for each number of processes.
+
+    Args:
+        total (int): statuses per run.
+        servers (int): fake server processes.
+        concurrency (int): queries in flight per worker.
+        processes (List[int]): worker process counts to measure.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    ports: "multiprocessing.Queue[Any]" = ctx.Queue()
+    workers = [
+        ctx.Process(target=serve, args=(ports,), daemon=True)  # type: ignore
+        for _ in range(servers)
+    ]
+    for worker in workers:
+        worker.start()
+    try:
+        addresses = ["127.0.0.1:%d" % ports.get() for _ in workers]
+        hosts = [addresses[i % servers] for i in range(total)]
+        print("%-10s %12s" % ("processes", "statuses/s"))
+        for count in processes:
+            rate = asyncio.run(run(hosts, count, concurrency))
+            print("%-10d %12.0f" % (count, rate))
+    finally:
+        for worker in workers:
+            worker.terminate()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--total", type=int, default=20000)
+    parser.add_argument("--servers", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+    main(args.total, args.servers, args.concurrency, args.processes)
@@ -0,0 +1,268 @@
+"""Local fake minecraft server used by tests and benchmarks."""
+import asyncio
+import json
+import struct
+from typing import Any, Dict, Optional, Tuple
+
+
+DEFAULT_STATUS: Dict[str, Any] = {
+    "version": {"name": "1.16.5", "protocol": 754},
+    "players": {"max": 20, "online": 1},
+    "description": {"text": "§aA Minecraft Server"},
+}
+
+
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    while True:
+        if value & ~0x7F == 0:
+            out.append(value)
+            return bytes(out)
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+
+
+async def _read_varint(reader: asyncio.StreamReader) -> int:
+    result = 0
+    for i in range(5):
+        part = (await reader.readexactly(1))[0]
+        result |= (part & 0x7F) << 7 * i
+        if not part & 0x80:
+            return result
+    raise IOError("varint too big")
+
+
+def _packet(body: bytes) -> bytes:
+    return _varint(len(body)) + body
+
+
+class FakeServer:
+    """Java edition server answering the server list ping.
+
+    Args:
+        payload (Optional[Dict[str, Any]]): status json to send.
+            Defaults to DEFAULT_STATUS.
+    """
+
+    def __init__(self, payload: Optional[Dict[str, Any]] = None) -> None:
+        data = json.dumps(payload or DEFAULT_STATUS).encode("utf8")
+        self.response = _packet(b"\x00" + _varint(len(data)) + data)
+        self.connections = 0
+
+    async def start(self, host: str = "127.0.0.1") -> Tuple[str, int]:
+        """Start listening on a free port.
+
+        Args:
+            host (str): address to bind. Defaults to "127.0.0.1".
+
+        Returns:
+            Tuple[str, int]: address and port bound.
+        """
+        self.server = await asyncio.start_server(self._handle, host, 0)
+        return self.server.sockets[0].getsockname()[:2]
+
+    async def close(self) -> None:
+        """Stop the server."""
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self.connections += 1
+        try:
+            while True:
+                body = await reader.readexactly(await _read_varint(reader))
+                if body[0] == 0 and len(body) == 1:
+                    writer.write(self.response)
+                elif body[0] == 1 and len(body) == 9:
+                    writer.write(_packet(body))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+class FakeLegacyServer(FakeServer):
+    """Server older than 1.7 which only answers the legacy 0xFE ping.
+
+    Args:
+        kick (str): kick message sent as the response.
+            Defaults to a 1.6.4 server.
+        hang (bool): leave modern pings unanswered instead of closing the
+            connection. Defaults to False.
+    """
+
+    def __init__(
+        self,
+        kick: str = "\xa71\x0078\x001.6.4\x00A Legacy Server\x003\x0020",
+        hang: bool = False,
+    ) -> None:
+        super().__init__()
+        self.hang = hang
+        data = kick.encode("utf-16-be")
+        self.response = b"\xff" + struct.pack(">H", len(data) // 2) + data
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self.connections += 1
+        try:
+            if await reader.readexactly(1) == b"\xfe":
+                writer.write(self.response)
+                await writer.drain()
+            elif self.hang:
+                while await reader.read(1024):
+                    pass
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+BEDROCK_MAGIC = bytes.fromhex("00ffff00fefefefefdfdfdfd12345678")
+DEFAULT_BEDROCK = (
+    "MCPE;Dedicated Server;422;1.16.201;3;10;13253860892328930865;"
+    "Bedrock level;Survival;1;19132;19133;"
+)
+
+
+class FakeBedrockServer(asyncio.DatagramProtocol):
+    """Bedrock edition server answering unconnected pings.
+
+    Args:
+        motd (str): server id string to send. Defaults to DEFAULT_BEDROCK.
+    """
+
+    def __init__(self, motd: str = DEFAULT_BEDROCK) -> None:
+        self.motd = motd.encode("utf8")
+        self.pings = 0
+
+    async def start(self, host: str = "127.0.0.1") -> Tuple[str, int]:
+        """Start listening on a free port.
+
+        Args:
+            host (str): address to bind. Defaults to "127.0.0.1".
+
+        Returns:
+            Tuple[str, int]: address and port bound.
+        """
+        loop = asyncio.get_running_loop()
+        self.transport, _ = await loop.create_datagram_endpoint(
+            lambda: self, local_addr=(host, 0)
+        )
+        return self.transport.get_extra_info("sockname")[:2]
+
+    async def close(self) -> None:
+        """Stop the server."""
+        self.transport.close()
+
+    def datagram_received(self, data: bytes, addr: Tuple[Any, ...]) -> None:
+        """Answer a ping.
+
+        Args:
+            data (bytes): datagram received.
+            addr (Tuple[Any, ...]): address it came from.
+        """
+        if data[:1] != b"\x01":
+            return
+        self.pings += 1
+        pong = (
+            b"\x1c"
+            + data[1:9]
+            + b"\x00" * 8
+            + BEDROCK_MAGIC
+            + struct.pack(">H", len(self.motd))
+            + self.motd
+        )
+        self.transport.sendto(pong, addr)
+
+
+DEFAULT_QUERY: Dict[str, str] = {
+    "hostname": "A Minecraft Server",
+    "gametype": "SMP",
+    "game_id": "MINECRAFT",
+    "version": "1.16.5",
+    "plugins": "Paper on Bukkit 1.16.5: WorldEdit 7.2.5; Essentials 2.18.2",
+    "map": "survival",
+    "numplayers": "2",
+    "maxplayers": "20",
+    "hostport": "25565",
+    "hostip": "127.0.0.1",
+}
+
+
+class FakeQueryServer(asyncio.DatagramProtocol):
+    """Java edition server answering full stat queries.
+
+    Args:
+        values (Optional[Dict[str, str]]): key value section to send.
+            Defaults to DEFAULT_QUERY.
+        players (Tuple[str, ...]): names of the players online.
+            Defaults to two players.
+    """
+
+    def __init__(
+        self,
+        values: Optional[Dict[str, str]] = None,
+        players: Tuple[str, ...] = ("Steve", "Alex"),
+    ) -> None:
+        self.values = DEFAULT_QUERY if values is None else values
+        self.players = players
+        self.token = 9513307
+        self.handshakes = 0
+        self.stats = 0
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> Tuple[str, int]:
+        """Start listening.
+
+        Args:
+            host (str): address to bind. Defaults to "127.0.0.1".
+            port (int): port to bind, 0 for a free one. Defaults to 0.
+
+        Returns:
+            Tuple[str, int]: address and port bound.
+        """
+        loop = asyncio.get_running_loop()
+        self.transport, _ = await loop.create_datagram_endpoint(
+            lambda: self, local_addr=(host, port)
+        )
+        return self.transport.get_extra_info("sockname")[:2]
+
+    async def close(self) -> None:
+        """Stop the server."""
+        self.transport.close()
+
+    def datagram_received(self, data: bytes, addr: Tuple[Any, ...]) -> None:
+        """Answer a handshake or full stat, ignoring stale tokens.
+
+        Args:
+            data (bytes): datagram received.
+            addr (Tuple[Any, ...]): address it came from.
+        """
+        if data[:2] != b"\xfe\xfd":
+            return
+        kind, session = data[2], data[3:7]
+        if kind == 0x09:
+            self.handshakes += 1
+            response = b"\x09" + session + b"%d\x00" % self.token
+        elif kind == 0x00 and data[7:11] == struct.pack(">I", self.token):
+            self.stats += 1
+            values = b"".join(
+                key.encode("utf8") + b"\x00" + value.encode("utf8") + b"\x00"
+                for key, value in self.values.items()
+            )
+            players = b"".join(name.encode("utf8") + b"\x00" for name in self.players)
+            response = (
+                b"\x00"
+                + session
+                + b"splitnum\x00\x80\x00"
+                + values
+                + b"\x00\x01player_\x00\x00"
+                + players
+                + b"\x00"
+            )
+        else:
+            return
+        self.transport.sendto(response, addr)
@@ -0,0 +1,161 @@
+"""Tests for the packet buffer."""
+import asyncio
+import json
+from typing import List
+
+import pytest
+
+from aiomcstats import decoder
+from aiomcstats.connection import Connection
+from aiomcstats.connection import staggered_race
+from aiomcstats.connection import TCPConnection
+from aiomcstats.ping import status_frames
+
+
+def test_round_trip() -> None:
+    """Values written are read back in order."""
+    packet = Connection()
+    packet.write_varint(300)
+    packet.write_utf("§aHello ✓")
+    packet.write_ascii("query")
+    packet.write_ushort(25565)
+    packet.write_long(-2)
+    packet.write_varint(0)
+
+    conn = Connection()
+    conn.receive(packet.flush())
+    assert conn.read_varint() == 300
+    assert conn.read_utf() == "§aHello ✓"
+    assert conn.read_ascii() == "query"
+    assert conn.read_ushort() == 25565
+    assert conn.read_long() == -2
+    assert conn.read_varint() == 0
+    assert conn.remaining() == 0
+
+
+def test_buffer_compaction() -> None:
+    """Consumed bytes are dropped when more data arrives."""
+    conn = Connection()
+    conn.receive(b"\x01\x02\x03\x04")
+    assert conn.read(3) == b"\x01\x02\x03"
+    conn.receive(b"\x05")
+    assert conn.remaining() == 2
+    assert conn.read(2) == b"\x04\x05"
+
+
+def test_short_read() -> None:
+    """Reading past the received data fails."""
+    conn = Connection()
+    conn.receive(b"\x80")
+    with pytest.raises(IOError):
+        conn.read_varint()
+
+
+def test_status_frames() -> None:
+    """Handshake and request frames are built once per address."""
+    frames = status_frames("example.com", 25565)
+    assert frames is status_frames("example.com", 25565)
+    conn = Connection()
+    conn.receive(frames)
+    handshake = conn.read_buffer()
+    assert handshake.read_varint() == 0
+    assert handshake.read_varint() == 47
+    assert handshake.read_utf() == "example.com"
+    assert handshake.read_ushort() == 25565
+    assert handshake.read_varint() == 1
+    assert conn.read_buffer().read_varint() == 0
+    assert conn.remaining() == 0
+
+
+@pytest.mark.parametrize("backend", sorted(decoder.BACKENDS))
+def test_decoder_backends(backend: str) -> None:
+    """Every installed backend decodes from a memoryview."""
+    data = bytearray('{"description": "§aHi ✓", "players": [1, 2]}', "utf8")
+    with memoryview(data) as view:
+        assert decoder.BACKENDS[backend](view[:]) == {
+            "description": "§aHi ✓",
+            "players": [1, 2],
+        }
+    with pytest.raises(ValueError):
+        decoder.BACKENDS[backend](b"{")
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b'{"favicon": "abc", "a": 1}',
+        b'{"a": 1, "favicon" : "abc"}',
+        b'{"a": 1, "favicon": "a\\/bc", "b": 2}',
+    ],
+)
+def test_strip_favicon(data: bytes) -> None:
+    """The favicon is cut out and hashed as its decoded string."""
+    expected = json.loads(data)
+    icon = expected.pop("favicon")
+    stripped, digest = decoder.strip_favicon(data)
+    assert json.loads(stripped) == expected
+    assert digest == decoder.favicon_hash(icon)
+    assert decoder.strip_favicon(stripped) == (stripped, None)
+    buffer = bytearray(data)
+    assert decoder.strip_favicon(buffer) == (buffer, digest)
+    assert json.loads(buffer) == expected
+
+
+@pytest.mark.asyncio
+async def test_staggered_race() -> None:
+    """A hanging address is overtaken and a failing one skipped at once."""
+    started: List[str] = []
+    closed: List[str] = []
+
+    async def attempt(address: str) -> str:
+        started.append(address)
+        if address == "hang":
+            await asyncio.sleep(10)
+        if address == "fail":
+            raise OSError("refused")
+        return address
+
+    winner = await staggered_race(["hang", "fail", "ok", "late"], attempt, 0.05)
+    assert winner == ("ok", "ok")
+    assert started == ["hang", "fail", "ok"]
+    with pytest.raises(OSError):
+        await staggered_race(["fail", "fail"], attempt, 0.05, closed.append)
+    assert not closed
+
+
+@pytest.mark.asyncio
+async def test_split_packet() -> None:
+    """A packet arriving in pieces is put back together."""
+    packet = Connection()
+    packet.write_varint(0)
+    packet.write_utf("x" * 300)
+    frame = Connection()
+    frame.write_buffer(packet)
+    frame.write_ascii("query")
+    data = bytes(frame.flush())
+
+    async def handle(
+        reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        # Split inside the two byte length prefix and again inside the body.
+        for piece in (data[:1], data[1:4], data[4:200], data[200:]):
+            writer.write(piece)
+            await writer.drain()
+            await asyncio.sleep(0.01)
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    host, port = server.sockets[0].getsockname()[:2]
+    connection = TCPConnection()
+    try:
+        await connection.connect(host, port)
+        response = await connection.read_buffer()
+        assert response.read_varint() == 0
+        assert response.read_utf() == "x" * 300
+        assert await connection.read_ascii() == "query"
+        with pytest.raises(IOError):
+            await connection.read(1)
+    finally:
+        connection.close()
+        server.close()
+        await server.wait_closed()
@@ -0,0 +1,55 @@
+"""Tests for the delta tracker."""
+from typing import Any, Dict, List, Optional
+
+from aiomcstats.decoder import favicon_hash
+from aiomcstats.delta import DeltaTracker
+from aiomcstats.models import FastDebug, FastOfflineStatus
+from aiomcstats.utils import create_fast_status
+
+
+def _status(
+    online: int, names: List[str], motd: str = "§aHi", icon: Optional[str] = None
+) -> Any:
+    raw: Dict[str, Any] = {
+        "version": {"name": "1.16.5", "protocol": 754},
+        "players": {
+            "max": 20,
+            "online": online,
+            "sample": [{"name": name, "id": "0"} for name in names],
+        },
+        "description": motd,
+    }
+    if icon is not None:
+        raw["favicon"] = icon
+    return create_fast_status(raw, "127.0.0.1", 25565, "localhost", False)
+
+
+def test_only_changes_are_reported() -> None:
+    """Unchanged fields and unchanged polls are left out."""
+    tracker = DeltaTracker()
+    first = tracker.update("a", _status(2, ["jeb_", "Notch"]))
+    assert first.changes["version"] == "1.16.5"
+    assert first.joined == ["Notch", "jeb_"]
+    assert tracker.update("a", _status(2, ["jeb_", "Notch"])) is None
+    delta = tracker.update("a", _status(2, ["jeb_", "Dinnerbone"], "§cHi"))
+    assert delta.changes == {"motd": ("§cHi",)}
+    assert (delta.joined, delta.left) == (["Dinnerbone"], ["Notch"])
+    offline = FastOfflineStatus(
+        False, "127.0.0.1", 25565, FastDebug(True, False, False), "a", "refused"
+    )
+    delta = tracker.update("a", offline)
+    assert not delta.online
+    assert delta.changes["online"] is False
+    assert delta.changes["error"] == "refused"
+    assert delta.left == ["Dinnerbone", "jeb_"]
+
+
+def test_icon_changes_are_reported() -> None:
+    """Favicons are hashed for the comparison when the result kept them."""
+    old, new = "data:image/png;base64,QUJD", "data:image/png;base64,REVG"
+    tracker = DeltaTracker()
+    tracker.update("a", _status(2, [], icon=old))
+    assert tracker.update("a", _status(2, [], icon=old)) is None
+    delta = tracker.update("a", _status(2, [], icon=new))
+    assert delta is not None
+    assert delta.changes == {"icon_hash": favicon_hash(new)}
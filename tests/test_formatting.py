@@ -0,0 +1,59 @@
+"""Tests for minecraft text rendering."""
+from aiomcstats.formatting import flatten, render
+
+
+def test_render_legacy() -> None:
+    """Codes are stripped from clean text and turned into spans."""
+    raw, clean, html = render("§aA §lbold§r <b>\n §x§1§2§a§b§3§4hex")
+    assert raw == ["§aA §lbold§r <b>\n §x§1§2§a§b§3§4hex"]
+    assert clean == ["A bold <b>", "hex"]
+    assert html == [
+        '<span style="color: #55FF55">A </span>'
+        '<span style="color: #55FF55; font-weight: bold">bold</span> &lt;b&gt;\n '
+        '<span style="color: #12AB34">hex</span>'
+    ]
+
+
+def test_render_components() -> None:
+    """Nested components inherit the style of their parent."""
+    description = {
+        "text": "",
+        "extra": [
+            {"text": "Gold ", "color": "gold", "extra": [{"text": "x", "bold": True}]},
+            "plain",
+        ],
+    }
+    assert flatten(description) == "§r§6Gold §r§6§lx§rplain"
+    raw, clean, html = render(description)
+    assert clean == ["Gold xplain"]
+    assert html == [
+        '<span style="color: #FFAA00">Gold </span>'
+        '<span style="color: #FFAA00; font-weight: bold">x</span>plain'
+    ]
+    assert render({"text": "§aHi"}) == render("§aHi")
+
+
+def test_render_component_codes() -> None:
+    """Codes inside component text start from the style of the component."""
+    description = {
+        "text": "a§lb",
+        "color": "red",
+        "extra": [{"text": "§<c", "italic": True}],
+    }
+    raw, clean, html = render(description)
+    assert raw == ["§r§ca§lb§r§c§o§<c"]
+    assert clean == ["abc"]
+    assert html == [
+        '<span style="color: #FF5555">a</span>'
+        '<span style="color: #FF5555; font-weight: bold">b</span>'
+        '<span style="color: #FF5555; font-style: italic">c</span>'
+    ]
+
+
+def test_render_invalid_hex_color() -> None:
+    """Colors which are not six hex digits are dropped, not written to html."""
+    description = {"text": "hi", "extra": [{"text": "!", "color": '#"><svg'}]}
+    raw, clean, html = render(description)
+    assert raw == ["hi!"]
+    assert clean == ["hi!"]
+    assert html == ["hi!"]
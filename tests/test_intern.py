@@ -0,0 +1,44 @@
+"""Tests for the intern cache."""
+from typing import Any, Dict
+
+import pytest
+
+from aiomcstats.intern import InternCache
+from aiomcstats.utils import create_fast_status, create_status
+
+
+def _raw() -> Dict[str, Any]:
+    return {
+        "version": {"name": "Paper 1.16.5", "protocol": 754},
+        "players": {"max": 20, "online": 1},
+        "description": {"text": "§aA Minecraft Server"},
+        "modinfo": {"type": "FML", "modList": [{"modid": "a", "version": "1"}]},
+    }
+
+
+def test_results_share_values() -> None:
+    """Equal blocks from separate responses share one parsed value."""
+    interner = InternCache()
+    first = create_status(_raw(), "127.0.0.1", 25565, "a", False, interner)
+    second = create_status(_raw(), "127.0.0.2", 25565, "b", False, interner)
+    assert first.version is second.version
+    assert first.motd is second.motd
+    assert first.mods is second.mods
+    with pytest.raises(TypeError):
+        first.motd.raw = ["§cchanged"]  # type: ignore[misc]
+    fast = [create_fast_status(_raw(), "::1", 1, "c", False, interner) for _ in "ab"]
+    assert fast[0].motd is fast[1].motd
+    assert fast[0].mods is fast[1].mods
+    assert interner.stats() == {"size": 5, "hits": 7, "misses": 5}
+
+
+def test_eviction() -> None:
+    """The least recently used value is dropped first."""
+    interner = InternCache(maxsize=2)
+    for value in ("a", "b", "a", "c"):
+        interner.get("version", value, str)
+    assert interner.get("version", "a", str) == "a"
+    assert interner.misses == 3
+    interner.get("version", "b", str)
+    assert interner.misses == 4
+    assert len(interner) == 2
@@ -0,0 +1,57 @@
+"""Tests for the adaptive concurrency limit."""
+import asyncio
+
+import pytest
+
+import aiomcstats
+from aiomcstats.limiter import AIMDLimiter
+from tests.server import FakeServer
+
+
+def test_additive_increase_multiplicative_decrease() -> None:
+    """The limit grows slowly and halves once per burst of timeouts."""
+    limiter = AIMDLimiter(initial=10, maximum=100, threshold=0.1, smoothing=0.5)
+    for _ in range(100):
+        limiter.in_flight += 1
+        limiter.release()
+    assert 17 < limiter.limit < 18
+    for _ in range(5):
+        limiter.in_flight += 1
+        limiter.release(timed_out=True)
+    assert limiter.decreases == 1
+    assert 8 < limiter.limit < 9
+    assert limiter.stats()["timeouts"] == 5
+
+
+@pytest.mark.asyncio
+async def test_acquire_waits_for_a_slot() -> None:
+    """Requests beyond the limit wait for a release."""
+    limiter = AIMDLimiter(initial=1, maximum=1)
+    await limiter.acquire()
+    waiting = asyncio.ensure_future(limiter.acquire())
+    await asyncio.sleep(0)
+    assert not waiting.done()
+    limiter.release()
+    await asyncio.wait_for(waiting, 1)
+    assert limiter.in_flight == 1
+
+
+@pytest.mark.asyncio
+async def test_status_many_with_limiter() -> None:
+    """Completions feed the limiter."""
+    server = FakeServer()
+    host, port = await server.start()
+    limiter = AIMDLimiter(initial=2, maximum=4)
+    try:
+        results = [
+            item
+            async for item in aiomcstats.status_many(
+                ["%s:%d" % (host, port)] * 10, tries=1, limiter=limiter
+            )
+        ]
+    finally:
+        await server.close()
+    assert all(result.online for _, result in results)
+    assert limiter.completed == 10
+    assert limiter.limit > 2
+    assert limiter.in_flight == 0
@@ -0,0 +1,340 @@
+"""Tests for the status entry points."""
+import asyncio
+from typing import Any, List, Union
+
+import pytest
+
+import aiomcstats
+from aiomcstats.models import BedrockOffline, BedrockStatus, FastBedrockStatus
+from aiomcstats.models import FastOfflineStatus
+from aiomcstats.models import FastStatus, OfflineStatus, Status
+from aiomcstats.decoder import favicon_hash
+from aiomcstats.sharded import status_sharded
+from tests.server import DEFAULT_STATUS
+from tests.server import FakeBedrockServer
+from tests.server import FakeLegacyServer
+from tests.server import FakeQueryServer
+from tests.server import FakeServer
+
+
+@pytest.mark.asyncio
+async def test_status_many() -> None:
+    """Every host is yielded once, dead ones as offline."""
+    server = FakeServer()
+    host, port = await server.start()
+    hosts = ["%s:%d" % (host, port)] * 5 + ["127.0.0.1:1"]
+    try:
+        results = [
+            item
+            async for item in aiomcstats.status_many(hosts, concurrency=2, tries=1)
+        ]
+    finally:
+        await server.close()
+    assert sorted(h for h, _ in results) == sorted(hosts)
+    online = [r for _, r in results if isinstance(r, Status)]
+    assert len(online) == 5
+    assert online[0].players.online == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("transport", ["stream", "protocol"])
+async def test_status_transports(transport: str) -> None:
+    """Both transports read the same status."""
+    server = FakeServer()
+    host, port = await server.start()
+    try:
+        result = await aiomcstats.status(host, port, transport=transport)
+    finally:
+        await server.close()
+    assert isinstance(result, Status) and result.timings is not None
+    assert result.version == "1.16.5"
+    assert result.players.max == 20
+    assert result.timings.connect is not None
+    assert result.latency == result.timings.latency is not None
+
+
+@pytest.mark.asyncio
+async def test_bedrock_multiplexer() -> None:
+    """Concurrent pings from one socket get their own responses."""
+    servers = [
+        FakeBedrockServer("MCPE;Server %d;422;1.16.201;%d;10;1;" % (i, i))
+        for i in range(3)
+    ]
+    addresses = [await server.start() for server in servers]
+    multiplexer = aiomcstats.BedrockMultiplexer()
+    try:
+        results = await asyncio.gather(
+            *(
+                aiomcstats.bedrock(host, port, multiplexer=multiplexer)
+                for host, port in addresses * 10
+            )
+        )
+    finally:
+        multiplexer.close()
+        for server in servers:
+            await server.close()
+    counts = [r.player_count for r in results if isinstance(r, BedrockStatus)]
+    assert counts == [0, 1, 2] * 10
+    assert multiplexer.in_flight == 0
+    assert multiplexer.sent == 30
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker() -> None:
+    """Offline servers are answered from the breaker once it opens."""
+    breaker = aiomcstats.CircuitBreaker(threshold=2, interval=60)
+    results = [
+        await aiomcstats.status("127.0.0.1", 1, tries=1, breaker=breaker)
+        for _ in range(4)
+    ]
+    assert not any(r.online for r in results)
+    assert results[3] is results[2] is results[1]
+    assert breaker.state(("127.0.0.1", 1)) == "open"
+    assert breaker.stats()["short_circuited"] == 2
+
+
+@pytest.mark.asyncio
+async def test_lazy_status() -> None:
+    """A lazy status reads like the model and converts to it."""
+    server = FakeServer()
+    host, port = await server.start()
+    try:
+        result = await aiomcstats.status(host, port, result="lazy")
+    finally:
+        await server.close()
+    assert isinstance(result, aiomcstats.LazyStatus)
+    assert result.players.online == 1
+    assert result.version == "1.16.5"
+    assert result.motd.clean == ["A Minecraft Server"]
+    full = result.to_status()
+    assert full.motd == result.motd._motd
+    assert full.latency == result.latency
+
+
+@pytest.mark.asyncio
+async def test_fast_results() -> None:
+    """Fast results convert to the same models."""
+    server = FakeServer()
+    bedrock_server = FakeBedrockServer()
+    host, port = await server.start()
+    bedrock_host, bedrock_port = await bedrock_server.start()
+    try:
+        result = await aiomcstats.status(host, port, result="fast")
+        offline = await aiomcstats.status("127.0.0.1", 1, tries=1, result="fast")
+        bedrock = await aiomcstats.bedrock(bedrock_host, bedrock_port, result="fast")
+    finally:
+        await server.close()
+        await bedrock_server.close()
+    assert isinstance(result, FastStatus)
+    assert isinstance(offline, FastOfflineStatus)
+    assert isinstance(bedrock, FastBedrockStatus)
+    model = result.to_model()
+    assert model.players.online == result.players.online == 1
+    assert model.motd.clean == list(result.motd.clean)
+    assert not offline.online and offline.to_model().error == offline.error
+    assert bedrock.gamemode == "Survival"
+    assert bedrock.to_model().port_ipv4 == 19132
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("transport", ["stream", "protocol"])
+async def test_skip_favicon(transport: str) -> None:
+    """The favicon is replaced by the hash it would have had."""
+    icon = "data:image/png;base64," + "QUJD" * 1000
+    server = FakeServer(dict(DEFAULT_STATUS, favicon=icon))
+    host, port = await server.start()
+    try:
+        full = await aiomcstats.status(host, port, transport=transport)
+        skipped = await aiomcstats.status(
+            host, port, transport=transport, skip_favicon=True
+        )
+    finally:
+        await server.close()
+    assert isinstance(full, Status) and isinstance(skipped, Status)
+    assert full.icon == icon
+    assert skipped.icon is None
+    assert skipped.version == "1.16.5"
+    assert skipped.icon_hash == favicon_hash(icon)
+    assert full.icon_hash is None
+
+
+@pytest.mark.asyncio
+async def test_status_sharded() -> None:
+    """Hosts polled in worker processes come back as fast results."""
+    server = FakeServer()
+    host, port = await server.start()
+    hosts = ["%s:%d" % (host, port)] * 6 + ["127.0.0.1:1"]
+    try:
+        results = [
+            item
+            async for item in status_sharded(hosts, processes=2, tries=1, batch=2)
+        ]
+    finally:
+        await server.close()
+    assert sorted(h for h, _ in results) == sorted(hosts)
+    online = [r for _, r in results if isinstance(r, FastStatus)]
+    assert len(online) == 6
+    assert online[0].to_model().players.online == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("transport", ["stream", "protocol"])
+async def test_dead_address_is_overtaken(transport: str) -> None:
+    """The address that answers wins and is reported."""
+    server = FakeServer()
+    host, port = await server.start()
+    pinger = aiomcstats.main.TRANSPORTS[transport](
+        "localhost", port, addresses=["192.0.2.1", host], delay=0.05
+    )
+    try:
+        await pinger.connect(timeout=1)
+        await pinger.handshake()
+        assert (await pinger.status())["version"]["name"] == "1.16.5"
+    finally:
+        pinger.close()
+        await server.close()
+    assert pinger.address == host
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("result", ["model", "lazy", "fast"])
+async def test_query(result: str) -> None:
+    """A full stat fills in the players, plugins and map."""
+    server = FakeServer()
+    host, port = await server.start()
+    query_server = FakeQueryServer()
+    await query_server.start(host, port)
+    query = aiomcstats.QueryMultiplexer()
+    try:
+        first = await aiomcstats.status(host, port, query=query, result=result)
+        query_server.token += 1
+        second = await aiomcstats.status(host, port, query=query, result=result)
+        third = await aiomcstats.status(host, port, query=query, result=result)
+    finally:
+        query.close()
+        await query_server.close()
+        await server.close()
+    for data in (first, second, third):
+        assert not isinstance(data, (OfflineStatus, FastOfflineStatus))
+        assert data.plugins is not None
+        assert data.debug.query
+        assert data.map == "survival"
+        assert data.software == "Paper on Bukkit 1.16.5"
+        assert data.players.list == ["Steve", "Alex"]
+        assert data.plugins.names == ["WorldEdit", "Essentials"]
+        assert data.plugins.raw["Essentials"] == "2.18.2"
+    # The cached token is reused until the server rotates it.
+    assert query.handshakes == 2
+    assert query_server.stats == 3
+
+
+@pytest.mark.asyncio
+async def test_query_disabled() -> None:
+    """A server without query is still online."""
+    server = FakeServer()
+    host, port = await server.start()
+    query = aiomcstats.QueryMultiplexer()
+    try:
+        data = await aiomcstats.status(host, port, query=query)
+        # The failure is remembered, the next poll does not wait for query.
+        again = await asyncio.wait_for(aiomcstats.status(host, port, query=query), 0.5)
+    finally:
+        query.close()
+        await server.close()
+    assert isinstance(data, Status) and again.online
+    assert not data.debug.query
+    assert data.plugins is None
+    assert data.map == "world"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "kick, version",
+    [
+        ("\xa71\x0078\x001.6.4\x00A Legacy Server\x003\x0020", "1.6.4"),
+        ("A Legacy Server\xa73\xa720", "<1.4"),
+    ],
+)
+async def test_legacy_fallback(kick: str, version: str) -> None:
+    """Old servers are pinged with the legacy ping that is remembered."""
+    server = FakeLegacyServer(kick)
+    host, port = await server.start()
+    protocols = aiomcstats.ProtocolCache(threshold=2)
+    results: List[Union[Status, OfflineStatus]] = []
+    connections: List[int] = []
+    try:
+        for _ in range(3):
+            results.append(
+                await aiomcstats.status(host, port, tries=1, protocols=protocols)
+            )
+            connections.append(server.connections)
+    finally:
+        await server.close()
+    for data in results:
+        assert isinstance(data, Status)
+        assert data.version == version
+        assert data.players.online == 3
+        assert data.motd.clean == ["A Legacy Server"]
+    # Modern is tried first until the legacy ping answered twice in a row.
+    assert connections == [2, 4, 5]
+    assert protocols.get((host, port)) == "1.6"
+
+
+@pytest.mark.asyncio
+async def test_legacy_fallback_after_hang(monkeypatch: Any) -> None:
+    """A server which never answers the modern ping is still asked 0xFE."""
+    monkeypatch.setattr("aiomcstats.main.READ_TIMEOUT", 0.2)
+    server = FakeLegacyServer(hang=True)
+    host, port = await server.start()
+    protocols = aiomcstats.ProtocolCache()
+    try:
+        data = await aiomcstats.status(host, port, tries=1, protocols=protocols)
+    finally:
+        await server.close()
+    assert isinstance(data, Status)
+    assert data.version == "1.6.4"
+    assert server.connections == 2
+
+
+def test_protocol_cache(monkeypatch: Any) -> None:
+    """A modern answer resets the streak and legacy answers do not renew."""
+    now = [0.0]
+    monkeypatch.setattr("aiomcstats.legacy.monotonic", lambda: now[0])
+    protocols = aiomcstats.ProtocolCache(ttl=60, threshold=2)
+    protocols.set("a", "1.6")
+    protocols.set("a", "modern")
+    protocols.set("a", "1.6")
+    assert protocols.order("a") == ["modern", "1.6", "1.4"]
+    protocols.set("a", "1.6")
+    assert protocols.order("a") == ["1.6", "modern", "1.4"]
+    now[0] = 50
+    protocols.set("a", "1.6")
+    now[0] = 61
+    assert protocols.order("a") == ["modern", "1.6", "1.4"]
+
+
+@pytest.mark.asyncio
+async def test_multiplexer_retries_failed_socket(monkeypatch: Any) -> None:
+    """A socket that failed to open is opened again by the next request."""
+    server = FakeBedrockServer()
+    host, port = await server.start()
+    loop = asyncio.get_running_loop()
+    create = loop.create_datagram_endpoint
+    failures = [OSError(24, "Too many open files")]
+
+    async def flaky(*args: Any, **kwargs: Any) -> Any:
+        if failures:
+            raise failures.pop()
+        return await create(*args, **kwargs)
+
+    monkeypatch.setattr(loop, "create_datagram_endpoint", flaky)
+    multiplexer = aiomcstats.BedrockMultiplexer()
+    try:
+        first = await aiomcstats.bedrock(host, port, tries=1, multiplexer=multiplexer)
+        second = await aiomcstats.bedrock(host, port, tries=1, multiplexer=multiplexer)
+    finally:
+        multiplexer.close()
+        await server.close()
+    assert isinstance(first, BedrockOffline) and isinstance(second, BedrockStatus)
+    assert "Too many open files" in first.error
+    assert second.player_count == 3
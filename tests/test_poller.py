@@ -0,0 +1,62 @@
+"""Tests for the scheduled poller."""
+import asyncio
+from typing import Any, List, Tuple
+
+import pytest
+
+from aiomcstats.poller import Poller
+from tests.server import FakeServer
+
+
+@pytest.mark.asyncio
+async def test_poller_backs_off_unchanged_hosts() -> None:
+    """Hosts are polled repeatedly, less often while nothing changes."""
+    server = FakeServer()
+    host, port = await server.start()
+    address = "%s:%d" % (host, port)
+    seen: List[Tuple[str, Any]] = []
+    poller = Poller(callback=lambda host, result: seen.append((host, result)))
+    poller.add(address, interval=0.05, tries=1)
+    task = asyncio.ensure_future(poller.run())
+    try:
+        await asyncio.sleep(0.5)
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        await server.close()
+    assert 3 <= len(seen) < 10
+    assert all(host == address and result.online for host, result in seen)
+    poller.remove(address)
+    assert len(poller) == 0
+
+
+@pytest.mark.asyncio
+async def test_poller_queue() -> None:
+    """Without a callback results are put on the queue."""
+    server = FakeServer()
+    host, port = await server.start()
+    poller = Poller()
+    poller.add("%s:%d" % (host, port), interval=0.01, tries=1)
+    task = asyncio.ensure_future(poller.run())
+    try:
+        _, result = await asyncio.wait_for(poller.results.get(), 1)
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        await server.close()
+    assert result.players.online == 1
+
+
+@pytest.mark.asyncio
+async def test_poller_reports_failed_probes() -> None:
+    """A probe that raises is reported as offline and polled again."""
+    poller = Poller()
+    poller.add("localhost", interval=0.01, edition="bedrock", result="unknown")
+    task = asyncio.ensure_future(poller.run())
+    try:
+        results = [await asyncio.wait_for(poller.results.get(), 1) for _ in "ab"]
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+    assert all(host == "localhost" and not result.online for host, result in results)
+    assert results[0][1].error == "Unknown result 'unknown'"
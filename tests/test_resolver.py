@@ -0,0 +1,84 @@
+"""Tests for the DNS cache."""
+from typing import Any, List
+
+import dns.resolver
+import pytest
+
+from aiomcstats.resolver import ResolverCache
+from aiomcstats.utils import get_addresses, get_raw
+
+
+class _Answer:
+    def __init__(self, ttl: int) -> None:
+        self.rrset = type("RRset", (), {"ttl": ttl})()
+
+
+class _Resolver:
+    def __init__(self) -> None:
+        self.queries: List[Any] = []
+
+    async def resolve(self, qname: str, rdtype: str, search: bool = False) -> Any:
+        self.queries.append((qname, rdtype))
+        if qname.startswith("_minecraft"):
+            raise dns.resolver.NXDOMAIN()
+        return _Answer(300)
+
+
+@pytest.mark.asyncio
+async def test_positive_and_negative_caching() -> None:
+    """Answers and missing records are only looked up once."""
+    upstream = _Resolver()
+    cache = ResolverCache(resolver=upstream)  # type: ignore[arg-type]
+    first = await cache.resolve("example.com", "A")
+    assert await cache.resolve("EXAMPLE.com", "A") is first
+    for _ in range(2):
+        with pytest.raises(dns.resolver.NXDOMAIN):
+            await cache.resolve("_minecraft._tcp.example.com", "SRV")
+    assert len(upstream.queries) == 2
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["negative_hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction() -> None:
+    """The least recently used answer is dropped first."""
+    upstream = _Resolver()
+    cache = ResolverCache(maxsize=2, resolver=upstream)  # type: ignore[arg-type]
+    for name in ("a.com", "b.com", "a.com", "c.com", "a.com", "b.com"):
+        await cache.resolve(name, "A")
+    assert [q for q, _ in upstream.queries] == ["a.com", "b.com", "c.com", "b.com"]
+
+
+class _DualStack:
+    async def resolve(self, qname: str, rdtype: str, search: bool = False) -> Any:
+        if qname.startswith("_minecraft"):
+            raise dns.resolver.NXDOMAIN()
+        if qname == "v6only.example" and rdtype == "A":
+            raise dns.resolver.NoAnswer()
+        addresses = {
+            "A": ["192.0.2.1", "192.0.2.2"],
+            "AAAA": ["2001:db8::1", "2001:db8::2", "2001:db8::3"],
+        }[rdtype]
+        return [type("Rdata", (), {"address": address})() for address in addresses]
+
+
+@pytest.mark.asyncio
+async def test_addresses_interleaved() -> None:
+    """A and AAAA answers are merged IPv6 first, alternating families."""
+    resolver: Any = _DualStack()
+    host, port, addresses, srv = await get_addresses("example.com", None, resolver)
+    assert (host, port, srv) == ("example.com", 25565, False)
+    assert addresses == [
+        "2001:db8::1",
+        "192.0.2.1",
+        "2001:db8::2",
+        "192.0.2.2",
+        "2001:db8::3",
+    ]
+    assert (await get_raw("example.com", None, resolver))[2] == "192.0.2.1"
+    assert (await get_raw("v6only.example:1", None, resolver))[1:3] == (
+        1,
+        "2001:db8::1",
+    )
+    assert (await get_addresses("[::1]:25566"))[1:3] == (25566, ["::1"])
@@ -0,0 +1,69 @@
+"""Tests for the retry policy."""
+import asyncio
+from typing import List
+
+import pytest
+
+from aiomcstats.retry import RetryPolicy
+
+
+@pytest.mark.asyncio
+async def test_retries_until_success() -> None:
+    """Failed attempts are retried up to tries times."""
+    calls: List[None] = []
+
+    async def attempt() -> str:
+        calls.append(None)
+        if len(calls) < 3:
+            raise IOError("refused")
+        return "ok"
+
+    assert await RetryPolicy(tries=3, backoff=0.001).run(attempt) == "ok"
+    assert len(calls) == 3
+    calls.clear()
+    with pytest.raises(IOError):
+        await RetryPolicy(tries=2, backoff=0.001).run(attempt)
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_attempt_timeout_and_deadline() -> None:
+    """Hanging attempts are cut off and the deadline stops retries."""
+    calls: List[None] = []
+
+    async def attempt() -> None:
+        calls.append(None)
+        await asyncio.sleep(10)
+
+    policy = RetryPolicy(tries=10, backoff=0, attempt_timeout=0.02, deadline=0.05)
+    with pytest.raises(asyncio.TimeoutError):
+        await policy.run(attempt)
+    assert 2 <= len(calls) <= 4
+
+
+@pytest.mark.asyncio
+async def test_inner_timeout_keeps_message() -> None:
+    """Only the policy's own timeout is reported as the attempt timing out."""
+
+    async def attempt() -> None:
+        await asyncio.wait_for(asyncio.sleep(10), 0.01)
+
+    async def inner() -> None:
+        raise asyncio.TimeoutError("Connect timed out after 3 seconds")
+
+    policy = RetryPolicy(tries=1, attempt_timeout=5)
+    with pytest.raises(asyncio.TimeoutError, match="^Timed out$"):
+        await policy.run(attempt)
+    with pytest.raises(asyncio.TimeoutError, match="^Connect timed out"):
+        await policy.run(inner)
+    with pytest.raises(asyncio.TimeoutError, match="^Attempt timed out after 0.01"):
+        await RetryPolicy(tries=1, attempt_timeout=0.01).run(lambda: asyncio.sleep(10))
+
+
+def test_delays() -> None:
+    """Delays grow, are capped and jittered down."""
+    policy = RetryPolicy(tries=5, backoff=1, multiplier=2, max_backoff=3, jitter=0.5)
+    delays = list(policy.delays())
+    assert len(delays) == 4
+    for delay, limit in zip(delays, [1, 2, 3, 3]):
+        assert limit / 2 <= delay <= limit
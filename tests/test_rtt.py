@@ -0,0 +1,73 @@
+"""Tests for the round trip time estimator."""
+import asyncio
+
+import pytest
+
+import aiomcstats
+from aiomcstats.connection import TCPConnection
+from aiomcstats.main import _ping
+from aiomcstats.ping import Ping
+from aiomcstats.rtt import RTTEstimator
+from tests.server import FakeServer
+
+
+def test_timeout_follows_samples() -> None:
+    """Timeouts track the samples within the floor and ceiling."""
+    rtt = RTTEstimator(initial_timeout=3, min_timeout=0.2, max_timeout=10)
+    assert rtt.timeout("a") == 3
+    for _ in range(20):
+        rtt.observe("a", 0.005)
+    assert rtt.timeout("a") == 0.2
+    rtt.backoff("a")
+    assert rtt.timeout("a") == 0.4
+    for _ in range(20):
+        rtt.observe("b", 0.4)
+    assert 0.4 < rtt.timeout("b") < 0.5
+    rtt.observe("b", 1.2)
+    assert rtt.timeout("b") > 1.2
+    for _ in range(10):
+        rtt.backoff("b")
+    assert rtt.timeout("b") == 10
+    rtt.observe("b", 0.4)
+    assert rtt.timeout("b") < 10
+
+
+@pytest.mark.asyncio
+async def test_status_records_samples() -> None:
+    """Successful pings feed the connect and status estimates."""
+    server = FakeServer()
+    host, port = await server.start()
+    rtt = RTTEstimator()
+    try:
+        result = await aiomcstats.status(host, port, rtt=rtt)
+    finally:
+        await server.close()
+    assert result.online
+    assert set(rtt.stats()) == {(host, port, "connect"), (host, port, "status")}
+    assert rtt.timeout((host, port, "connect")) == rtt.min_timeout
+
+
+class _HangingPing(Ping):
+    """Ping whose connection attempts to "hang" never complete."""
+
+    async def _open(self, address: str) -> TCPConnection:
+        if address == "hang":
+            await asyncio.sleep(10)
+        return await super()._open(address)
+
+
+@pytest.mark.asyncio
+async def test_connect_deadline_covers_race() -> None:
+    """A connect timeout shorter than the stagger still reaches the fallback."""
+    server = FakeServer()
+    host, port = await server.start()
+    rtt = RTTEstimator()
+    for _ in range(20):
+        rtt.observe((host, port, "connect"), 0.001)
+    try:
+        _, address = await _ping(
+            _HangingPing, host, port, addresses=["hang", host], rtt=rtt
+        )
+    finally:
+        await server.close()
+    assert address == host
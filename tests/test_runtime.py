@@ -0,0 +1,39 @@
+"""Tests for event loop selection."""
+import asyncio
+
+import pytest
+
+import aiomcstats
+from aiomcstats import runtime
+from tests.server import FakeBedrockServer
+from tests.server import FakeServer
+
+
+async def _both_editions() -> None:
+    java = FakeServer()
+    host, port = await java.start()
+    bedrock = FakeBedrockServer()
+    bedrock_host, bedrock_port = await bedrock.start()
+    try:
+        for transport in aiomcstats.main.TRANSPORTS:
+            result = await aiomcstats.status(host, port, transport=transport)
+            assert result.online
+        assert (await aiomcstats.bedrock(bedrock_host, bedrock_port)).player_count
+    finally:
+        await java.close()
+        await bedrock.close()
+
+
+@pytest.mark.parametrize("loop", runtime.available_loops())
+def test_transports_on_each_loop(loop: str) -> None:
+    """Java and bedrock pings work on every available loop."""
+    runtime.run(_both_editions(), loop)
+    with pytest.raises(RuntimeError):
+        asyncio.get_running_loop()
+
+
+def test_unknown_loop() -> None:
+    """Unknown loops are refused."""
+    assert runtime.loop_name("asyncio") == "asyncio"
+    with pytest.raises(ValueError):
+        runtime.loop_name("tokio")